@@ -0,0 +1,67 @@
+"""Benchmark serial, process-pool and numpy aggregation of a large history.
+
+Usage: python benchmarks/bench_aggregate.py [--rows 1000000] [--workers N]
+"""
+
+import argparse
+from datetime import datetime
+
+from fixtures import isolate_home, timed, write_history
+
+HOME = isolate_home()
+
+from pats.aggregate import aggregate_entries, aggregate_range  # noqa: E402
+from pats.config import set_aggregation_backend  # noqa: E402
+from pats.database import DATABASE_FILE, iter_entries_in_range  # noqa: E402
+from pats.rules import get_project_rules  # noqa: E402
+from pats.vectorized import aggregate_entries_numpy, numpy_available  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    write_history(DATABASE_FILE, args.rows)
+    size_mb = DATABASE_FILE.stat().st_size / (1024 * 1024)
+    print(f"History: {args.rows} rows, {size_mb:.1f} MB in {HOME}\n")
+
+    start = datetime(1, 1, 1)
+    end = datetime(9999, 12, 31, 23, 59)
+    for period in ("week", "month"):
+        serial = timed(
+            f"aggregate by {period}, serial",
+            lambda period=period: aggregate_entries(
+                iter_entries_in_range(start, end), period
+            ),
+        )
+        parallel = timed(
+            f"aggregate by {period}, process pool",
+            lambda period=period: aggregate_range(
+                start, end, period, workers=args.workers, threshold=0
+            ),
+        )
+        assert serial == parallel, f"{period} buckets differ"
+        if numpy_available():
+            vectorised = timed(
+                f"aggregate by {period}, numpy from entries",
+                lambda period=period: aggregate_entries_numpy(
+                    iter_entries_in_range(start, end), period, get_project_rules()
+                ),
+            )
+            assert serial == vectorised, f"{period} numpy buckets differ"
+            set_aggregation_backend("numpy")
+            columns = timed(
+                f"aggregate by {period}, numpy from columns",
+                lambda period=period: aggregate_range(
+                    start, end, period, threshold=DATABASE_FILE.stat().st_size + 1
+                ),
+            )
+            set_aggregation_backend("python")
+            assert serial == columns, f"{period} numpy column buckets differ"
+        print(f"{'':<48} {len(parallel):>8} buckets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark session updates and range reads of the binary store against the CSV.
+
+Usage: python benchmarks/bench_binstore.py [--rows 1000000]
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from fixtures import isolate_home, timed, write_history
+
+HOME = isolate_home()
+
+from pats import binstore, database  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    write_history(database.DATABASE_FILE, args.rows)
+    database.start_new_session("Acme", "benchmark session")
+    size_mb = database.DATABASE_FILE.stat().st_size / (1024 * 1024)
+    print(f"History: {args.rows} rows, {size_mb:.1f} MB in {HOME}\n")
+
+    timed("binary: import CSV", binstore.import_csv)
+
+    def toggle(module) -> None:
+        module.stop_active_session()
+        module.remove_last_session_end_time()
+
+    timed("csv: stop + reopen session", lambda: toggle(database), repeat=3)
+    timed("binary: stop + reopen session", lambda: toggle(binstore), repeat=3)
+
+    # Windows before today, as the synthetic history ends later today
+    end = datetime.now().replace(hour=0, minute=0) - timedelta(minutes=1)
+    start = end - timedelta(days=7)
+    expected = timed(
+        "csv: last 7 days",
+        lambda: list(database.iter_entries_in_range(start, end)),
+        repeat=3,
+    )
+    actual = timed(
+        "binary: last 7 days",
+        lambda: list(binstore.iter_entries_in_range(start, end)),
+        repeat=3,
+    )
+    # The binary store keeps the readable columns and the id, not the epochs
+    kept = [*database.ENTRY_HEADERS, "id"]
+    visible = [{key: entry[key] for key in kept} for entry in expected]
+    assert actual == visible, "binary range differs from the CSV"
+
+    timed("csv: read everything", lambda: list(database.iter_entries()))
+    timed("binary: read everything", lambda: list(binstore.iter_records()))
+
+
+if __name__ == "__main__":
+    main()
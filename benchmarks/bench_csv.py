@@ -0,0 +1,57 @@
+"""Benchmark the specialised CSV reader against csv.DictReader.
+
+Usage: python benchmarks/bench_csv.py [--rows 1000000]
+"""
+
+import argparse
+import csv
+
+from fixtures import isolate_home, timed, write_history
+
+HOME = isolate_home()
+
+from pats.database import DATABASE_FILE, write_entries  # noqa: E402
+from pats.fastcsv import read_columns, read_file_rows, rows_to_entries  # noqa: E402
+
+
+def dict_reader() -> list[dict[str, str]]:
+    with DATABASE_FILE.open("r", newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    write_history(DATABASE_FILE, args.rows)
+    # Round-trip through write_entries so the file is exactly what paTS writes,
+    # with a few rows that need quoting
+    entries = dict_reader()
+    for entry in entries[::1000]:
+        entry["description"] += ', "quoted"\nacross lines'
+    write_entries(entries, DATABASE_FILE)
+    size_mb = DATABASE_FILE.stat().st_size / (1024 * 1024)
+    print(f"History: {args.rows} rows, {size_mb:.1f} MB in {HOME}\n")
+
+    expected = timed("csv.DictReader", dict_reader, repeat=3)
+    timed("specialised split (rows)", lambda: read_file_rows(DATABASE_FILE), repeat=3)
+    headers, columns = timed(
+        "specialised split (columns)",
+        lambda: read_columns(DATABASE_FILE.read_bytes()),
+        repeat=3,
+    )
+    assert columns == {
+        header: [entry[header] for entry in expected] for header in headers
+    }, "columns differ from csv.DictReader"
+    parsed = timed(
+        "specialised split + entry dicts",
+        lambda: rows_to_entries(*read_file_rows(DATABASE_FILE)),
+        repeat=3,
+    )
+    assert parsed == expected, "specialised reader differs from csv.DictReader"
+    print(f"{'':<48} {len(parsed):>8} rows, identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark streaming export against a large synthetic history.
+
+Usage: python benchmarks/bench_export.py [--rows 1000000]
+"""
+
+import argparse
+import os
+
+from fixtures import isolate_home, timed, write_history
+
+HOME = isolate_home()
+
+from pats.database import (  # noqa: E402
+    DATABASE_FILE,
+    filter_entries_by_date_range,
+    get_month_range,
+    iter_entries,
+    iter_entries_in_range,
+    parse_date_input,
+    read_entries,
+)
+from pats.exporters import export_entries  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    write_history(DATABASE_FILE, args.rows)
+    size_mb = DATABASE_FILE.stat().st_size / (1024 * 1024)
+    print(f"History: {args.rows} rows, {size_mb:.1f} MB in {HOME}\n")
+
+    with open(os.devnull, "w", newline="", encoding="utf-8") as out:
+        for fmt in ("csv", "jsonl", "ical"):
+            count = timed(
+                f"export {fmt} (all rows)",
+                lambda fmt=fmt: export_entries(iter_entries(), fmt, out),
+            )
+            print(f"{'':<48} {count:>8} rows")
+
+        # An old month near the end of the file, the worst case for scanning
+        last = list(iter_entries())[-1]
+        day, month, year = last["date"].split("-")
+        start, end = get_month_range(parse_date_input(f"{year}-{month}", "month"))
+
+        count = timed(
+            "export csv, one month, read_entries + filter",
+            lambda: export_entries(
+                filter_entries_by_date_range(read_entries(), start, end), "csv", out
+            ),
+        )
+        timed(
+            "export csv, one month, seek + stream",
+            lambda: export_entries(iter_entries_in_range(start, end), "csv", out),
+            repeat=5,
+        )
+        print(f"{'':<48} {count:>8} rows")
+
+
+if __name__ == "__main__":
+    main()
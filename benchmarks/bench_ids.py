@@ -0,0 +1,63 @@
+"""Benchmark finding and editing entries by id against a linear scan.
+
+Usage: python benchmarks/bench_ids.py [--rows 1000000] [--lookups 20]
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+
+from fixtures import isolate_home, timed, write_history
+
+HOME = isolate_home()
+
+from pats import database, ids  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=20)
+    args = parser.parse_args()
+
+    # End yesterday, so a session started now is the most recent
+    write_history(
+        database.DATABASE_FILE, args.rows, last=date.today() - timedelta(days=1)
+    )
+    size_mb = database.DATABASE_FILE.stat().st_size / (1024 * 1024)
+    print(f"History: {args.rows} rows, {size_mb:.1f} MB in {HOME}\n")
+
+    wanted = random.Random(0).sample(range(1, args.rows + 1), args.lookups)
+
+    def scan() -> list[dict[str, str]]:
+        found = []
+        for entry_id in map(str, wanted):
+            for entry in database.iter_entries():
+                if entry["id"] == entry_id:
+                    found.append(entry)
+                    break
+        return found
+
+    def lookup() -> list[dict[str, str]]:
+        return [ids.find_entry_by_id(entry_id)[0] for entry_id in wanted]
+
+    timed("build id index", ids.build_id_index)
+    expected = timed(f"linear scan: {args.lookups} lookups", scan)
+    actual = timed(f"id index: {args.lookups} lookups", lookup, repeat=3)
+    assert actual == expected, "id lookups differ from a linear scan"
+
+    # A session started since the index was saved is found from the top
+    database.start_new_session("Acme", "benchmark")
+    newest = database.get_last_session()["id"]
+    timed("id index: newly started session", lambda: ids.find_entry_by_id(int(newest)))
+
+    def edit() -> None:
+        entry, start, end = ids.find_entry_by_id(wanted[0])
+        database.replace_row(start, end, entry, {**entry, "description": "edited"})
+
+    timed("edit one old entry by id", edit, repeat=3)
+    assert ids.find_entry_by_id(wanted[0])[0]["description"] == "edited"
+
+
+if __name__ == "__main__":
+    main()
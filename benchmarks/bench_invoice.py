@@ -0,0 +1,47 @@
+"""Benchmark month-end invoices over a long history with a rate per project.
+
+Usage: python benchmarks/bench_invoice.py [--rows 1000000]
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from fixtures import PROJECTS, isolate_home, timed, write_history
+
+HOME = isolate_home()
+
+from pats.database import (  # noqa: E402
+    DATABASE_FILE,
+    get_day_range,
+    get_month_range,
+    parse_date_input,
+)
+from pats.invoice import invoice_range  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    write_history(DATABASE_FILE, args.rows)
+    size_mb = DATABASE_FILE.stat().st_size / (1024 * 1024)
+    print(f"History: {args.rows} rows, {size_mb:.1f} MB in {HOME}\n")
+
+    # The last complete month, as invoiced at month end
+    last_month = date.today().replace(day=1) - timedelta(days=1)
+    start, end = get_month_range(parse_date_input(last_month.isoformat(), "day"))
+    end = get_day_range(end)[1]
+    rates = {project: 50 + 10 * i for i, project in enumerate(PROJECTS)}
+
+    for by in ("day", "description"):
+        invoice = timed(
+            f"invoice {last_month:%B %Y} by {by}",
+            lambda by=by: invoice_range(start, end, by, rates, (15, "up")),
+            repeat=3,
+        )
+        print(f"{'':<48} {len(invoice['lines']):>8} lines, {invoice['amount']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Time every storage engine in pats.stores.STORES side by side.
+
+Their shared behavioural contract is tested in tests/test_stores.py; here
+the engines only have to agree on the rows in a week of a long history.
+
+Usage: python benchmarks/bench_stores.py [--rows 100000] [--store NAME ...]
+"""
+
+import argparse
+import csv
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from fixtures import isolate_home, timed, write_history
+
+HOME = isolate_home()
+
+from pats.database import ENTRY_HEADERS, EPOCH_HEADERS  # noqa: E402
+from pats.stores import STORES, TimesheetStore  # noqa: E402
+
+
+def rows(entries: Iterable[dict[str, str]]) -> list[dict[str, str]]:
+    """Keep only the human-readable columns every engine must preserve"""
+    return [{key: entry[key] for key in ENTRY_HEADERS} for entry in entries]
+
+
+def history(rows: int) -> list[dict[str, str]]:
+    """Build a synthetic history ending yesterday, most recent first"""
+    path = HOME / "history.csv"
+    write_history(path, rows)
+    with path.open("r", newline="", encoding="utf-8") as file:
+        entries = list(csv.DictReader(file))
+    # Shift everything back a day so new sessions are always the most recent,
+    # dropping the epochs so they are recomputed for the new dates
+    for entry in entries:
+        day = datetime.strptime(entry["date"], "%d-%m-%Y") - timedelta(days=1)
+        entry["date"] = day.strftime("%d-%m-%Y")
+        for key in EPOCH_HEADERS:
+            del entry[key]
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--store", action="append", choices=list(STORES))
+    args = parser.parse_args()
+    names = args.store or list(STORES)
+
+    entries = history(args.rows)
+    end = datetime.now().replace(hour=0, minute=0) - timedelta(minutes=1)
+    start = end - timedelta(days=7)
+    print(f"\nHistory: {args.rows} rows in {HOME}\n")
+
+    expected = None
+    for name in names:
+        store = STORES[name]()
+        timed(f"{name}: write all", lambda store=store: store.write_entries(entries))
+        timed(f"{name}: read all", lambda store=store: list(store.iter_entries()))
+        week = timed(
+            f"{name}: last 7 days",
+            lambda store=store: rows(store.iter_entries_in_range(start, end)),
+            repeat=3,
+        )
+        assert expected is None or week == expected, f"{name} range differs"
+        expected = week
+
+        def sessions(store: TimesheetStore = store) -> None:
+            store.start_new_session("Acme", "benchmark")
+            store.stop_active_session()
+            store.remove_last_session_end_time()
+            store.delete_first_entry()
+
+        timed(f"{name}: start, stop, reopen, delete", sessions, repeat=3)
+        print()
+
+
+if __name__ == "__main__":
+    main()
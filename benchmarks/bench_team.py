@@ -0,0 +1,51 @@
+"""Benchmark team reports merged from a directory of members' timesheets.
+
+Usage: python benchmarks/bench_team.py [--members 20] [--rows 100000]
+"""
+
+import argparse
+import tracemalloc
+from datetime import date, timedelta
+
+from fixtures import isolate_home, timed, write_history
+
+HOME = isolate_home()
+
+from pats.database import get_day_range, get_month_range, parse_date_input  # noqa: E402
+from pats.team import find_timesheets, team_totals  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per member")
+    args = parser.parse_args()
+
+    team_dir = HOME / "team"
+    team_dir.mkdir()
+    for i in range(args.members):
+        write_history(team_dir / f"member{i:03}.csv", args.rows, seed=i)
+    timesheets = find_timesheets(team_dir)
+    size_mb = sum(path.stat().st_size for path in timesheets.values()) / 1024**2
+    print(f"Team: {args.members} x {args.rows} rows, {size_mb:.1f} MB in {HOME}\n")
+
+    last_month = date.today().replace(day=1) - timedelta(days=1)
+    start, end = get_month_range(parse_date_input(last_month.isoformat(), "day"))
+    end = get_day_range(end)[1]
+
+    for period in ("week", "month"):
+        timed(
+            f"team by {period}, {last_month:%B %Y}",
+            lambda period=period: team_totals(timesheets, start, end, period),
+            repeat=3,
+        )
+
+    tracemalloc.start()
+    team_totals(timesheets, start, end, "week")
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{'peak memory, team by week':<48} {peak / 1024:>8.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
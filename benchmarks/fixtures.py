@@ -0,0 +1,76 @@
+"""Shared helpers for paTS benchmarks.
+
+Benchmarks run against a synthetic history in a throwaway HOME, so call
+`isolate_home()` before importing anything from `pats`.
+"""
+
+import os
+import random
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+PROJECTS = ["Acme", "Globex", "Initech", "Umbrella", "lunch", "Hooli", "Admin"]
+WORDS = ["review", "deploy", "meeting", "ABC-123", "refactor", "support", "docs"]
+TAGS = ["#billable", "#meeting", "#oncall", ""]
+
+
+def isolate_home() -> Path:
+    """Point HOME at a fresh temporary directory"""
+    home = Path(tempfile.mkdtemp(prefix="pats-bench-"))
+    os.environ["HOME"] = str(home)
+    (home / ".pats").mkdir()
+    return home
+
+
+def write_history(
+    path: Path, rows: int, per_day: int = 8, seed: int = 0, last: date | None = None
+) -> None:
+    """Write a synthetic schema v4 timesheet of `rows` entries ending on day
+    `last` (today by default), most recent first, with ids counting up from
+    the oldest"""
+    rng = random.Random(seed)
+    day = last or date.today()
+    written = 0
+
+    with path.open("w", newline="", encoding="utf-8") as file:
+        file.write(
+            "startTime,endTime,date,project,description,"
+            "startEpoch,endEpoch,utcOffset,id\r\n"
+        )
+        while written < rows:
+            date_str = day.strftime("%d-%m-%Y")
+            midnight = datetime(day.year, day.month, day.day).astimezone()
+            offset = int(midnight.utcoffset().total_seconds())
+            day_epoch = int(midnight.timestamp())
+            minute = 8 * 60 + per_day * 60
+            for _ in range(min(per_day, rows - written)):
+                end = minute
+                minute -= rng.randint(20, 60)
+                project = rng.choice(PROJECTS)
+                words = " ".join(rng.sample(WORDS, 2))
+                description = f"{words} {rng.choice(TAGS)}".strip()
+                file.write(
+                    f"{minute // 60:02d}:{minute % 60:02d},"
+                    f"{end // 60:02d}:{end % 60:02d},"
+                    f"{date_str},{project},{description},"
+                    f"{day_epoch + minute * 60},{day_epoch + end * 60},{offset},"
+                    f"{rows - written}\r\n"
+                )
+                written += 1
+            day -= timedelta(days=1)
+
+
+def timed(label: str, fn: Callable[[], Any], repeat: int = 1) -> Any:
+    """Run `fn`, printing the best wall-clock time over `repeat` runs"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<48} {best:8.3f}s")
+    return result
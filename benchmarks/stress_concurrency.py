@@ -0,0 +1,203 @@
+"""Run many paTS processes against one timesheet at once and check what's left.
+
+Each worker process waits at a shared barrier, then performs a random
+sequence of start, stop, edit and info operations. Every start uses a unique
+description, so afterwards the timesheet must still hold every session
+that was started, have at most one active session, parse cleanly and use
+each id once. Throughput and latency percentiles per operation are printed
+as a yardstick for locking or storage changes. Exits with status 1 if any
+invariant is broken.
+
+Usage: python benchmarks/stress_concurrency.py [--workers 8] [--ops 50]
+       [--rows 1000] [--seed 0] [--cli]
+
+With --cli every operation runs as a separate `python -m pats.cli` process,
+which is slower but includes start-up and migration checks.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from fixtures import isolate_home, write_history
+
+OPERATIONS = ["start", "stop", "edit", "info"]
+WEIGHTS = [4, 2, 1, 3]
+
+
+def run_operation(operation: str, worker: int, step: int, cli: bool) -> str | None:
+    """Perform one operation, returning the description of a started session"""
+    description = f"stress-{worker}-{step}"
+    if cli:
+        args = {
+            "start": ["start", f"Worker{worker}:{description}"],
+            "stop": ["stop"],
+            "edit": ["edit", f"Edited{worker}:"],
+            "info": ["info"],
+        }[operation]
+        subprocess.run(
+            [sys.executable, "-m", "pats.cli", *args],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    else:
+        from pats import database
+
+        if operation == "start":
+            database.start_new_session(f"Worker{worker}", description)
+        elif operation == "stop":
+            database.stop_active_session()
+        elif operation == "edit":
+            # Only the project changes, so descriptions still identify sessions
+            database.edit_first_entry(project=f"Edited{worker}")
+        else:
+            database.get_active_session()
+    return description if operation == "start" else None
+
+
+def worker_main(
+    home: str, worker: int, args: argparse.Namespace, barrier: Any, results: Any
+) -> None:
+    """Run one worker's random operations and report what it did"""
+    os.environ["HOME"] = home
+    rng = random.Random(args.seed * 1000 + worker)
+    timings: list[tuple[str, float]] = []
+    started: list[str] = []
+    errors: list[str] = []
+
+    barrier.wait()
+    began = time.perf_counter()
+    for step in range(args.ops):
+        operation = rng.choices(OPERATIONS, WEIGHTS)[0]
+        begin = time.perf_counter()
+        try:
+            description = run_operation(operation, worker, step, args.cli)
+        except Exception as e:  # Report every failure rather than stopping
+            errors.append(f"{operation}: {type(e).__name__}: {e}")
+            continue
+        timings.append((operation, time.perf_counter() - begin))
+        if description:
+            started.append(description)
+
+    results.put((timings, started, errors, began, time.perf_counter()))
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Get the value below which `fraction` of the sorted values fall"""
+    index = min(len(values) - 1, int(fraction * len(values)))
+    return values[index]
+
+
+def check_invariants(started: list[str]) -> list[str]:
+    """Check the timesheet after the run, returning the broken invariants"""
+    from pats.database import iter_entries
+    from pats.fsck import check_entries
+
+    problems = []
+    try:
+        entries = list(iter_entries())
+    except Exception as e:
+        return [f"timesheet does not parse: {type(e).__name__}: {e}"]
+
+    report = check_entries(entries)
+    if report["malformed"]:
+        problems.append(f"{report['malformed']} malformed rows")
+    if report["duplicate_ids"] or report["missing_ids"]:
+        problems.append(
+            f"{report['duplicate_ids']} reused and {report['missing_ids']} missing ids"
+        )
+
+    active = sum(1 for entry in entries if not entry["endTime"])
+    if active > 1:
+        problems.append(f"{active} active sessions")
+
+    descriptions = {entry["description"] for entry in entries}
+    lost = [description for description in started if description not in descriptions]
+    if lost:
+        problems.append(f"{len(lost)} of {len(started)} started sessions lost")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=50, help="Operations per worker")
+    parser.add_argument("--rows", type=int, default=1000, help="Existing history")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cli", action="store_true", help="Run real CLI processes")
+    args = parser.parse_args()
+
+    # Set up the home here, not at import, as spawned workers re-import this
+    home = isolate_home()
+    yesterday = date.today() - timedelta(days=1)
+    write_history(home / ".pats" / "timesheet.csv", args.rows, last=yesterday)
+    if args.cli:
+        # Let the CLI processes find pats when run from a checkout
+        root = str(Path(__file__).resolve().parent.parent)
+        os.environ["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [root, os.environ.get("PYTHONPATH")])
+        )
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(args.workers)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=worker_main, args=(str(home), worker, args, barrier, results)
+        )
+        for worker in range(args.workers)
+    ]
+
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    timings = [timing for outcome in outcomes for timing in outcome[0]]
+    started = [description for outcome in outcomes for description in outcome[1]]
+    errors = [error for outcome in outcomes for error in outcome[2]]
+    # Measured from the barrier, leaving out process start-up
+    elapsed = max(outcome[4] for outcome in outcomes) - min(
+        outcome[3] for outcome in outcomes
+    )
+
+    mode = "CLI processes" if args.cli else "library calls"
+    print(f"{args.workers} workers x {args.ops} operations ({mode}) in {home}\n")
+    print(f"{'operation':<10} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for operation in [*OPERATIONS, "all"]:
+        latencies = sorted(
+            seconds * 1000 for name, seconds in timings if operation in (name, "all")
+        )
+        if latencies:
+            print(
+                f"{operation:<10} {len(latencies):>6} "
+                f"{percentile(latencies, 0.5):>8.1f} "
+                f"{percentile(latencies, 0.95):>8.1f} "
+                f"{percentile(latencies, 0.99):>8.1f}"
+            )
+    print(f"\nThroughput: {len(timings) / elapsed:.1f} operations/s")
+
+    os.environ["HOME"] = str(home)
+    problems = check_invariants(started)
+    problems += (
+        [f"{len(errors)} operations failed, first: {errors[0]}"] if errors else []
+    )
+    if problems:
+        print("\nInvariants broken:")
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+    print("\nInvariants hold: no lost sessions, at most one active, ids unique")
+
+
+if __name__ == "__main__":
+    main()
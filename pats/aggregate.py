@@ -0,0 +1,365 @@
+"""Single-pass bucketing of entries into per-day, week or month totals
+
+Large windows are split into byte partitions that worker processes parse
+and bucket independently; their partial buckets are merged at the end.
+"""
+
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from pats.config import get_aggregation_backend
+from pats.database import (
+    DATABASE_FILE,
+    _next_row_start,
+    datetime_sort_key,
+    entry_sort_key,
+    epoch_span,
+    find_range_offsets,
+    iter_entries_in_range,
+)
+from pats.display_utils import calculate_duration_seconds
+from pats.fastcsv import rows_to_entries, split_columns, split_rows
+from pats.rules import ProjectRules, get_project_rules
+from pats.vectorized import (
+    DAY_SECONDS,
+    aggregate_columns,
+    aggregate_entries_numpy,
+    numpy_available,
+    parse_clock,
+    parse_columns,
+    parse_day,
+)
+
+PERIODS = ["day", "week", "month"]
+
+# Windows smaller than this are aggregated serially, as starting worker
+# processes costs more than parsing a few megabytes
+PARALLEL_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+# Smallest byte partition handed to a single worker
+MIN_PARTITION_BYTES = 2 * 1024 * 1024
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Hour-of-week slots in a heatmap, Monday 00:00 first
+WEEK_HOURS = 7 * 24
+
+
+def entry_date(entry: dict[str, str]) -> date | None:
+    """Get the date of an entry, or None if it is malformed"""
+    try:
+        day, month, year = entry["date"].split("-")
+        return date(int(year), int(month), int(day))
+    except (KeyError, ValueError):
+        return None
+
+
+def period_start(day: date, period: str) -> date:
+    """Get the first day of the day, week (Monday) or month containing a date"""
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_period_start(start: date, period: str) -> date:
+    """Get the first day of the period following the one starting at `start`"""
+    if period == "week":
+        return start + timedelta(days=7)
+    if period == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def previous_period_start(start: date, period: str) -> date:
+    """Get the first day of the period preceding the one starting at `start`"""
+    if period == "week":
+        return start - timedelta(days=7)
+    if period == "month":
+        return (start - timedelta(days=1)).replace(day=1)
+    return start - timedelta(days=1)
+
+
+def period_label(start: date, period: str) -> str:
+    """Format the period starting at `start` for display"""
+    if period == "week":
+        return f"Week of {start.isoformat()}"
+    if period == "month":
+        return start.strftime("%B %Y")
+    return start.strftime("%a %Y-%m-%d")
+
+
+def new_bucket() -> dict[str, Any]:
+    """Create an empty bucket of totals"""
+    return {"seconds": 0, "entries": 0, "projects": {}}
+
+
+def use_numpy() -> bool:
+    """Check whether the numpy backend is configured and installed"""
+    return get_aggregation_backend() == "numpy" and numpy_available()
+
+
+def aggregate_entries(
+    entries: Iterable[dict[str, str]],
+    period: str,
+    rules: ProjectRules | None = None,
+    collected: list[dict[str, str]] | None = None,
+) -> dict[date, dict[str, Any]]:
+    """Bucket entries by period in a single pass.
+
+    Each bucket holds the total seconds (excluding configured projects, as in
+    the daily and weekly views), the entry count and seconds per project,
+    with aliased projects counted under their canonical name.
+    When `collected` is given every entry is also appended to it, so callers
+    can render the rows without reading them a second time.
+
+    With the numpy backend configured (and numpy installed) the bucketing is
+    vectorised instead; the results are identical.
+    """
+    if rules is None:
+        rules = get_project_rules()
+
+    if use_numpy():
+        return aggregate_entries_numpy(entries, period, rules, collected)
+
+    buckets: dict[date, dict[str, Any]] = {}
+    for entry in entries:
+        if collected is not None:
+            collected.append(entry)
+
+        day = entry_date(entry)
+        if day is None:
+            continue
+
+        start = period_start(day, period)
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = new_bucket()
+
+        seconds = calculate_duration_seconds(entry)
+        project, excluded = rules.resolve(entry["project"] or "")
+        if not excluded:
+            bucket["seconds"] += seconds
+        bucket["entries"] += 1
+
+        project_name = project or "No project"
+        projects = bucket["projects"]
+        projects[project_name] = projects.get(project_name, 0) + seconds
+
+    return buckets
+
+
+def fill_periods(
+    buckets: dict[date, dict[str, Any]], first: date, last: date, period: str
+) -> dict[date, dict[str, Any]]:
+    """Get buckets for every period between two dates, oldest first"""
+    filled = {}
+    start = period_start(first, period)
+    while start <= last:
+        filled[start] = buckets.get(start) or new_bucket()
+        start = next_period_start(start, period)
+    return filled
+
+
+def collect_range(
+    start_date: datetime, end_date: datetime, period: str
+) -> tuple[list[dict[str, str]], dict[date, dict[str, Any]]]:
+    """Read a date range once, returning its entries and per-period buckets"""
+    entries: list[dict[str, str]] = []
+    buckets = aggregate_entries(
+        iter_entries_in_range(start_date, end_date), period, collected=entries
+    )
+    return entries, buckets
+
+
+def merge_buckets(
+    target: dict[date, dict[str, Any]], partial: dict[date, dict[str, Any]]
+) -> None:
+    """Add the totals of partial buckets into `target`"""
+    for start, bucket in partial.items():
+        merged = target.get(start)
+        if merged is None:
+            target[start] = bucket
+            continue
+
+        merged["seconds"] += bucket["seconds"]
+        merged["entries"] += bucket["entries"]
+        projects = merged["projects"]
+        for project, seconds in bucket["projects"].items():
+            projects[project] = projects.get(project, 0) + seconds
+
+
+def aggregate_partition(
+    path: Path,
+    begin: int,
+    stop: int,
+    headers: list[str],
+    start_key: str,
+    end_key: str,
+    period: str,
+    rules: ProjectRules,
+) -> dict[date, dict[str, Any]]:
+    """Parse and bucket the rows in one byte partition (runs in a worker)"""
+    with path.open("rb") as file:
+        file.seek(begin)
+        data = file.read(stop - begin)
+
+    text = data.decode("utf-8")
+    if use_numpy():
+        columns = parse_columns(split_columns(text, headers), (start_key, end_key))
+        return aggregate_columns(columns, period, rules)
+
+    entries = (
+        entry
+        for entry in rows_to_entries(headers, split_rows(text))
+        if start_key <= entry_sort_key(entry) <= end_key
+    )
+    return aggregate_entries(entries, period, rules)
+
+
+def partition_offsets(
+    path: Path, begin: int, stop: int, parts: int, width: int = 0
+) -> list[int]:
+    """Split a byte span into row-aligned partition boundaries"""
+    boundaries = [begin]
+    with path.open("rb") as file:
+        for i in range(1, parts):
+            pos = begin + (stop - begin) * i // parts
+            offset = _next_row_start(file, pos, begin, width)
+            if boundaries[-1] < offset < stop:
+                boundaries.append(offset)
+    boundaries.append(stop)
+    return boundaries
+
+
+def aggregate_range(
+    start_date: datetime,
+    end_date: datetime,
+    period: str,
+    workers: int | None = None,
+    threshold: int = PARALLEL_THRESHOLD_BYTES,
+) -> dict[date, dict[str, Any]]:
+    """Bucket every entry starting within a range by period.
+
+    Ranges spanning fewer than `threshold` bytes of the database are read
+    serially; larger ones are partitioned across a process pool.
+    """
+    begin, stop, headers = find_range_offsets(start_date, end_date)
+    if stop - begin < threshold:
+        if use_numpy():
+            # Columns are parsed straight from the bytes, without entry dicts
+            return aggregate_partition(
+                DATABASE_FILE,
+                begin,
+                stop,
+                headers,
+                datetime_sort_key(start_date),
+                datetime_sort_key(end_date),
+                period,
+                get_project_rules(),
+            )
+        return aggregate_entries(iter_entries_in_range(start_date, end_date), period)
+
+    workers = workers or os.cpu_count() or 1
+    parts = max(1, min(workers, (stop - begin) // MIN_PARTITION_BYTES))
+    boundaries = partition_offsets(DATABASE_FILE, begin, stop, parts, len(headers))
+    rules = get_project_rules()
+    start_key = datetime_sort_key(start_date)
+    end_key = datetime_sort_key(end_date)
+
+    buckets: dict[date, dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=min(workers, parts)) as pool:
+        futures = [
+            pool.submit(
+                aggregate_partition,
+                DATABASE_FILE,
+                part_begin,
+                part_stop,
+                headers,
+                start_key,
+                end_key,
+                period,
+                rules,
+            )
+            for part_begin, part_stop in zip(boundaries, boundaries[1:], strict=False)
+        ]
+        for future in futures:
+            merge_buckets(buckets, future.result())
+
+    return buckets
+
+
+def entry_epochs(entry: dict[str, str], now_epoch: int) -> tuple[int, int] | None:
+    """Get an entry's start and end as local wall-clock epoch seconds.
+
+    Epochs count from date(1, 1, 1) at ordinal 1, a Monday. Sessions ending
+    before they start are taken to cross midnight, and active sessions end
+    at `now_epoch`. Entries with epoch columns last exactly as long as those
+    say, even across a DST change. Returns None for rows without a valid start.
+    """
+    parsed = parse_day(entry.get("date", ""))
+    start_clock = parse_clock(entry.get("startTime", ""))
+    if parsed is None or start_clock is None:
+        return None
+
+    start = parsed[0] * DAY_SECONDS + start_clock
+    if not entry.get("endTime"):
+        return start, max(start, now_epoch)
+
+    span = epoch_span(entry)
+    if span is not None:
+        return start, start + span[1] - span[0]
+
+    end_clock = parse_clock(entry["endTime"])
+    if end_clock is None:
+        return None
+    end = parsed[0] * DAY_SECONDS + end_clock
+    if end < start:
+        end += DAY_SECONDS
+    return start, end
+
+
+def add_to_heatmap(slots: list[int], start: int, end: int) -> None:
+    """Spread the seconds of [start, end) over hour-of-week slots.
+
+    Works on whole hours rather than minutes: the partial first and last
+    hours are added directly, whole weeks add an hour to every slot at once
+    and at most 167 remaining hours are walked individually.
+    """
+    if end <= start:
+        return
+
+    first_hour, last_hour = start // 3600, end // 3600
+    if first_hour == last_hour:
+        slots[(first_hour - 24) % WEEK_HOURS] += end - start
+        return
+
+    slots[(first_hour - 24) % WEEK_HOURS] += (first_hour + 1) * 3600 - start
+    slots[(last_hour - 24) % WEEK_HOURS] += end - last_hour * 3600
+
+    whole_weeks, hours = divmod(last_hour - first_hour - 1, WEEK_HOURS)
+    if whole_weeks:
+        for slot in range(WEEK_HOURS):
+            slots[slot] += whole_weeks * 3600
+    for hour in range(first_hour + 1, first_hour + 1 + hours):
+        slots[(hour - 24) % WEEK_HOURS] += 3600
+
+
+def heatmap_grid(entries: Iterable[dict[str, str]]) -> list[list[int]]:
+    """Get seconds worked per weekday (rows, Monday first) and hour of day"""
+    now = datetime.now()
+    now_epoch = now.toordinal() * DAY_SECONDS + now.hour * 3600
+    now_epoch += now.minute * 60 + now.second
+
+    slots = [0] * WEEK_HOURS
+    for entry in entries:
+        epochs = entry_epochs(entry, now_epoch)
+        if epochs is not None:
+            add_to_heatmap(slots, *epochs)
+
+    return [slots[day * 24 : (day + 1) * 24] for day in range(7)]
@@ -0,0 +1,473 @@
+"""Fixed-width binary record store, an alternative to the timesheet CSV
+
+Each entry is one 32-byte record of start epoch, end epoch, project id,
+description id and the entry's stable id (0 for sessions started in the
+store, which get one when exported to the timesheet), kept oldest first in
+an mmap'd file. Projects and descriptions live in a separate append-only
+string table, one JSON string per line, whose line number is the id.
+
+Epochs are local wall-clock seconds since 1970-01-01, matching the naive
+local times of the CSV, not the UTC `startEpoch` and `endEpoch` of its
+schema v3 columns. Those are recomputed from the wall-clock times on export,
+in the current timezone. Sessions crossing midnight end on the following
+day and active sessions have an end of ACTIVE. Because every record has the
+same size, stopping or resuming a session rewrites one 8-byte field in
+place and date ranges are binary searches over the start column.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+from pats.database import DATABASE_FILE, prepare_database, write_entries
+from pats.fastcsv import read_columns
+from pats.vectorized import parse_clock
+
+BINARY_DIR = DATABASE_FILE.parent / "binary"
+RECORDS_NAME = "records.bin"
+STRINGS_NAME = "strings.jsonl"
+
+MAGIC = b"PATSREC\x02"
+HEADER_SIZE = len(MAGIC)
+
+# start epoch, end epoch, project id, description id, entry id
+RECORD = struct.Struct("<qqIIQ")
+EPOCH = struct.Struct("<q")
+ID = struct.Struct("<I")
+END_OFFSET = 8
+PROJECT_OFFSET = 16
+DESCRIPTION_OFFSET = 20
+
+# End epoch of an active session
+ACTIVE = -(2**63)
+
+# CSV columns a record is built from
+IMPORT_COLUMNS = ["date", "startTime", "endTime", "project", "description", "id"]
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+DAY_SECONDS = 86400
+
+
+def to_epoch(date_str: str, time_str: str) -> int | None:
+    """Get the wall-clock epoch of a DD-MM-YYYY date and HH:MM time"""
+    clock = parse_clock(time_str)
+    if clock is None:
+        return None
+    try:
+        day, month, year = date_str.split("-")
+        ordinal = date(int(year), int(month), int(day)).toordinal()
+    except (AttributeError, ValueError):
+        return None
+    return (ordinal - EPOCH_ORDINAL) * DAY_SECONDS + clock
+
+
+def from_epoch(epoch: int) -> tuple[str, str]:
+    """Get the (HH:MM, DD-MM-YYYY) strings of a wall-clock epoch"""
+    days, clock = divmod(epoch, DAY_SECONDS)
+    day = date.fromordinal(days + EPOCH_ORDINAL)
+    return f"{clock // 3600:02d}:{clock % 3600 // 60:02d}", day.strftime("%d-%m-%Y")
+
+
+def datetime_to_epoch(dt: datetime) -> int:
+    """Get the wall-clock epoch of a datetime, ignoring its timezone"""
+    seconds = dt.hour * 3600 + dt.minute * 60 + dt.second
+    return (dt.toordinal() - EPOCH_ORDINAL) * DAY_SECONDS + seconds
+
+
+def record_to_entry(
+    start: int,
+    end: int,
+    project: int,
+    description: int,
+    entry_id: int,
+    strings: list[str],
+) -> dict[str, str]:
+    """Build the CSV entry of a record"""
+    start_time, date_str = from_epoch(start)
+    return {
+        "startTime": start_time,
+        "endTime": "" if end == ACTIVE else from_epoch(end)[0],
+        "date": date_str,
+        "project": strings[project],
+        "description": strings[description],
+        "id": str(entry_id) if entry_id else "",
+    }
+
+
+def load_strings(directory: Path | None = None) -> list[str]:
+    """Load the string table, indexed by id"""
+    path = (directory or BINARY_DIR) / STRINGS_NAME
+    with path.open("r", encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def intern_strings(
+    directory: Path, strings: list[str], values: Iterable[str]
+) -> list[int]:
+    """Get the ids of values, appending new ones to the string table.
+
+    New strings are written before any record referring to them, so an
+    interrupted write can only leave unused strings behind.
+    """
+    ids = []
+    added = []
+    lookup = {value: i for i, value in enumerate(strings)}
+    for value in values:
+        if value not in lookup:
+            lookup[value] = len(strings)
+            strings.append(value)
+            added.append(value)
+        ids.append(lookup[value])
+
+    if added:
+        with (directory / STRINGS_NAME).open("a", encoding="utf-8") as file:
+            file.writelines(json.dumps(value) + "\n" for value in added)
+    return ids
+
+
+def store_exists(directory: Path | None = None) -> bool:
+    """Check whether a binary store has been created"""
+    return ((directory or BINARY_DIR) / RECORDS_NAME).exists()
+
+
+@contextmanager
+def open_records(
+    directory: Path | None = None, writable: bool = False
+) -> Iterator[mmap.mmap]:
+    """Map the records file, read-only unless `writable`"""
+    path = (directory or BINARY_DIR) / RECORDS_NAME
+    with path.open("r+b" if writable else "rb") as file:
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        with mmap.mmap(file.fileno(), 0, access=access) as records:
+            if records[:HEADER_SIZE] != MAGIC:
+                raise ValueError(
+                    f"{path} is not a current paTS record file, "
+                    "run 'paTS store import-csv' to rebuild it"
+                )
+            yield records
+            if writable:
+                records.flush()
+
+
+def record_count(records: mmap.mmap) -> int:
+    """Get the number of records in a mapped records file"""
+    return (len(records) - HEADER_SIZE) // RECORD.size
+
+
+def record_offset(index: int) -> int:
+    """Get the byte offset of a record"""
+    return HEADER_SIZE + index * RECORD.size
+
+
+def read_record(records: mmap.mmap, index: int) -> tuple[int, int, int, int, int]:
+    """Unpack one record"""
+    return RECORD.unpack_from(records, record_offset(index))
+
+
+def start_epoch(records: mmap.mmap, index: int) -> int:
+    """Read only the start epoch of a record"""
+    return EPOCH.unpack_from(records, record_offset(index))[0]
+
+
+def import_csv(
+    csv_path: Path | None = None, directory: Path | None = None
+) -> tuple[int, int]:
+    """Build the binary store from a timesheet CSV, replacing any existing one.
+
+    Returns the number of records written and of malformed rows skipped.
+    """
+    if csv_path is None:
+        prepare_database()
+        csv_path = DATABASE_FILE
+    with csv_path.open("rb") as file:
+        _, columns = read_columns(file.read())
+
+    # Timesheets from before schema v4 have no id column
+    blank = [""] * len(columns.get("date", []))
+    return write_store(
+        zip(*(columns.get(header, blank) for header in IMPORT_COLUMNS), strict=True),
+        directory,
+    )
+
+
+def write_store(
+    rows: Iterable[tuple[str, str, str, str, str, str]], directory: Path | None = None
+) -> tuple[int, int]:
+    """Replace the store with (date, startTime, endTime, project, description,
+    id) rows given most recent first, like the CSV.
+
+    The store is written to a sibling directory which then replaces the old
+    one. Returns the number of records written and of malformed rows skipped.
+    """
+    directory = directory or BINARY_DIR
+    staging = directory.with_name(directory.name + ".new")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    records = []
+    skipped = 0
+    # Dates and times repeat heavily, so each distinct string is parsed once
+    days: dict[str, int | None] = {}
+    clocks: dict[str, int | None] = {}
+    for date_str, start_time, end_time, project, description, entry_id in rows:
+        if date_str not in days:
+            days[date_str] = to_epoch(date_str, "00:00")
+        if start_time not in clocks:
+            clocks[start_time] = parse_clock(start_time)
+        if end_time not in clocks:
+            clocks[end_time] = parse_clock(end_time)
+
+        day, start_clock, end_clock = (
+            days[date_str],
+            clocks[start_time],
+            clocks[end_time],
+        )
+        if day is None or start_clock is None or (end_time and end_clock is None):
+            skipped += 1
+            continue
+
+        start = day + start_clock
+        end = ACTIVE
+        if end_time:
+            end = day + end_clock
+            if end < start:
+                end += DAY_SECONDS  # Crosses midnight
+        entry_id = int(entry_id) if entry_id and entry_id.isdigit() else 0
+        records.append((start, end, project or "", description or "", entry_id))
+
+    # Rows come newest first; the store keeps equal starts in that order
+    records.reverse()
+    records.sort(key=lambda record: record[0])
+
+    (staging / STRINGS_NAME).touch()
+    strings: list[str] = []
+    project_ids = intern_strings(staging, strings, (record[2] for record in records))
+    description_ids = intern_strings(
+        staging, strings, (record[3] for record in records)
+    )
+
+    with (staging / RECORDS_NAME).open("wb") as file:
+        file.write(MAGIC)
+        file.write(
+            b"".join(
+                RECORD.pack(start, end, project, description, entry_id)
+                for (start, end, _, _, entry_id), project, description in zip(
+                    records, project_ids, description_ids, strict=True
+                )
+            )
+        )
+
+    previous = directory.with_name(directory.name + ".old")
+    if directory.exists():
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+    return len(records), skipped
+
+
+def iter_records(
+    directory: Path | None = None, first: int = 0, stop: int | None = None
+) -> Iterator[dict[str, str]]:
+    """Yield the entries of records [first, stop), most recent first"""
+    strings = load_strings(directory)
+    with open_records(directory) as records:
+        stop = record_count(records) if stop is None else stop
+        span = records[record_offset(first) : record_offset(stop)]
+
+    # Each distinct day and time of day is formatted once
+    days: dict[int, str] = {}
+    clocks: dict[int, str] = {"": ""}
+    for start, end, project, description, entry_id in reversed(
+        list(RECORD.iter_unpack(span))
+    ):
+        day, start_clock = divmod(start, DAY_SECONDS)
+        if day not in days:
+            days[day] = from_epoch(start)[1]
+        end_clock = "" if end == ACTIVE else end % DAY_SECONDS
+        for clock in (start_clock, end_clock):
+            if clock not in clocks:
+                clocks[clock] = f"{clock // 3600:02d}:{clock % 3600 // 60:02d}"
+        yield {
+            "startTime": clocks[start_clock],
+            "endTime": clocks[end_clock],
+            "date": days[day],
+            "project": strings[project],
+            "description": strings[description],
+            "id": str(entry_id) if entry_id else "",
+        }
+
+
+def export_csv(csv_path: Path, directory: Path | None = None) -> int:
+    """Write the store as a timesheet CSV, returning the number of rows.
+
+    Entries keep their ids; those started in the store are given new ones
+    when written to the timesheet.
+    """
+    return write_entries(iter_records(directory), csv_path)
+
+
+def find_range(
+    records: mmap.mmap, start_date: datetime, end_date: datetime
+) -> tuple[int, int]:
+    """Get the indices of the records starting within a range.
+
+    Bisects over the sorted start column, unpacking O(log n) epochs.
+    """
+    count = record_count(records)
+
+    def key(index: int) -> int:
+        return start_epoch(records, index)
+
+    # Epochs are minute-aligned, like the CSV's HH:MM keys
+    first = bisect_left(range(count), datetime_to_epoch(start_date) // 60 * 60, key=key)
+    stop = bisect_right(range(count), datetime_to_epoch(end_date) // 60 * 60, key=key)
+    return first, max(first, stop)
+
+
+def iter_entries_in_range(
+    start_date: datetime, end_date: datetime, directory: Path | None = None
+) -> Iterator[dict[str, str]]:
+    """Yield the entries starting within a range, most recent first"""
+    with open_records(directory) as records:
+        first, stop = find_range(records, start_date, end_date)
+    yield from iter_records(directory, first, stop)
+
+
+def last_index(records: mmap.mmap, active: bool) -> int | None:
+    """Get the index of the newest active (or completed) record"""
+    if active:
+        # Search for the sentinel's bytes rather than unpacking every record
+        # when there is no active session
+        marker = EPOCH.pack(ACTIVE)
+        position = len(records)
+        while (position := records.rfind(marker, HEADER_SIZE, position)) != -1:
+            index, field = divmod(position - HEADER_SIZE, RECORD.size)
+            if field == END_OFFSET:
+                return index
+            position += len(marker) - 1
+        return None
+
+    for index in range(record_count(records) - 1, -1, -1):
+        end = EPOCH.unpack_from(records, record_offset(index) + END_OFFSET)[0]
+        if (end == ACTIVE) == active:
+            return index
+    return None
+
+
+def get_active_session(directory: Path | None = None) -> dict[str, str] | None:
+    """Get the currently active session"""
+    with open_records(directory) as records:
+        index = last_index(records, active=True)
+        if index is None:
+            return None
+        return record_to_entry(*read_record(records, index), load_strings(directory))
+
+
+def get_previous_session(directory: Path | None = None) -> dict[str, str] | None:
+    """Get the last completed session"""
+    with open_records(directory) as records:
+        index = last_index(records, active=False)
+        if index is None:
+            return None
+        return record_to_entry(*read_record(records, index), load_strings(directory))
+
+
+def get_last_session(directory: Path | None = None) -> dict[str, str] | None:
+    """Get the most recent session (active or completed)"""
+    with open_records(directory) as records:
+        count = record_count(records)
+        if not count:
+            return None
+        return record_to_entry(
+            *read_record(records, count - 1), load_strings(directory)
+        )
+
+
+def stop_active_session(
+    directory: Path | None = None, now: datetime | None = None
+) -> bool:
+    """Stop the active session by writing its end epoch in place"""
+    now = now or datetime.now()
+    with open_records(directory, writable=True) as records:
+        index = last_index(records, active=True)
+        if index is None:
+            return False
+
+        start = start_epoch(records, index)
+        # Whole minutes, like the CSV; a session crossing midnight ends the
+        # following day
+        end = start - start % DAY_SECONDS + now.hour * 3600 + now.minute * 60
+        if end < start:
+            end += DAY_SECONDS
+        EPOCH.pack_into(records, record_offset(index) + END_OFFSET, end)
+    return True
+
+
+def remove_last_session_end_time(directory: Path | None = None) -> bool:
+    """Reopen the last completed session by clearing its end epoch in place"""
+    with open_records(directory, writable=True) as records:
+        index = last_index(records, active=False)
+        if index is None:
+            return False
+        EPOCH.pack_into(records, record_offset(index) + END_OFFSET, ACTIVE)
+    return True
+
+
+def start_new_session(
+    project: str = "",
+    description: str = "",
+    directory: Path | None = None,
+    now: datetime | None = None,
+) -> None:
+    """Stop any active session and append a new one"""
+    directory = directory or BINARY_DIR
+    now = now or datetime.now()
+    stop_active_session(directory, now)
+
+    project_id, description_id = intern_strings(
+        directory, load_strings(directory), [project, description]
+    )
+    start = datetime_to_epoch(now.replace(second=0, microsecond=0))
+    with (directory / RECORDS_NAME).open("ab") as file:
+        file.write(RECORD.pack(start, ACTIVE, project_id, description_id, 0))
+
+
+def delete_first_entry(directory: Path | None = None) -> dict[str, str] | None:
+    """Delete the most recent entry by truncating its record"""
+    directory = directory or BINARY_DIR
+    deleted = get_last_session(directory)
+    if deleted is not None:
+        path = directory / RECORDS_NAME
+        os.truncate(path, path.stat().st_size - RECORD.size)
+    return deleted
+
+
+def edit_first_entry(
+    project: str | None = None,
+    description: str | None = None,
+    directory: Path | None = None,
+) -> bool:
+    """Point the most recent entry at a new project or description in place"""
+    directory = directory or BINARY_DIR
+    strings = load_strings(directory)
+    with open_records(directory, writable=True) as records:
+        count = record_count(records)
+        if not count:
+            return False
+
+        offset = record_offset(count - 1)
+        for value, field in (
+            (project, PROJECT_OFFSET),
+            (description, DESCRIPTION_OFFSET),
+        ):
+            if value is not None:
+                (string_id,) = intern_strings(directory, strings, [value])
+                ID.pack_into(records, offset + field, string_id)
+    return True
@@ -10,15 +10,28 @@ from pats.cmd.day import day
 from pats.cmd.delete import del_
 from pats.cmd.display import display
 from pats.cmd.edit import edit
+from pats.cmd.export import export
+from pats.cmd.fsck import fsck
+from pats.cmd.heatmap import heatmap
+from pats.cmd.import_ import import_
 from pats.cmd.info import info
+from pats.cmd.invoice import invoice
 from pats.cmd.month import month
 from pats.cmd.prevweek import prevweek
+from pats.cmd.query import query
+from pats.cmd.range_ import range_
 from pats.cmd.restore import restore
 from pats.cmd.resume import resume
+from pats.cmd.serve import serve
 from pats.cmd.start import start
 from pats.cmd.stop import stop
+from pats.cmd.store import app as store_app
+from pats.cmd.tags import tags
+from pats.cmd.team_report import team_report
+from pats.cmd.trend import trend
 from pats.cmd.unpause import unpause
 from pats.cmd.week import week
+from pats.cmd.year import year
 
 app = typer.Typer(help="paTS - Python Timesheet System", invoke_without_command=True)
 
@@ -40,12 +53,24 @@ cmds: dict[Any, list[str]] = {
     week: ["w"],
     prevweek: [],
     month: [],
+    year: [],
+    range_: ["range"],
+    trend: [],
+    heatmap: [],
     backup: [],
     restore: [],
     resume: ["r"],
     unpause: ["u"],
     del_: ["del", "rm"],
     edit: ["e"],
+    import_: ["import"],
+    export: [],
+    query: ["q"],
+    tags: [],
+    fsck: [],
+    invoice: [],
+    serve: [],
+    team_report: [],
 }
 
 for fn, names in cmds.items():
@@ -55,6 +80,7 @@ for fn, names in cmds.items():
 
 # Add config subcommand
 app.add_typer(config_app, name="config")
+app.add_typer(store_app, name="store")
 
 
 if __name__ == "__main__":
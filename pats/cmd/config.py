@@ -1,14 +1,26 @@
 """Config command for paTS"""
 
+from typing import Annotated
+
 import typer
 from rich import print
 
 from pats.config import (
+    AGGREGATION_BACKENDS,
+    ROUNDING_MODES,
     load_config,
+    set_aggregation_backend,
     set_daily_goal_hours,
+    set_excluded_patterns,
     set_excluded_projects,
+    set_hourly_rate,
+    set_invoice_currency,
+    set_invoice_rounding,
+    set_project_alias,
     set_weekly_goal_hours,
 )
+from pats.rules import compile_pattern
+from pats.vectorized import numpy_available
 
 app = typer.Typer(help="Manage paTS configuration")
 
@@ -27,14 +39,59 @@ def set_excluded_projects_cmd(projects: list[str]):
         print(f"[red]❌ Error setting excluded projects: {e}[/red]")
 
 
+@app.command("set-excluded-patterns")
+def set_excluded_patterns_cmd(patterns: list[str]):
+    """Set glob patterns (or regexes prefixed with re:) of projects to exclude
+    from totals, e.g. 'lunch-*' 'personal/*' 're:(?i)break'"""
+    try:
+        for pattern in patterns:
+            compile_pattern(pattern)
+        set_excluded_patterns(patterns)
+        if patterns:
+            patterns_str = ", ".join(f"'{p}'" for p in patterns)
+            print(f"[green]✅ Excluded patterns set to: {patterns_str}[/green]")
+        else:
+            print("[green]✅ Excluded patterns cleared[/green]")
+    except Exception as e:
+        print(f"[red]❌ Error setting excluded patterns: {e}[/red]")
+
+
+@app.command("set-alias")
+def set_alias_cmd(pattern: str, project: str):
+    """Count projects matching a name or pattern as another project, e.g.
+    'acme*' Acme"""
+    try:
+        compile_pattern(pattern)
+        set_project_alias(pattern, project)
+        print(f"[green]✅ Projects matching '{pattern}' count as {project}[/green]")
+    except Exception as e:
+        print(f"[red]❌ Error setting alias: {e}[/red]")
+
+
+@app.command("remove-alias")
+def remove_alias_cmd(pattern: str):
+    """Stop aliasing projects matching a name or pattern"""
+    try:
+        set_project_alias(pattern, None)
+        print(f"[green]✅ Alias '{pattern}' removed[/green]")
+    except Exception as e:
+        print(f"[red]❌ Error removing alias: {e}[/red]")
+
+
 @app.command()
 def show():
     """Show current configuration"""
     try:
         config = load_config()
         excluded_projects = config.get("excluded_projects", [])
+        excluded_patterns = config.get("excluded_patterns", [])
+        aliases = config.get("project_aliases", {})
         daily_goal = config.get("daily_goal_hours", 8.0)
         weekly_goal = config.get("weekly_goal_hours", 40.0)
+        backend = config.get("aggregation_backend", "python")
+        rates = config.get("hourly_rates", {})
+        rounding = config.get("invoice_rounding", {})
+        currency = config.get("invoice_currency", "EUR")
 
         print("[bold]📋 Current Configuration:[/bold]")
         print()
@@ -44,6 +101,19 @@ def show():
         print(f"  Weekly Goal: [blue]{weekly_goal}h[/blue]")
         print()
 
+        print(f"[bold]Aggregation Backend:[/bold] [blue]{backend}[/blue]")
+        print()
+
+        if rates:
+            print(f"[bold]Hourly Rates ({currency}):[/bold]")
+            for project, rate in sorted(rates.items()):
+                print(f"  • {project}: [green]{rate}[/green]")
+            minutes = rounding.get("minutes", 0)
+            if minutes:
+                mode = rounding.get("mode", "up")
+                print(f"  Rounding: [blue]{mode} to {minutes} minutes[/blue]")
+            print()
+
         if excluded_projects:
             print("[bold]Excluded Projects:[/bold]")
             for project in excluded_projects:
@@ -51,6 +121,16 @@ def show():
         else:
             print("[dim]No projects excluded from totals[/dim]")
 
+        if excluded_patterns:
+            print("[bold]Excluded Patterns:[/bold]")
+            for pattern in excluded_patterns:
+                print(f"  • [red]{pattern}[/red]")
+
+        if aliases:
+            print("[bold]Project Aliases:[/bold]")
+            for pattern, project in aliases.items():
+                print(f"  • {pattern} → [blue]{project}[/blue]")
+
     except Exception as e:
         print(f"[red]❌ Error loading configuration: {e}[/red]")
 
@@ -93,6 +173,77 @@ def set_weekly_goal_cmd(hours: float):
         print(f"[red]❌ Error setting weekly goal: {e}[/red]")
 
 
+@app.command("set-backend")
+def set_backend_cmd(backend: str):
+    """Set the aggregation backend for reports (python or numpy)"""
+    try:
+        if backend not in AGGREGATION_BACKENDS:
+            print(
+                "[red]❌ Backend must be one of: "
+                f"{', '.join(AGGREGATION_BACKENDS)}[/red]"
+            )
+            return
+
+        if backend == "numpy" and not numpy_available():
+            print(
+                "[yellow]⚠️  numpy is not installed; reports will use the "
+                "Python backend until it is[/yellow]"
+            )
+
+        set_aggregation_backend(backend)
+        print(f"[green]✅ Aggregation backend set to: {backend}[/green]")
+    except Exception as e:
+        print(f"[red]❌ Error setting aggregation backend: {e}[/red]")
+
+
+@app.command("set-rate")
+def set_rate_cmd(project: str, rate: float):
+    """Set the hourly rate invoices use for a project ('*' for any other)"""
+    try:
+        set_hourly_rate(project, rate)
+        print(f"[green]✅ Hourly rate for {project} set to: {rate}[/green]")
+    except Exception as e:
+        print(f"[red]❌ Error setting hourly rate: {e}[/red]")
+
+
+@app.command("remove-rate")
+def remove_rate_cmd(project: str):
+    """Stop billing a project"""
+    try:
+        set_hourly_rate(project, None)
+        print(f"[green]✅ Hourly rate for {project} removed[/green]")
+    except Exception as e:
+        print(f"[red]❌ Error removing hourly rate: {e}[/red]")
+
+
+@app.command("set-rounding")
+def set_rounding_cmd(
+    minutes: int,
+    mode: Annotated[
+        str, typer.Option("--mode", help=f"One of: {', '.join(ROUNDING_MODES)}")
+    ] = "up",
+):
+    """Round each invoice line item to a number of minutes (0 for none)"""
+    try:
+        set_invoice_rounding(minutes, mode)
+        if minutes:
+            print(f"[green]✅ Invoice lines round {mode} to {minutes} minutes[/green]")
+        else:
+            print("[green]✅ Invoice rounding turned off[/green]")
+    except Exception as e:
+        print(f"[red]❌ Error setting rounding: {e}[/red]")
+
+
+@app.command("set-currency")
+def set_currency_cmd(currency: str):
+    """Set the currency shown on invoices"""
+    try:
+        set_invoice_currency(currency)
+        print(f"[green]✅ Invoice currency set to: {currency}[/green]")
+    except Exception as e:
+        print(f"[red]❌ Error setting currency: {e}[/red]")
+
+
 def config_main():
     """Main config command (acts as group)"""
     app()
@@ -1,22 +1,38 @@
 """Day command for paTS"""
 
+from typing import Annotated
+
 import typer
 from rich import print
 
-from pats.database import get_entries_for_day, parse_date_input
-from pats.display_utils import display_entries_table
+from pats.database import get_day_range, get_entries_for_day, parse_date_input
+from pats.display_utils import refresh_active, render_table, summarise_table
+from pats.index import filter_period_by_tags
+from pats.watch import watch_database
+
+TAG_HELP = "Tag filter, e.g. '#billable AND NOT #meeting'"
+WATCH_HELP = "Stay open and refresh when entries change (Ctrl+C to quit)"
+
+
+def load_day(
+    date: str | None, tag: str | None
+) -> tuple[list[dict[str, str]], dict[str, int] | None]:
+    """Read a day's entries, and its tag totals when filtering by tag"""
+    if tag:
+        start_date, end_date = get_day_range(parse_date_input(date, "day"))
+        return filter_period_by_tags(tag, start_date, end_date)
+    return get_entries_for_day(date), None
 
 
 def day(
     date: str | None = typer.Argument(
         None, help="Date in YYYY-MM-DD format (defaults to today)"
     ),
+    tag: Annotated[str | None, typer.Option("--tag", help=TAG_HELP)] = None,
+    watch: Annotated[bool, typer.Option("--watch", help=WATCH_HELP)] = False,
 ):
     """Show timesheet for a specific day"""
     try:
-        # Get entries for the specified day
-        entries = get_entries_for_day(date)
-
         # Format the date for display
         if date:
             target_date = parse_date_input(date, "day")
@@ -24,8 +40,20 @@ def day(
             title = f"📅 Daily Timesheet - {date_display}"
         else:
             title = "📅 Daily Timesheet - Today"
+        if tag:
+            title += f" - {tag}"
+
+        def load():
+            entries, tag_totals = load_day(date, tag)
+            return summarise_table(entries), tag_totals
 
-        display_entries_table(entries, title)
+        def draw(data):
+            render_table(refresh_active(data[0]), title, data[1])
+
+        if watch:
+            watch_database(load, draw)
+        else:
+            draw(load())
 
     except ValueError as e:
         print(f"[red]❌ Error: {e}[/red]")
@@ -1,26 +1,51 @@
 """Delete command for paTS"""
 
+from typing import Annotated
+
 import typer
 from rich import print
 
-from pats.database import delete_first_entry, read_entries
+from pats.database import delete_first_entry, delete_row, get_last_session
+from pats.ids import forget_id, locate_entry
 
 
-def del_():
-    """Delete the first (most recent) entry from the timesheet"""
+def del_(
+    entry_id: Annotated[
+        int | None, typer.Option("--id", help="Delete the entry with this id")
+    ] = None,
+    at: Annotated[
+        str | None,
+        typer.Option(
+            "--at", help="Delete the entry running at 'YYYY-MM-DD HH:MM' instead"
+        ),
+    ] = None,
+):
+    """Delete the first (most recent) entry from the timesheet, or any entry
+    by id or time"""
 
     # First, check if there are any entries and show what would be deleted
-    entries = read_entries()
-    if not entries:
+    if entry_id is not None or at is not None:
+        try:
+            found = locate_entry(entry_id, at)
+        except ValueError as e:
+            print(f"[red]❌ Error: {e}[/red]")
+            print("[dim]Expected format: YYYY-MM-DD HH:MM[/dim]")
+            raise typer.Exit(1) from e
+        target = found[0] if found else None
+    else:
+        found = None
+        target = get_last_session()
+    if not target:
         print("[red]✗[/red] No entries found to delete")
         return
 
     # Show what will be deleted
-    first_entry = entries[0]
-    project = first_entry["project"] or "Untitled"
-    description = first_entry["description"] or ""
+    project = target["project"] or "Untitled"
+    description = target["description"] or ""
 
     entry_display = f"{project} - {description}" if description else project
+    if found is not None:
+        entry_display = f"{target['date']} {target['startTime']} {entry_display}"
 
     print(f"[yellow]About to delete:[/yellow] {entry_display}")
 
@@ -31,7 +56,18 @@ def del_():
         return
 
     # Proceed with deletion
-    deleted_entry = delete_first_entry()
+    if found is not None:
+        entry, start, end = found
+        try:
+            delete_row(start, end, entry)
+        except ValueError as e:
+            print(f"[red]❌ Error: {e}[/red]")
+            raise typer.Exit(1) from e
+        if (entry.get("id") or "").isdigit():
+            forget_id(int(entry["id"]))
+        deleted_entry = entry
+    else:
+        deleted_entry = delete_first_entry()
     if deleted_entry:
         print(f"[green]✓[/green] Deleted: {entry_display}")
     else:
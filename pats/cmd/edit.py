@@ -5,19 +5,32 @@ from typing import Annotated
 import typer
 from rich import print
 
-from pats.database import edit_first_entry
+from pats.database import edit_first_entry, replace_row
+from pats.ids import locate_entry
 
 
 def edit(
     args: Annotated[
         list[str], typer.Argument(help="Description words, or 'ProjectName:desc'")
     ] = None,
+    entry_id: Annotated[
+        int | None, typer.Option("--id", help="Edit the entry with this id")
+    ] = None,
+    at: Annotated[
+        str | None,
+        typer.Option(
+            "--at", help="Edit the entry running at 'YYYY-MM-DD HH:MM' instead"
+        ),
+    ] = None,
 ):
-    """Edit the first (most recent) entry in the timesheet
+    """Edit the first (most recent) entry in the timesheet, or any entry by
+    id or time
 
     Usage:
     - paTS edit new description here     (updates description only)
     - paTS edit ProjectName:new description here   (updates both)
+    - paTS edit --id 1234 ProjectName:fixed description
+    - paTS edit --at "2024-10-14 10:30" fixed description
     """
 
     if not args:
@@ -40,7 +53,9 @@ def edit(
         # All text is description
         desc_update = full_text
 
-    if edit_first_entry(project_update, desc_update if desc_update else None):
+    if entry_id is not None or at is not None:
+        edit_entry(entry_id, at, project_update, desc_update or None)
+    elif edit_first_entry(project_update, desc_update if desc_update else None):
         changes = []
         if project_update:
             changes.append(f"project: '{project_update}'")
@@ -53,3 +68,38 @@ def edit(
             print("[yellow]![/yellow] No changes made - arguments were empty")
     else:
         print("[red]✗[/red] No entries found to edit")
+
+
+def edit_entry(
+    entry_id: int | None, at: str | None, project: str | None, description: str | None
+) -> None:
+    """Edit the entry with the given id, or the one running at the given time"""
+    try:
+        found = locate_entry(entry_id, at)
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        print("[dim]Expected format: YYYY-MM-DD HH:MM (e.g., 2024-10-14 10:30)[/dim]")
+        raise typer.Exit(1) from e
+
+    if found is None:
+        target = f"with id {entry_id}" if entry_id is not None else f"at {at}"
+        print(f"[red]✗[/red] No entry found {target}")
+        raise typer.Exit(1)
+
+    entry, start, end = found
+    updated = dict(entry)
+    if project is not None:
+        updated["project"] = project
+    if description is not None:
+        updated["description"] = description
+    try:
+        replace_row(start, end, entry, updated)
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        raise typer.Exit(1) from e
+
+    project_name = updated["project"] or "No project"
+    print(
+        f"[green]✓[/green] Updated entry {entry['id']} ({entry['date']} "
+        f"{entry['startTime']}) - {project_name}: {updated['description']}"
+    )
@@ -0,0 +1,78 @@
+"""Export command for paTS"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.database import (
+    get_day_range,
+    iter_entries,
+    iter_entries_in_range,
+    parse_date_input,
+)
+from pats.exporters import EXPORT_FORMATS, export_entries
+
+
+def export(
+    fmt: Annotated[
+        str,
+        typer.Option(
+            "--format", "-f", help=f"Output format: {', '.join(EXPORT_FORMATS)}"
+        ),
+    ] = "csv",
+    from_date: Annotated[
+        str | None,
+        typer.Option("--from", help="First day in YYYY-MM-DD format (inclusive)"),
+    ] = None,
+    to_date: Annotated[
+        str | None,
+        typer.Option("--to", help="Last day in YYYY-MM-DD format (inclusive)"),
+    ] = None,
+    project: Annotated[
+        str | None, typer.Option("--project", "-p", help="Only export this project")
+    ] = None,
+    output: Annotated[
+        str, typer.Option("--output", "-o", help="Output file ('-' for stdout)")
+    ] = "-",
+):
+    """Export entries as CSV, JSON Lines or iCalendar
+
+    Usage:
+    - paTS export --from 2024-07-01 --to 2024-07-31 > july.csv
+    - paTS export -f jsonl --project Acme | jq .
+    - paTS export -f ical -o ~/timesheet.ics
+    """
+    if fmt not in EXPORT_FORMATS:
+        print(f"[red]❌ Error: Unknown export format '{fmt}'[/red]")
+        print(f"[dim]Expected one of: {', '.join(EXPORT_FORMATS)}[/dim]")
+        raise typer.Exit(1)
+
+    try:
+        if from_date or to_date:
+            start_date, end_date = datetime.min, datetime.max
+            if from_date:
+                start_date, _ = get_day_range(parse_date_input(from_date, "day"))
+            if to_date:
+                _, end_date = get_day_range(parse_date_input(to_date, "day"))
+            entries = iter_entries_in_range(start_date, end_date)
+        else:
+            entries = iter_entries()
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        print("[dim]Expected format: YYYY-MM-DD (e.g., 2024-07-30)[/dim]")
+        raise typer.Exit(1) from e
+
+    if output == "-":
+        export_entries(entries, fmt, sys.stdout, project)
+        return
+
+    output_file = Path(output)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with output_file.open("w", newline="", encoding="utf-8") as out:
+        count = export_entries(entries, fmt, out, project)
+
+    print(f"[green]✅ Exported {count} entries to {output_file}[/green]")
@@ -0,0 +1,91 @@
+"""Integrity check command for paTS"""
+
+import shutil
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.database import DATABASE_FILE, iter_entries
+from pats.display_utils import format_time_display
+from pats.fsck import (
+    FINDINGS,
+    check_database,
+    check_entries,
+    repair_database,
+    total_findings,
+)
+
+REPAIRS = {
+    "epochs": "Epochs recomputed",
+    "ids": "Ids assigned",
+    "split": "Sessions split at midnight",
+    "moved": "Rows moved into order",
+    "duplicates": "Duplicates removed",
+    "ended": "Sessions ended at the next start",
+}
+
+
+def describe_row(row: dict[str, str]) -> str:
+    """Format a row as a one-line summary for the report"""
+    start = format_time_display(row["startTime"], row["date"])
+    project = row["project"] or "No project"
+    return f"{start}-{row['endTime']} {project}: {row['description']}"
+
+
+def fsck(
+    repair: Annotated[
+        bool, typer.Option("--repair", help="Fix what can be fixed automatically")
+    ] = False,
+    yes: Annotated[
+        bool, typer.Option("--yes", "-y", help="Repair without asking")
+    ] = False,
+):
+    """Check the timesheet for broken rows, overlaps and ordering problems
+
+    Usage:
+    - paTS fsck                 (report only)
+    - paTS fsck --repair        (fix, keeping a copy of the original)
+    """
+    entries: list[dict[str, str]] = []
+    report, signature = check_database(collected=entries if repair else None)
+
+    for finding, label in FINDINGS.items():
+        if not report[finding]:
+            continue
+        print(f"[yellow]⚠️  {label}: {report[finding]}[/yellow]")
+        for row, entry, detail in report["examples"][finding]:
+            print(f"[dim]   row {row}: {describe_row(entry)} ({detail})[/dim]")
+
+    found = total_findings(report)
+    if not found:
+        print(f"[green]✅ {report['rows']} entries checked, no problems found[/green]")
+        return
+
+    print(f"[blue]🔍 {found} problems in {report['rows']} entries[/blue]")
+    if not repair:
+        if found > report["malformed"]:
+            print("[dim]Run 'paTS fsck --repair' to fix them[/dim]")
+        return
+
+    if not yes and not typer.confirm("Rewrite the timesheet with repairs?"):
+        print("[blue]✗[/blue] Repair cancelled")
+        return
+
+    backup_file = DATABASE_FILE.with_suffix(".csv.fsck")
+    shutil.copy2(DATABASE_FILE, backup_file)
+    changes = repair_database(entries, signature)
+    if changes is None:
+        print("[red]❌ The timesheet changed while checking, run fsck again[/red]")
+        raise typer.Exit(1)
+
+    for change, label in REPAIRS.items():
+        if changes[change]:
+            print(f"[green]✓[/green] {label}: {changes[change]}")
+    print(f"[dim]💾 Original kept at {backup_file}[/dim]")
+
+    remaining = total_findings(check_entries(iter_entries()))
+    if remaining:
+        print(f"[yellow]⚠️  {remaining} problems need fixing by hand[/yellow]")
+    else:
+        print("[green]✅ Timesheet repaired[/green]")
@@ -0,0 +1,68 @@
+"""Heatmap command for paTS"""
+
+import json
+import sys
+from datetime import datetime
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.aggregate import WEEKDAYS, heatmap_grid
+from pats.database import get_day_range, iter_entries_in_range, parse_date_input
+from pats.display_utils import display_heatmap
+from pats.exporters import filter_by_project
+
+
+def heatmap(
+    from_date: Annotated[
+        str | None,
+        typer.Option("--from", help="First day in YYYY-MM-DD format (inclusive)"),
+    ] = None,
+    to_date: Annotated[
+        str | None,
+        typer.Option("--to", help="Last day in YYYY-MM-DD format (inclusive)"),
+    ] = None,
+    project: Annotated[
+        str | None, typer.Option("--project", "-p", help="Only include this project")
+    ] = None,
+    as_json: Annotated[
+        bool, typer.Option("--json", help="Print the grid as JSON")
+    ] = False,
+):
+    """Show when you work: time per hour of day and weekday
+
+    Usage:
+    - paTS heatmap                                (all time)
+    - paTS heatmap --from 2024-01-01 -p Acme
+    - paTS heatmap --json > pattern.json
+    """
+    start_date, end_date = datetime.min, datetime.max
+    try:
+        if from_date:
+            start_date, _ = get_day_range(parse_date_input(from_date, "day"))
+        if to_date:
+            _, end_date = get_day_range(parse_date_input(to_date, "day"))
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        print("[dim]Expected format: YYYY-MM-DD (e.g., 2024-07-30)[/dim]")
+        raise typer.Exit(1) from e
+
+    entries = filter_by_project(iter_entries_in_range(start_date, end_date), project)
+    grid = heatmap_grid(entries)
+
+    if as_json:
+        record = {
+            "from": from_date,
+            "to": to_date,
+            "project": project,
+            "weekdays": WEEKDAYS,
+            "seconds": grid,
+        }
+        sys.stdout.write(json.dumps(record) + "\n")
+        return
+
+    period = f"{from_date or 'start'} to {to_date or 'now'}"
+    if project:
+        period = f"{project}, {period}"
+    display_heatmap(grid, f"🔥 Work Pattern - {period}", WEEKDAYS)
@@ -0,0 +1,89 @@
+"""Import command for paTS"""
+
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.display_utils import format_time_display
+from pats.importers import IMPORT_FORMATS, import_entries, parse_column_mapping
+
+
+def describe_row(row: dict[str, str]) -> str:
+    """Format a row as a one-line summary for the import report"""
+    start = format_time_display(row["startTime"], row["date"])
+    project = row["project"] or "No project"
+    return f"{start}-{row['endTime']} {project}: {row['description']}"
+
+
+def import_(
+    path: Annotated[str, typer.Argument(help="File to import")],
+    fmt: Annotated[
+        str,
+        typer.Option(
+            "--format", "-f", help=f"Input format: {', '.join(IMPORT_FORMATS)}"
+        ),
+    ] = "csv",
+    mapping: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--map",
+            "-m",
+            help="Column mapping as field=column (fields: start, end, date, "
+            "startTime, endTime, project, description)",
+        ),
+    ] = None,
+    date_format: Annotated[
+        str, typer.Option(help="strptime format of the date column")
+    ] = "%d-%m-%Y",
+    dry_run: Annotated[
+        bool, typer.Option("--dry-run", "-n", help="Report without writing")
+    ] = False,
+):
+    """Import entries from CSV, JSON Lines or other trackers' exports
+
+    Usage:
+    - paTS import backup.csv                      (paTS CSV layout)
+    - paTS import toggl.csv --format toggl        (Toggl Track detailed export)
+    - paTS import data.csv -m start=Begin -m end=Finish -m project=Client
+    """
+    input_file = Path(path)
+    if not input_file.exists():
+        print(f"[red]❌ Input file not found: {input_file}[/red]")
+        raise typer.Exit(1)
+
+    try:
+        options = {
+            "mapping": parse_column_mapping(mapping),
+            "date_format": date_format,
+        }
+        with input_file.open("r", newline="", encoding="utf-8-sig") as file:
+            report = import_entries(file, fmt, options, dry_run=dry_run)
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        raise typer.Exit(1) from e
+
+    examples = report["examples"]
+    for record_number, reason in examples["invalid"]:
+        print(f"[yellow]⚠️  Skipped record {record_number}: {reason}[/yellow]")
+    for existing, imported in examples["conflicts"]:
+        print(f"[yellow]⚠️  Conflict:[/yellow] {describe_row(imported)}")
+        print(f"[dim]   already recorded as {describe_row(existing)}[/dim]")
+    for row in examples["overlaps"]:
+        print(f"[yellow]⚠️  Overlap:[/yellow] {describe_row(row)}")
+
+    if dry_run:
+        print("[blue]🔍 Dry run - no changes written[/blue]")
+        verb = "Would import"
+    else:
+        verb = "Imported"
+
+    print(
+        f"[green]✅ {verb} {report['imported']} entries[/green] "
+        f"[dim]from {report['records']} records[/dim]"
+    )
+    print(
+        f"[dim]Invalid: {report['invalid']} | Duplicates: {report['duplicates']} | "
+        f"Conflicts: {report['conflicts']} | Overlaps: {report['overlaps']}[/dim]"
+    )
@@ -1,8 +1,14 @@
 """Info command for paTS"""
 
 from datetime import datetime
+from typing import Annotated
 
+import typer
+from rich import get_console
+
+from pats.cmd.day import WATCH_HELP
 from pats.database import combine_time_date_to_datetime, get_active_session
+from pats.watch import watch_database
 
 
 def calculate_compact_duration(start_time: str, date_str: str) -> str:
@@ -34,13 +40,10 @@ def truncate_text(text: str, max_length: int) -> str:
     return text[: max_length - 1] + "…"
 
 
-def info():
-    """Show current tracking session information (compact format for tmux)"""
-    active_session = get_active_session()
-
+def format_info(active_session: dict[str, str] | None) -> str:
+    """Format the active session as a compact status line"""
     if not active_session:
-        print("⏸")
-        return
+        return "⏸"
 
     # Get project and description
     project = active_session.get("project", "").strip()
@@ -66,5 +69,21 @@ def info():
         # No project or description
         task_info = "Work"
 
-    # Output compact format: ⏱ [task] [duration]
-    print(f"⏱  {task_info} {duration}")
+    # Compact format: ⏱ [task] [duration]
+    return f"⏱  {task_info} {duration}"
+
+
+def info(
+    watch: Annotated[bool, typer.Option("--watch", help=WATCH_HELP)] = False,
+):
+    """Show current tracking session information (compact format for tmux)"""
+    if watch:
+        watch_database(
+            get_active_session,
+            lambda session: get_console().print(
+                format_info(session), markup=False, highlight=False
+            ),
+        )
+        return
+
+    print(format_info(get_active_session()))
@@ -0,0 +1,203 @@
+"""Invoice command for paTS"""
+
+import csv
+import json
+import sys
+from typing import Annotated, Any
+
+import typer
+from rich import print
+from rich.console import Console
+from rich.table import Table
+
+from pats.config import get_hourly_rates, get_invoice_currency, get_invoice_rounding
+from pats.database import get_day_range, get_month_range, parse_date_input
+from pats.display_utils import format_total_duration
+from pats.invoice import LINE_ITEMS, invoice_range
+
+INVOICE_FORMATS = ["table", "csv", "json"]
+
+
+def write_invoice_csv(invoice: dict[str, Any]) -> None:
+    """Write line items as CSV to stdout"""
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    writer.writerow(["project", "item", "hours", "rate", "amount"])
+    for line in invoice["lines"]:
+        writer.writerow(
+            [line["project"], line["item"], line["hours"], line["rate"], line["amount"]]
+        )
+
+
+def write_invoice_json(
+    invoice: dict[str, Any], period: dict[str, str | None], currency: str
+) -> None:
+    """Write line items, subtotals and totals as JSON to stdout"""
+    record = {
+        **period,
+        "currency": currency,
+        "lines": [
+            {
+                "project": line["project"],
+                "item": line["item"],
+                "hours": float(line["hours"]),
+                "rate": float(line["rate"]),
+                "amount": float(line["amount"]),
+            }
+            for line in invoice["lines"]
+        ],
+        "projects": {
+            project: {key: float(value) for key, value in subtotal.items()}
+            for project, subtotal in invoice["projects"].items()
+        },
+        "hours": float(invoice["hours"]),
+        "amount": float(invoice["amount"]),
+        "unbilled_hours": {
+            project: round(seconds / 3600, 2)
+            for project, seconds in invoice["unbilled"].items()
+        },
+    }
+    sys.stdout.write(json.dumps(record) + "\n")
+
+
+def display_invoice(
+    invoice: dict[str, Any], title: str, by: str, currency: str
+) -> None:
+    """Show line items with a subtotal per project and the grand total"""
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Project", style="blue", width=18)
+    table.add_column("Day" if by == "day" else "Description", style="white", width=28)
+    table.add_column("Hours", style="cyan", justify="right", width=8)
+    table.add_column("Rate", style="dim", justify="right", width=10)
+    table.add_column(currency, style="green", justify="right", width=14)
+
+    previous = None
+    for line in invoice["lines"]:
+        if previous is not None and line["project"] != previous:
+            add_subtotal(table, previous, invoice["projects"][previous])
+        table.add_row(
+            line["project"] if line["project"] != previous else "",
+            line["item"],
+            f"{line['hours']:.2f}",
+            f"{line['rate']:.2f}",
+            f"{line['amount']:,.2f}",
+        )
+        previous = line["project"]
+    if previous is not None:
+        add_subtotal(table, previous, invoice["projects"][previous])
+
+    table.add_row(
+        "[bold]Total[/bold]",
+        "",
+        f"[bold]{invoice['hours']:.2f}[/bold]",
+        "",
+        f"[bold]{invoice['amount']:,.2f}[/bold]",
+    )
+    Console().print(table)
+
+
+def add_subtotal(table: Table, project: str, subtotal: dict[str, Any]) -> None:
+    """Add a project's subtotal row below its line items"""
+    table.add_row(
+        "",
+        f"[dim]{project} subtotal[/dim]",
+        f"[dim]{subtotal['hours']:.2f}[/dim]",
+        "",
+        f"[dim]{subtotal['amount']:,.2f}[/dim]",
+        end_section=True,
+    )
+
+
+def invoice(
+    from_date: Annotated[
+        str | None,
+        typer.Option(
+            "--from", help="First day in YYYY-MM-DD format (default: start of month)"
+        ),
+    ] = None,
+    to_date: Annotated[
+        str | None,
+        typer.Option("--to", help="Last day in YYYY-MM-DD format (default: today)"),
+    ] = None,
+    project: Annotated[
+        str | None, typer.Option("--project", "-p", help="Only invoice this project")
+    ] = None,
+    by: Annotated[
+        str, typer.Option("--by", "-b", help="One line item per day or description")
+    ] = "day",
+    fmt: Annotated[
+        str,
+        typer.Option(
+            "--format", "-f", help=f"Output format: {', '.join(INVOICE_FORMATS)}"
+        ),
+    ] = "table",
+):
+    """Show billable hours and amounts from the configured hourly rates
+
+    Usage:
+    - paTS invoice                                (this month so far)
+    - paTS invoice --from 2024-07-01 --to 2024-07-31 -p Acme
+    - paTS invoice --by description -f csv > july.csv
+
+    Set rates with 'paTS config set-rate PROJECT RATE' and rounding with
+    'paTS config set-rounding MINUTES'.
+    """
+    if by not in LINE_ITEMS:
+        print("[red]❌ Error: --by must be 'day' or 'description'[/red]")
+        raise typer.Exit(1)
+    if fmt not in INVOICE_FORMATS:
+        print(f"[red]❌ Error: Unknown invoice format '{fmt}'[/red]")
+        print(f"[dim]Expected one of: {', '.join(INVOICE_FORMATS)}[/dim]")
+        raise typer.Exit(1)
+
+    try:
+        # Unset dates default to the current month so far
+        start_date, _ = get_month_range(parse_date_input(None, "day"))
+        if from_date:
+            start_date, _ = get_day_range(parse_date_input(from_date, "day"))
+        _, end_date = get_day_range(parse_date_input(to_date, "day"))
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        print("[dim]Expected format: YYYY-MM-DD (e.g., 2024-07-30)[/dim]")
+        raise typer.Exit(1) from e
+
+    if start_date > end_date:
+        print("[red]❌ Error: The range must start before it ends[/red]")
+        raise typer.Exit(1)
+
+    rates = get_hourly_rates()
+    currency = get_invoice_currency()
+    result = invoice_range(
+        start_date, end_date, by, rates, get_invoice_rounding(), project
+    )
+
+    period = {
+        "from": start_date.date().isoformat(),
+        "to": end_date.date().isoformat(),
+        "project": project,
+    }
+    if fmt == "csv":
+        write_invoice_csv(result)
+        return
+    if fmt == "json":
+        write_invoice_json(result, period, currency)
+        return
+
+    if not rates:
+        print("[yellow]💶 No hourly rates configured[/yellow]")
+        print("[dim]Use 'paTS config set-rate PROJECT RATE' to add one[/dim]")
+        return
+
+    title = f"🧾 Invoice - {period['from']} to {period['to']}"
+    if project:
+        title = f"🧾 Invoice for {project} - {period['from']} to {period['to']}"
+    if result["lines"]:
+        display_invoice(result, title, by, currency)
+    else:
+        print("[yellow]🧾 No billable time found for the specified period[/yellow]")
+
+    if result["unbilled"]:
+        unbilled = ", ".join(
+            f"{name} {format_total_duration(seconds)}"
+            for name, seconds in sorted(result["unbilled"].items())
+        )
+        print(f"[dim]Not billed (no rate): {unbilled}[/dim]")
@@ -1,21 +1,31 @@
 """Month command for paTS"""
 
+from typing import Annotated
+
 import typer
 from rich import print
 
-from pats.database import get_entries_for_month, parse_date_input
+from pats.cmd.day import TAG_HELP
+from pats.database import get_entries_for_month, get_month_range, parse_date_input
 from pats.display_utils import display_entries_table
+from pats.index import filter_period_by_tags
 
 
 def month(
     date: str | None = typer.Argument(
         None, help="Date in YYYY-MM format (defaults to current month)"
     ),
+    tag: Annotated[str | None, typer.Option("--tag", help=TAG_HELP)] = None,
 ):
     """Show timesheet for a specific month"""
     try:
         # Get entries for the specified month
-        entries = get_entries_for_month(date)
+        tag_totals = None
+        if tag:
+            start_date, end_date = get_month_range(parse_date_input(date, "month"))
+            entries, tag_totals = filter_period_by_tags(tag, start_date, end_date)
+        else:
+            entries = get_entries_for_month(date)
 
         # Format the month for display
         if date:
@@ -26,8 +36,10 @@ def month(
             target_date = parse_date_input(None, "month")
             month_display = target_date.strftime("%Y-%m")
             title = f"📈 Monthly Timesheet - {month_display}"
+        if tag:
+            title += f" - {tag}"
 
-        display_entries_table(entries, title)
+        display_entries_table(entries, title, tag_totals)
 
     except ValueError as e:
         print(f"[red]❌ Error: {e}[/red]")
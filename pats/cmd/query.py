@@ -0,0 +1,82 @@
+"""Query command for paTS"""
+
+import re
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.database import datetime_sort_key, get_day_range, parse_date_input
+from pats.display_utils import display_entries_table
+from pats.index import search
+
+
+def query(
+    project: Annotated[
+        str | None, typer.Option("--project", "-p", help="Project name")
+    ] = None,
+    text: Annotated[
+        str | None,
+        typer.Option("--text", "-t", help="Description substring (case-insensitive)"),
+    ] = None,
+    regex: Annotated[
+        str | None,
+        typer.Option("--regex", "-r", help="Description regular expression"),
+    ] = None,
+    tags: Annotated[
+        list[str] | None,
+        typer.Option("--tag", help="#tag the description must contain (repeatable)"),
+    ] = None,
+    from_date: Annotated[
+        str | None,
+        typer.Option("--from", help="First day in YYYY-MM-DD format (inclusive)"),
+    ] = None,
+    to_date: Annotated[
+        str | None,
+        typer.Option("--to", help="Last day in YYYY-MM-DD format (inclusive)"),
+    ] = None,
+    show_ids: Annotated[
+        bool, typer.Option("--ids", help="Show entry ids, for 'paTS edit --id'")
+    ] = False,
+):
+    """Search entries by project, description and #tags
+
+    Usage:
+    - paTS query --text ABC-123 --from 2024-07-01     (tickets mentioning ABC-123)
+    - paTS query --project Acme --tag billable
+    - paTS query --regex "review|deploy" --to 2024-06-30
+    """
+    try:
+        start_key = end_key = None
+        if from_date:
+            start_date, _ = get_day_range(parse_date_input(from_date, "day"))
+            start_key = datetime_sort_key(start_date)
+        if to_date:
+            _, end_date = get_day_range(parse_date_input(to_date, "day"))
+            end_key = datetime_sort_key(end_date)
+
+        entries = search(project, text, regex, tags, start_key, end_key)
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        print("[dim]Expected format: YYYY-MM-DD (e.g., 2024-07-30)[/dim]")
+        return
+    except re.error as e:
+        print(f"[red]❌ Error: Invalid regular expression: {e}[/red]")
+        return
+
+    filters = []
+    if project is not None:
+        filters.append(f"project '{project}'")
+    if text:
+        filters.append(f"'{text}'")
+    if regex:
+        filters.append(f"/{regex}/")
+    filters.extend(f"#{tag.lstrip('#')}" for tag in tags or [])
+    if from_date or to_date:
+        filters.append(f"{from_date or '…'} to {to_date or '…'}")
+
+    title = "🔍 Query Results"
+    if filters:
+        title += f" - {', '.join(filters)}"
+
+    display_entries_table(entries, title, show_ids=show_ids)
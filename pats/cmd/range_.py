@@ -0,0 +1,78 @@
+"""Range command for paTS"""
+
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.aggregate import (
+    PERIODS,
+    aggregate_range,
+    collect_range,
+    fill_periods,
+    period_label,
+)
+from pats.config import get_weekly_goal_hours
+from pats.database import get_day_range, parse_date_input
+from pats.display_utils import display_entries_grouped_by_day, display_period_summary
+
+
+def range_(
+    from_date: Annotated[str, typer.Argument(help="First day in YYYY-MM-DD format")],
+    to_date: Annotated[str, typer.Argument(help="Last day in YYYY-MM-DD format")],
+    by: Annotated[
+        str, typer.Option("--by", "-b", help="Subtotal period: week or month")
+    ] = "week",
+    summary: Annotated[
+        bool, typer.Option("--summary", "-s", help="Only show the subtotals")
+    ] = False,
+):
+    """Show timesheet for any date range with per-week or per-month subtotals
+
+    Usage:
+    - paTS range 2024-07-01 2024-09-30             (a quarter, by week)
+    - paTS range 2024-01-01 2024-06-30 --by month --summary
+    """
+    if by not in PERIODS[1:]:
+        print("[red]❌ Error: --by must be 'week' or 'month'[/red]")
+        return
+
+    try:
+        start_date, _ = get_day_range(parse_date_input(from_date, "day"))
+        _, end_date = get_day_range(parse_date_input(to_date, "day"))
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        print("[dim]Expected format: YYYY-MM-DD (e.g., 2024-07-30)[/dim]")
+        return
+
+    if start_date > end_date:
+        print("[red]❌ Error: The range must start before it ends[/red]")
+        return
+
+    if summary:
+        buckets = aggregate_range(start_date, end_date, by)
+    else:
+        # Entries and subtotals come from a single seek-and-scan
+        entries, buckets = collect_range(start_date, end_date, by)
+    periods = fill_periods(buckets, start_date.date(), end_date.date(), by)
+
+    weekly_goal = get_weekly_goal_hours()
+    period_goal = weekly_goal if by == "week" else None
+    range_display = f"{from_date} to {to_date}"
+
+    if not summary:
+        weeks = ((end_date - start_date).days + 1) / 7
+        display_entries_grouped_by_day(
+            entries,
+            f"📊 Timesheet - {range_display}",
+            summary_label="Range",
+            goal_label="Goal",
+            goal_hours=round(weekly_goal * weeks, 1),
+        )
+        print()
+
+    display_period_summary(
+        [(period_label(start, by), bucket) for start, bucket in periods.items()],
+        f"📊 Subtotals by {by.title()} - {range_display}",
+        period_goal,
+    )
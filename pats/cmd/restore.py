@@ -8,6 +8,7 @@ import typer
 from rich import print
 
 from pats.database import DATABASE_FILE
+from pats.index import invalidate_index
 
 
 def restore(
@@ -73,6 +74,7 @@ def restore(
 
         # Copy the backup file to database location
         shutil.copy2(backup_file, DATABASE_FILE)
+        invalidate_index()
 
         print("[green]✅ Restore completed successfully![/green]")
         print(f"[blue]Backup:[/blue] {backup_file}")
@@ -0,0 +1,35 @@
+"""Serve command for paTS"""
+
+import asyncio
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.server import DEFAULT_PORT, run_server
+
+
+def serve(
+    host: Annotated[
+        str, typer.Option("--host", help="Address to listen on")
+    ] = "127.0.0.1",
+    port: Annotated[
+        int, typer.Option("--port", "-p", help="Port to listen on")
+    ] = DEFAULT_PORT,
+):
+    """Serve the timesheet as a local HTTP/JSON API
+
+    Usage:
+    - paTS serve                    (http://127.0.0.1:8765)
+    - curl localhost:8765/active
+    - curl -X POST localhost:8765/start -d '{"project": "Acme"}'
+    """
+    print(f"[green]🌐 Serving paTS on http://{host}:{port}[/green]")
+    print("[dim]Press Ctrl+C to stop[/dim]")
+    try:
+        asyncio.run(run_server(host, port))
+    except KeyboardInterrupt:
+        print("[blue]👋 Server stopped[/blue]")
+    except OSError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        raise typer.Exit(1) from e
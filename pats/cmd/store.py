@@ -0,0 +1,87 @@
+"""Binary store commands for paTS"""
+
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.binstore import (
+    BINARY_DIR,
+    RECORDS_NAME,
+    STRINGS_NAME,
+    export_csv,
+    get_active_session,
+    import_csv,
+    load_strings,
+    open_records,
+    record_count,
+    store_exists,
+)
+from pats.database import DATABASE_FILE
+
+app = typer.Typer(help="Manage the fixed-width binary record store")
+
+
+@app.command("import-csv")
+def import_csv_cmd():
+    """Build the binary store from ~/.pats/timesheet.csv, replacing it"""
+    try:
+        count, skipped = import_csv()
+    except OSError as e:
+        print(f"[red]❌ Error building binary store: {e}[/red]")
+        raise typer.Exit(1) from e
+
+    print(f"[green]✅ Stored {count} entries in {BINARY_DIR}[/green]")
+    if skipped:
+        print(f"[yellow]⚠️  Skipped {skipped} rows without a valid start[/yellow]")
+
+
+@app.command("export-csv")
+def export_csv_cmd(
+    output: Annotated[
+        Path, typer.Argument(help="CSV file to write (e.g. ~/.pats/timesheet.csv)")
+    ],
+):
+    """Write the binary store back out as a human-readable timesheet CSV"""
+    if not store_exists():
+        print("[yellow]⚠️  No binary store yet, run 'paTS store import-csv'[/yellow]")
+        raise typer.Exit(1)
+
+    output = output.expanduser()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        count = export_csv(output)
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        raise typer.Exit(1) from e
+    print(f"[green]✅ Exported {count} entries to {output}[/green]")
+    if output.resolve() == DATABASE_FILE.resolve():
+        print("[dim]💾 The timesheet now matches the binary store[/dim]")
+
+
+@app.command()
+def info():
+    """Show the size and state of the binary store"""
+    if not store_exists():
+        print("[yellow]⚠️  No binary store yet, run 'paTS store import-csv'[/yellow]")
+        return
+
+    try:
+        with open_records() as records:
+            count = record_count(records)
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        raise typer.Exit(1) from e
+    strings = len(load_strings())
+    size_kb = (BINARY_DIR / RECORDS_NAME).stat().st_size / 1024
+    strings_kb = (BINARY_DIR / STRINGS_NAME).stat().st_size / 1024
+
+    print("[bold]🗄️  Binary store:[/bold]")
+    print(f"  Records: [blue]{count}[/blue] ({size_kb:.1f} KB)")
+    print(f"  Strings: [blue]{strings}[/blue] ({strings_kb:.1f} KB)")
+
+    active = get_active_session()
+    if active:
+        project = active["project"] or "No project"
+        print(f"  Active: [green]{project}[/green] since {active['startTime']}")
@@ -0,0 +1,62 @@
+"""Tags command for paTS"""
+
+from typing import Annotated
+
+import typer
+from rich import print
+from rich.console import Console
+from rich.table import Table
+
+from pats.cmd.day import TAG_HELP
+from pats.database import datetime_sort_key, get_day_range, parse_date_input
+from pats.display_utils import format_total_duration
+from pats.index import tag_totals
+
+
+def tags(
+    from_date: Annotated[
+        str | None,
+        typer.Option("--from", help="First day in YYYY-MM-DD format (inclusive)"),
+    ] = None,
+    to_date: Annotated[
+        str | None,
+        typer.Option("--to", help="Last day in YYYY-MM-DD format (inclusive)"),
+    ] = None,
+    tag: Annotated[str | None, typer.Option("--tag", help=TAG_HELP)] = None,
+):
+    """Show total time per #tag for a period (all time by default)"""
+    try:
+        start_key = end_key = None
+        if from_date:
+            start_date, _ = get_day_range(parse_date_input(from_date, "day"))
+            start_key = datetime_sort_key(start_date)
+        if to_date:
+            _, end_date = get_day_range(parse_date_input(to_date, "day"))
+            end_key = datetime_sort_key(end_date)
+
+        totals = tag_totals(start_key, end_key, tag)
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        return
+
+    if not totals:
+        print("[yellow]🏷️  No tagged entries found for the specified period[/yellow]")
+        print(
+            "[dim]Add tags to descriptions, e.g. 'paTS start Acme:fix #billable'[/dim]"
+        )
+        return
+
+    period = f"{from_date or 'start'} to {to_date or 'now'}"
+    table = Table(
+        title=f"🏷️  Time by Tag - {period}",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("Tag", style="magenta", width=24)
+    table.add_column("Time", style="green", width=12)
+    table.add_column("Hours", style="cyan", justify="right", width=8)
+
+    for token, seconds in sorted(totals.items(), key=lambda x: x[1], reverse=True):
+        table.add_row(token, format_total_duration(seconds), f"{seconds / 3600:.2f}")
+
+    Console().print(table)
@@ -0,0 +1,121 @@
+"""Team report command for paTS"""
+
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.aggregate import PERIODS, fill_periods, period_label
+from pats.config import get_weekly_goal_hours
+from pats.database import get_day_range, get_month_range, parse_date_input
+from pats.display_utils import display_period_summary
+from pats.team import combine_buckets, find_timesheets, team_totals
+
+
+def team_report(
+    directory: Annotated[
+        Path,
+        typer.Argument(
+            help="Directory of members' timesheets (NAME.csv or NAME/timesheet.csv)"
+        ),
+    ],
+    from_date: Annotated[
+        str | None,
+        typer.Option(
+            "--from", help="First day in YYYY-MM-DD format (default: start of month)"
+        ),
+    ] = None,
+    to_date: Annotated[
+        str | None,
+        typer.Option("--to", help="Last day in YYYY-MM-DD format (default: today)"),
+    ] = None,
+    by: Annotated[
+        str, typer.Option("--by", "-b", help="Subtotal period: week or month")
+    ] = "week",
+    detail: Annotated[
+        bool, typer.Option("--detail", "-d", help="Also show each member's periods")
+    ] = False,
+):
+    """Combine team members' timesheets into one report per week or month
+
+    Usage:
+    - paTS team-report ~/shared/timesheets
+    - paTS team-report ~/shared/timesheets --from 2024-07-01 --to 2024-09-30 --by month
+    """
+    if by not in PERIODS[1:]:
+        print("[red]❌ Error: --by must be 'week' or 'month'[/red]")
+        raise typer.Exit(1)
+
+    try:
+        # Unset dates default to the current month so far
+        start_date, _ = get_month_range(parse_date_input(None, "day"))
+        if from_date:
+            start_date, _ = get_day_range(parse_date_input(from_date, "day"))
+        _, end_date = get_day_range(parse_date_input(to_date, "day"))
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        print("[dim]Expected format: YYYY-MM-DD (e.g., 2024-07-30)[/dim]")
+        raise typer.Exit(1) from e
+
+    if start_date > end_date:
+        print("[red]❌ Error: The range must start before it ends[/red]")
+        raise typer.Exit(1)
+
+    if not directory.is_dir():
+        print(f"[red]❌ Error: {directory} is not a directory[/red]")
+        raise typer.Exit(1)
+
+    timesheets = find_timesheets(directory)
+    if not timesheets:
+        print(f"[yellow]👥 No timesheets found in {directory}[/yellow]")
+        print("[dim]Expected NAME.csv files or NAME/timesheet.csv folders[/dim]")
+        return
+
+    open_sessions: list[str] = []
+    team, members = team_totals(timesheets, start_date, end_date, by, open_sessions)
+    range_display = f"{start_date.date()} to {end_date.date()}"
+    period_goal = get_weekly_goal_hours() * len(timesheets) if by == "week" else None
+
+    display_period_summary(
+        [
+            (period_label(start, by), bucket)
+            for start, bucket in fill_periods(
+                team, start_date.date(), end_date.date(), by
+            ).items()
+        ],
+        f"👥 Team by {by.title()} - {range_display}",
+        period_goal,
+    )
+    print()
+
+    goal_hours = None
+    if by == "week":
+        weeks = ((end_date - start_date).days + 1) / 7
+        goal_hours = round(get_weekly_goal_hours() * weeks, 1)
+    display_period_summary(
+        [(member, combine_buckets(buckets)) for member, buckets in members.items()],
+        f"👥 Team Members - {range_display}",
+        goal_hours,
+        label_header="Member",
+    )
+    if open_sessions:
+        names = ", ".join(sorted(set(open_sessions)))
+        print(
+            f"[dim]⏳ Open sessions ({names}) are counted up to their "
+            "timesheet's last change[/dim]"
+        )
+
+    if detail:
+        for member, buckets in members.items():
+            print()
+            display_period_summary(
+                [
+                    (period_label(start, by), bucket)
+                    for start, bucket in fill_periods(
+                        buckets, start_date.date(), end_date.date(), by
+                    ).items()
+                ],
+                f"👤 {member} by {by.title()} - {range_display}",
+                get_weekly_goal_hours() if by == "week" else None,
+            )
@@ -0,0 +1,69 @@
+"""Trend command for paTS"""
+
+from datetime import datetime
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.aggregate import (
+    aggregate_range,
+    fill_periods,
+    period_label,
+    period_start,
+    previous_period_start,
+)
+from pats.config import get_weekly_goal_hours
+from pats.display_utils import display_trend
+
+
+def trend(
+    weeks: Annotated[
+        int | None, typer.Option("--weeks", "-w", help="Number of weeks to compare")
+    ] = None,
+    months: Annotated[
+        int | None, typer.Option("--months", "-m", help="Number of months to compare")
+    ] = None,
+):
+    """Show totals and project changes over recent weeks or months
+
+    Usage:
+    - paTS trend --weeks 12     (the last 12 weeks, including this one)
+    - paTS trend --months 6
+    """
+    if weeks is not None and months is not None:
+        print("[red]❌ Error: Use either --weeks or --months, not both[/red]")
+        return
+
+    period = "month" if months is not None else "week"
+    count = months if months is not None else (weeks or 8)
+    if count < 1:
+        print(f"[red]❌ Error: Number of {period}s must be at least 1[/red]")
+        return
+
+    now = datetime.now().astimezone()
+    first = period_start(now.date(), period)
+    for _ in range(count - 1):
+        first = previous_period_start(first, period)
+
+    start_date = now.replace(
+        year=first.year,
+        month=first.month,
+        day=first.day,
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+    end_date = now.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+    # Every period is bucketed from a single (possibly parallel) read of the window
+    buckets = aggregate_range(start_date, end_date, period)
+    periods = fill_periods(buckets, first, now.date(), period)
+
+    goal_hours = get_weekly_goal_hours() if period == "week" else None
+    display_trend(
+        [(period_label(start, period), bucket) for start, bucket in periods.items()],
+        f"📈 Trend - Last {count} {period.title()}s",
+        goal_hours,
+    )
@@ -1,22 +1,36 @@
 """Week command for paTS"""
 
+from typing import Annotated
+
 import typer
 from rich import print
 
+from pats.cmd.day import TAG_HELP, WATCH_HELP
 from pats.database import get_entries_for_week, get_week_range, parse_date_input
-from pats.display_utils import display_entries_grouped_by_day
+from pats.display_utils import render_days, summarise_days
+from pats.index import filter_period_by_tags
+from pats.watch import watch_database
+
+
+def load_week(
+    date: str | None, tag: str | None
+) -> tuple[list[dict[str, str]], dict[str, int] | None]:
+    """Read a week's entries, and its tag totals when filtering by tag"""
+    if tag:
+        start_date, end_date = get_week_range(parse_date_input(date, "week"))
+        return filter_period_by_tags(tag, start_date, end_date)
+    return get_entries_for_week(date), None
 
 
 def week(
     date: str | None = typer.Argument(
         None, help="Date in YYYY-MM-DD format (defaults to current week)"
     ),
+    tag: Annotated[str | None, typer.Option("--tag", help=TAG_HELP)] = None,
+    watch: Annotated[bool, typer.Option("--watch", help=WATCH_HELP)] = False,
 ):
     """Show timesheet for a specific week"""
     try:
-        # Get entries for the specified week
-        entries = get_entries_for_week(date)
-
         # Format the week range for display
         if date:
             target_date = parse_date_input(date, "week")
@@ -28,8 +42,20 @@ def week(
             f"{start_week.strftime('%Y-%m-%d')} to {end_week.strftime('%Y-%m-%d')}"
         )
         title = f"📊 Weekly Timesheet - {week_display}"
+        if tag:
+            title += f" - {tag}"
 
-        display_entries_grouped_by_day(entries, title)
+        def load():
+            entries, tag_totals = load_week(date, tag)
+            return summarise_days(entries), tag_totals
+
+        def draw(data):
+            render_days(data[0], title, data[1])
+
+        if watch:
+            watch_database(load, draw)
+        else:
+            draw(load())
 
     except ValueError as e:
         print(f"[red]❌ Error: {e}[/red]")
@@ -0,0 +1,61 @@
+"""Year command for paTS"""
+
+from datetime import datetime
+from typing import Annotated
+
+import typer
+from rich import print
+
+from pats.aggregate import aggregate_range, collect_range, fill_periods, period_label
+from pats.config import get_weekly_goal_hours
+from pats.display_utils import display_entries_grouped_by_day, display_period_summary
+
+
+def year(
+    year_number: Annotated[
+        int | None,
+        typer.Argument(
+            metavar="YEAR", help="Year in YYYY format (defaults to current)"
+        ),
+    ] = None,
+    detail: Annotated[
+        bool, typer.Option("--detail", "-d", help="Also show every day's entries")
+    ] = False,
+):
+    """Show a year's timesheet summarised per month"""
+    now = datetime.now().astimezone()
+    target_year = year_number or now.year
+
+    try:
+        start_date = now.replace(
+            year=target_year, month=1, day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+    except ValueError as e:
+        print(f"[red]❌ Error: {e}[/red]")
+        return
+    end_date = start_date.replace(
+        month=12, day=31, hour=23, minute=59, second=59, microsecond=999999
+    )
+
+    if detail:
+        # Entries and monthly subtotals come from a single seek-and-scan
+        entries, buckets = collect_range(start_date, end_date, "month")
+    else:
+        buckets = aggregate_range(start_date, end_date, "month")
+    periods = fill_periods(buckets, start_date.date(), end_date.date(), "month")
+
+    if detail:
+        weeks = ((end_date - start_date).days + 1) / 7
+        display_entries_grouped_by_day(
+            entries,
+            f"📆 Yearly Timesheet - {target_year}",
+            summary_label="Year",
+            goal_label="Goal",
+            goal_hours=round(get_weekly_goal_hours() * weeks, 1),
+        )
+        print()
+
+    display_period_summary(
+        [(period_label(start, "month"), bucket) for start, bucket in periods.items()],
+        f"📆 Yearly Timesheet - {target_year}",
+    )
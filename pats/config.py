@@ -46,8 +46,14 @@ def get_default_config() -> dict[str, Any]:
     """Get default configuration"""
     return {
         "excluded_projects": [],
+        "excluded_patterns": [],
+        "project_aliases": {},
         "daily_goal_hours": 8.0,
         "weekly_goal_hours": 40.0,
+        "aggregation_backend": "python",
+        "hourly_rates": {},
+        "invoice_rounding": {"minutes": 0, "mode": "up"},
+        "invoice_currency": "EUR",
     }
 
 
@@ -64,6 +70,38 @@ def set_excluded_projects(projects: list[str]) -> None:
     save_config(config)
 
 
+def get_excluded_patterns() -> list[str]:
+    """Get glob (or `re:` regex) patterns of projects to exclude from totals"""
+    config = load_config()
+    return config.get("excluded_patterns", [])
+
+
+def set_excluded_patterns(patterns: list[str]) -> None:
+    """Set patterns of projects to exclude from totals"""
+    config = load_config()
+    config["excluded_patterns"] = patterns
+    save_config(config)
+
+
+def get_project_aliases() -> dict[str, str]:
+    """Get the mapping of project names or patterns to canonical projects"""
+    config = load_config()
+    return config.get("project_aliases", {})
+
+
+def set_project_alias(pattern: str, project: str | None) -> None:
+    """Count projects matching a name or pattern as `project`, or remove
+    the alias when `project` is None"""
+    config = load_config()
+    aliases = dict(config.get("project_aliases", {}))
+    if project is None:
+        aliases.pop(pattern, None)
+    else:
+        aliases[pattern] = project
+    config["project_aliases"] = aliases
+    save_config(config)
+
+
 def get_daily_goal_hours() -> float:
     """Get daily goal hours"""
     config = load_config()
@@ -88,3 +126,81 @@ def set_weekly_goal_hours(hours: float) -> None:
     config = load_config()
     config["weekly_goal_hours"] = hours
     save_config(config)
+
+
+AGGREGATION_BACKENDS = ["python", "numpy"]
+
+
+def get_aggregation_backend() -> str:
+    """Get the backend used to aggregate reports (python or numpy)"""
+    config = load_config()
+    return config.get("aggregation_backend", "python")
+
+
+def set_aggregation_backend(backend: str) -> None:
+    """Set the backend used to aggregate reports"""
+    if backend not in AGGREGATION_BACKENDS:
+        raise ValueError(
+            f"Unknown backend '{backend}'. Expected one of: "
+            + ", ".join(AGGREGATION_BACKENDS)
+        )
+    config = load_config()
+    config["aggregation_backend"] = backend
+    save_config(config)
+
+
+ROUNDING_MODES = ["up", "nearest", "down"]
+
+
+def get_hourly_rates() -> dict[str, float]:
+    """Get hourly rates per project ("*" is the rate for any other project)"""
+    config = load_config()
+    return config.get("hourly_rates", {})
+
+
+def set_hourly_rate(project: str, rate: float | None) -> None:
+    """Set a project's hourly rate, or remove it when `rate` is None"""
+    if rate is not None and rate < 0:
+        raise ValueError("The hourly rate can't be negative")
+    config = load_config()
+    rates = dict(config.get("hourly_rates", {}))
+    if rate is None:
+        rates.pop(project, None)
+    else:
+        rates[project] = rate
+    config["hourly_rates"] = rates
+    save_config(config)
+
+
+def get_invoice_rounding() -> tuple[int, str]:
+    """Get the minutes invoice line items are rounded to and the direction"""
+    config = load_config()
+    rounding = config.get("invoice_rounding", {})
+    return rounding.get("minutes", 0), rounding.get("mode", "up")
+
+
+def set_invoice_rounding(minutes: int, mode: str) -> None:
+    """Round invoice line items to a number of minutes (0 for none)"""
+    if minutes < 0:
+        raise ValueError("Rounding minutes can't be negative")
+    if mode not in ROUNDING_MODES:
+        raise ValueError(
+            f"Unknown rounding mode '{mode}'. Expected one of: "
+            + ", ".join(ROUNDING_MODES)
+        )
+    config = load_config()
+    config["invoice_rounding"] = {"minutes": minutes, "mode": mode}
+    save_config(config)
+
+
+def get_invoice_currency() -> str:
+    """Get the currency shown on invoices"""
+    config = load_config()
+    return config.get("invoice_currency", "EUR")
+
+
+def set_invoice_currency(currency: str) -> None:
+    """Set the currency shown on invoices"""
+    config = load_config()
+    config["invoice_currency"] = currency
+    save_config(config)
@@ -1,12 +1,55 @@
 """CSV database utilities for paTS timesheet tracking"""
 
 import csv
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from itertools import chain, islice
 from pathlib import Path
+from typing import BinaryIO
+
+from pats.fastcsv import read_columns, read_file_rows, rows_to_entries
+from pats.sidecar import csv_signature, load_sidecar, save_sidecar
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
 
 # CSV file location in user's home directory
 DATABASE_FILE = Path.home() / ".pats" / "timesheet.csv"
-CSV_HEADERS = ["startTime", "endTime", "date", "project", "description"]
+
+# Human-readable columns, in local time
+ENTRY_HEADERS = ["startTime", "endTime", "date", "project", "description"]
+
+# Schema v3: start and end as UTC epoch seconds (minute precision) and the
+# local UTC offset in seconds at the start. The end is empty while active.
+EPOCH_HEADERS = ["startEpoch", "endEpoch", "utcOffset"]
+
+# Schema v4: a stable integer id per entry, handed out in creation order
+ID_HEADERS = ["id"]
+
+CSV_HEADERS = ENTRY_HEADERS + EPOCH_HEADERS + ID_HEADERS
+
+# The next id to hand out, so ids are never reused
+NEXT_ID_FILE = DATABASE_FILE.parent / "next_id"
+
+# Held by writers while they read, modify and replace the database
+LOCK_FILE = DATABASE_FILE.parent / "timesheet.lock"
+
+UNIX_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+# Bytes checked at once when scanning for rows containing a marker
+SCAN_BLOCK_BYTES = 1024 * 1024
+
+# Lines a single quoted field may span when resynchronising on a row start
+MAX_RECORD_LINES = 100
 
 
 def ensure_database_exists() -> None:
@@ -19,6 +62,37 @@ def ensure_database_exists() -> None:
             writer.writerow(CSV_HEADERS)
 
 
+_lock_state = threading.local()
+
+
+@contextmanager
+def database_lock() -> Iterator[None]:
+    """Hold the database's write lock while reading, modifying and replacing it.
+
+    Writers in other processes and threads wait for it, so byte offsets read
+    under the lock still point at the same rows when they are spliced. Nested
+    uses in one thread share the lock. Without fcntl (on Windows) writes are
+    not serialised.
+    """
+    depth = getattr(_lock_state, "depth", 0)
+    if depth or fcntl is None:
+        _lock_state.depth = depth + 1
+        try:
+            yield
+        finally:
+            _lock_state.depth = depth
+        return
+
+    LOCK_FILE.parent.mkdir(exist_ok=True)
+    with LOCK_FILE.open("a") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        _lock_state.depth = 1
+        try:
+            yield
+        finally:
+            _lock_state.depth = 0
+
+
 def get_current_time() -> str:
     """Get current time in HH:MM format"""
     return datetime.now().strftime("%H:%M")
@@ -59,152 +133,473 @@ def combine_time_date_to_datetime(time_str: str, date_str: str) -> datetime:
         minute = int(time_parts[1])
         second = int(time_parts[2]) if len(time_parts) > 2 else 0
 
-        # Create datetime with local timezone
-        dt = datetime(year, month, day, hour, minute, second)
-        return dt.replace(tzinfo=datetime.now().astimezone().tzinfo)
-    except (ValueError, IndexError):
+        # Attach the local UTC offset in effect on that date, not today's
+        return datetime(year, month, day, hour, minute, second).astimezone()
+    except (ValueError, IndexError, OverflowError):
         return None
 
 
-def migrate_time_format() -> None:
-    """Migrate database from hh:mm:ss to hh:mm time format.
+def add_epoch_fields(entry: dict[str, str]) -> dict[str, str]:
+    """Get an entry with its epoch columns filled in from its local times.
 
-    Converts existing startTime and endTime fields from HH:MM:SS to HH:MM format.
+    Entries that already have a start epoch are returned unchanged. Sessions
+    whose end is before their start are taken to end the following day.
     """
-    if not DATABASE_FILE.exists():
-        return
+    if entry.get("startEpoch"):
+        return entry
 
-    # Read existing data
-    with DATABASE_FILE.open("r", newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
-        entries = list(reader)
+    entry = {**entry, "startEpoch": "", "endEpoch": "", "utcOffset": ""}
+    start = combine_time_date_to_datetime(entry.get("startTime"), entry.get("date"))
+    if start is None:
+        return entry
 
-    # Check if migration is needed (look for entries with seconds)
-    needs_migration = False
-    for entry in entries:
-        start_time = entry.get("startTime", "")
-        end_time = entry.get("endTime", "")
+    entry["startEpoch"] = str(int(start.timestamp()))
+    entry["utcOffset"] = str(int(start.utcoffset().total_seconds()))
 
-        # Check if any time has seconds (contains two colons)
-        if start_time.count(":") == 2 or end_time.count(":") == 2:
-            needs_migration = True
-            break
+    end = combine_time_date_to_datetime(entry.get("endTime"), entry.get("date"))
+    if end is not None:
+        if end < start:
+            # Resolve the offset again, as it may differ the next day
+            end = (end.replace(tzinfo=None) + timedelta(days=1)).astimezone()
+        entry["endEpoch"] = str(int(end.timestamp()))
+    return entry
 
-    if not needs_migration:
-        return  # Already migrated or no data
 
-    print("🔄 Migrating time format from hh:mm:ss to hh:mm...")
+def epoch_span(entry: dict[str, str], now: int | None = None) -> tuple[int, int] | None:
+    """Get an entry's start and end as UTC epochs, if it has schema v3 columns.
 
-    # Convert entries to new format
-    migrated_count = 0
-    for entry in entries:
-        start_time = entry.get("startTime", "")
-        end_time = entry.get("endTime", "")
-
-        # Convert startTime if it has seconds
-        if start_time and start_time.count(":") == 2:
-            try:
-                parts = start_time.split(":")
-                entry["startTime"] = f"{parts[0]}:{parts[1]}"
-                migrated_count += 1
-            except (IndexError, ValueError):
-                pass  # Keep original if parsing fails
-
-        # Convert endTime if it has seconds
-        if end_time and end_time.count(":") == 2:
-            try:
-                parts = end_time.split(":")
-                entry["endTime"] = f"{parts[0]}:{parts[1]}"
-            except (IndexError, ValueError):
-                pass  # Keep original if parsing fails
-
-    # Write converted data
-    with DATABASE_FILE.open("w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=CSV_HEADERS)
-        writer.writeheader()
-        writer.writerows(entries)
-
-    print(f"✅ Migrated time format for {migrated_count} time entries")
-
-
-def migrate_database_format() -> None:
-    """Migrate database from old format to new format.
-
-    Converts (startDateTime, endDateTime) to (startTime, endTime, date).
+    Active sessions end at `now` (the current time by default).
     """
-    if not DATABASE_FILE.exists():
-        return
+    try:
+        start = int(entry["startEpoch"])
+        if not entry.get("endTime"):
+            return start, int(time.time()) if now is None else now
+        return start, int(entry["endEpoch"])
+    except (KeyError, TypeError, ValueError):
+        return None
 
-    # Read existing data
-    with DATABASE_FILE.open("r", newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
-        old_entries = list(reader)
 
-    # Check if migration is needed (look for old column names)
-    if not old_entries or "startDateTime" not in old_entries[0]:
-        return  # Already migrated or empty file
+def local_seconds(entry: dict[str, str]) -> int | None:
+    """Get the local wall-clock start of a schema v3 entry, as counted by
+    `wall_seconds`"""
+    try:
+        return int(entry["startEpoch"]) + int(entry["utcOffset"])
+    except (KeyError, TypeError, ValueError):
+        return None
 
-    print("🔄 Migrating database format...")
 
-    # Convert entries to new format
-    new_entries = []
-    for entry in old_entries:
-        start_time, start_date = parse_datetime_to_time_date(
-            entry.get("startDateTime", "")
-        )
-        end_time, end_date = parse_datetime_to_time_date(entry.get("endDateTime", ""))
+def wall_seconds(dt: datetime) -> int:
+    """Count the wall-clock seconds of a datetime since 1970-01-01 00:00,
+    ignoring any timezone"""
+    days = dt.toordinal() - UNIX_EPOCH_ORDINAL
+    return days * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
 
-        # For entries that span multiple days, we'll use the start date
-        # This is a simplification - in reality, we might want to split such entries
-        date_to_use = start_date if start_date else end_date
 
-        new_entry = {
-            "startTime": start_time,
-            "endTime": end_time,
-            "date": date_to_use,
-            "project": entry.get("project", ""),
-            "description": entry.get("description", ""),
-        }
-        new_entries.append(new_entry)
+def current_session_time() -> datetime:
+    """Get the current local time, truncated to the minute like stored times"""
+    return datetime.now().astimezone().replace(second=0, microsecond=0)
 
-    # Write converted data with new headers
-    with DATABASE_FILE.open("w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=CSV_HEADERS)
-        writer.writeheader()
-        writer.writerows(new_entries)
 
-    print(f"✅ Migrated {len(new_entries)} entries to new format")
+def session_fields(now: datetime, end: bool = False) -> dict[str, str]:
+    """Get the columns recording a session starting (or ending) at `now`"""
+    if end:
+        return {"endTime": now.strftime("%H:%M"), "endEpoch": str(int(now.timestamp()))}
+    return {
+        "startTime": now.strftime("%H:%M"),
+        "date": now.strftime("%d-%m-%Y"),
+        "startEpoch": str(int(now.timestamp())),
+        "utcOffset": str(int(now.utcoffset().total_seconds())),
+    }
 
 
-def read_entries() -> list[dict[str, str]]:
-    """Read all entries from CSV file, ordered from most recent to oldest"""
+def max_entry_id(path: Path | None = None) -> int:
+    """Get the highest entry id in a timesheet, or 0 if it has none"""
+    path = path or DATABASE_FILE
+    if not path.exists():
+        return 0
+    _, columns = read_columns(path.read_bytes())
+    ids = columns.get("id", [])
+    return max((int(value) for value in ids if value.isdigit()), default=0)
+
+
+def read_next_id() -> int:
+    """Get the next unused entry id, scanning the timesheet for the highest
+    one if the counter is missing"""
+    try:
+        return int(NEXT_ID_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return max_entry_id() + 1
+
+
+def save_next_id(next_id: int) -> None:
+    """Atomically record the next unused entry id"""
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{NEXT_ID_FILE.name}.", dir=NEXT_ID_FILE.parent
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(str(next_id))
+        os.replace(tmp_name, NEXT_ID_FILE)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def assign_ids(entries: Iterable[dict[str, str]]) -> Iterator[dict[str, str]]:
+    """Yield entries, giving copies of those without an id the next unused ones.
+
+    The counter is only read once an entry needs an id, and saved afterwards.
+    Callers hold `database_lock` so concurrent writers never share an id.
+    """
+    next_id = None
+    try:
+        for entry in entries:
+            if not entry.get("id"):
+                if next_id is None:
+                    next_id = read_next_id()
+                entry = {**entry, "id": str(next_id)}
+                next_id += 1
+            yield entry
+    finally:
+        if next_id is not None:
+            save_next_id(next_id)
+
+
+def prepare_database() -> None:
+    """Ensure the database exists and has been migrated to the current format"""
+    # Imported here as the migrations module depends on this one
+    from pats.migrations import run_pending_migrations
+
     ensure_database_exists()
-    migrate_database_format()  # Ensure datetime migration is done first
-    migrate_time_format()  # Ensure time format migration is done second
+    run_pending_migrations()
+
+
+def entry_sort_key(entry: dict[str, str]) -> str:
+    """Get a sortable "YYYY-MM-DD HH:MM" key for an entry's start.
+
+    Entries with a malformed date get an empty key so they sort as oldest.
+    """
+    date_parts = entry.get("date", "").split("-")
+    if len(date_parts) != 3:
+        return ""
+    return f"{date_parts[2]}-{date_parts[1]}-{date_parts[0]} {entry['startTime']}"
+
+
+def iter_entries(path: Path | None = None) -> Iterator[dict[str, str]]:
+    """Lazily yield entries from a timesheet CSV, most recent first.
+
+    Defaults to the main database, which is prepared first.
+    """
+    if path is None:
+        prepare_database()
+        path = DATABASE_FILE
+
+        # Reuse the sidecar when it is current, but don't build one here so
+        # streaming callers keep their memory use flat
+        cached = load_sidecar(path, csv_signature(path))
+        if cached is not None:
+            yield from cached
+            return
+
+    with path.open("r", newline="", encoding="utf-8") as file:
+        yield from csv.DictReader(file)
 
-    entries = []
-    with DATABASE_FILE.open("r", newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
-        entries = list(reader)
 
+def read_entries() -> list[dict[str, str]]:
+    """Read all entries from CSV file, ordered from most recent to oldest.
+
+    Parsed entries are kept in a binary sidecar, so unchanged files are
+    loaded without any CSV parsing.
+    """
+    prepare_database()
+    signature = csv_signature(DATABASE_FILE)
+    entries = load_sidecar(DATABASE_FILE, signature)
+    if entries is None:
+        headers, rows = read_file_rows(DATABASE_FILE)
+        entries = rows_to_entries(headers, rows)
+        save_sidecar(DATABASE_FILE, signature, entries)
     return entries
 
 
-def write_entries(entries: list[dict[str, str]]) -> None:
-    """Write all entries to CSV file"""
+def write_entries(entries: Iterable[dict[str, str]], path: Path | None = None) -> int:
+    """Write all entries to CSV file, returning the number of rows written.
+
+    Rows are streamed to a temporary file in the same directory which then
+    atomically replaces the database, so an interrupted write never leaves a
+    truncated timesheet behind. Rows written to the database without an id
+    are given one, and its search index is dropped to be rebuilt; other files
+    keep their ids as they are.
+    """
+    if path is None:
+        ensure_database_exists()
+        path = DATABASE_FILE
+    if path == DATABASE_FILE:
+        # Imported here as the index module depends on this one
+        from pats.index import invalidate_index
+
+        with database_lock():
+            count = _write_file(assign_ids(entries), path)
+            invalidate_index()
+            return count
+    return _write_file(entries, path)
+
+
+def _write_file(entries: Iterable[dict[str, str]], path: Path) -> int:
+    """Atomically replace a CSV file with `entries`, returning the row count"""
+    count = 0
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_HEADERS)
+            writer.writeheader()
+            for entry in entries:
+                writer.writerow(add_epoch_fields(entry))
+                count += 1
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    return count
+
+
+def iter_head(
+    path: Path | None = None, needle: bytes | None = None
+) -> Iterator[tuple[dict[str, str], int]]:
+    """Lazily yield entries from the top of a timesheet, most recent first.
+
+    Each entry comes with the byte offset where its row ends, so callers can
+    stop at the first match and splice the head without touching the rest.
+    With `needle`, rows whose raw bytes lack it are skipped without parsing.
+    """
+    if path is None:
+        prepare_database()
+        path = DATABASE_FILE
+
+    with path.open("rb") as file:
+        headers = next(csv.reader([file.readline().decode("utf-8-sig")]), [])
+        for line, end in _iter_raw_rows(file, needle):
+            if needle is not None and needle not in line:
+                continue
+            fields = next(csv.reader([line.decode("utf-8")]), None)
+            if fields:
+                yield rows_to_entries(headers, [fields])[0], end
+
+
+def _iter_raw_rows(file: BinaryIO, needle: bytes | None) -> Iterator[tuple[bytes, int]]:
+    """Yield each raw row with the offset where it ends.
+
+    With `needle`, whole blocks of unquoted rows lacking it are skipped.
+    """
+    while True:
+        stop = None
+        if needle is not None:
+            position = file.tell()
+            block = file.read(SCAN_BLOCK_BYTES)
+            if not block:
+                return
+            complete = block[: block.rfind(b"\n") + 1]
+            if complete and needle not in complete and b'"' not in complete:
+                file.seek(position + len(complete))
+                continue
+            file.seek(position)
+            stop = position + (len(complete) or len(block))
+
+        while stop is None or file.tell() < stop:
+            line = file.readline()
+            if not line:
+                return
+            # A quoted field spanning lines leaves an odd number of quotes
+            while line.count(b'"') % 2 and (following := file.readline()):
+                line += following
+            yield line, file.tell()
+
+
+def splice_rows(
+    start: int | None,
+    end: int | None,
+    rows: list[dict[str, str]],
+    removed: list[dict[str, str]] | None = None,
+) -> None:
+    """Replace the raw bytes between offsets `start` and `end` with `rows`.
+
+    `start=None` is the first row and `end=None` inserts at `start`. Every
+    other row is copied as raw bytes rather than parsed and rewritten, and
+    the file is replaced atomically.
+
+    With `removed`, the rows being replaced are first checked against it in
+    the file as opened here; if another process has rewritten the timesheet
+    since the offsets were read, ValueError is raised rather than splicing
+    at offsets that no longer fall on row boundaries.
+    """
+    ensure_database_exists()
+
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{DATABASE_FILE.name}.", dir=DATABASE_FILE.parent
+    )
+    try:
+        with DATABASE_FILE.open("rb") as source, os.fdopen(fd, "wb") as target:
+            header = source.readline()
+            if start is None:
+                start = len(header)
+            if removed is not None and end is not None:
+                source.seek(start)
+                if read_span(source, header, end - start) != removed:
+                    raise ValueError(
+                        "The timesheet changed while it was being edited, "
+                        "please try again"
+                    )
+            source.seek(0)
+            remaining = start
+            while remaining:
+                chunk = source.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                target.write(chunk)
+                remaining -= len(chunk)
+
+            buffer = io.StringIO(newline="")
+            csv.DictWriter(buffer, fieldnames=CSV_HEADERS).writerows(
+                add_epoch_fields(entry) for entry in assign_ids(rows)
+            )
+            target.write(buffer.getvalue().encode("utf-8"))
+            source.seek(start if end is None else end)
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        os.chmod(tmp_name, DATABASE_FILE.stat().st_mode)
+        os.replace(tmp_name, DATABASE_FILE)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_span(file: BinaryIO, header: bytes, size: int) -> list[dict[str, str]] | None:
+    """Parse the `size` bytes of rows at the file's position, or get None if
+    they are not whole rows"""
+    try:
+        text = file.read(size).decode("utf-8")
+        headers = next(csv.reader([header.decode("utf-8-sig")]), [])
+        rows = [
+            fields for fields in csv.reader(io.StringIO(text, newline="")) if fields
+        ]
+    except (UnicodeDecodeError, csv.Error):
+        return None
+    return rows_to_entries(headers, rows)
+
+
+@database_lock()
+def splice_head(
+    end: int | None,
+    head: list[dict[str, str]],
+    removed: list[dict[str, str]],
+) -> None:
+    """Replace the rows before byte offset `end` with `head`.
+
+    `end=None` inserts before the first row. `removed` are copies of the
+    replaced rows, which are checked before splicing and let the search
+    index update incrementally.
+    """
+    # Imported here as the index module depends on this one
+    from pats.index import database_stat, record_head_change
+
     ensure_database_exists()
+    before = database_stat()
+    splice_rows(None, end, head, removed)
+    record_head_change(before, removed, len(head))
+
+
+def find_row(
+    key: str, match: Callable[[dict[str, str]], bool]
+) -> tuple[dict[str, str], int, int] | None:
+    """Find the first row starting at sort key `key` that satisfies `match`.
+
+    Bisects straight to the rows with that start, so only O(log n) rows are
+    parsed. Returns the entry with the byte offsets where its row starts and
+    ends, or None.
+    """
+    prepare_database()
+    with DATABASE_FILE.open("rb") as file:
+        start, headers = seek_to_date(file, key)
+        file.seek(start)
+        for line, end in _iter_raw_rows(file, None):
+            fields = next(csv.reader([line.decode("utf-8")]), None)
+            if fields:
+                entry = rows_to_entries(headers, [fields])[0]
+                if entry_sort_key(entry) != key:
+                    return None  # Past the rows starting at `key`
+                if match(entry):
+                    return entry, start, end
+            start = end
+    return None
+
+
+def find_entry_at(moment: datetime) -> tuple[dict[str, str], int, int] | None:
+    """Find the session that was running at a local time, with its byte span.
+
+    That is the most recent session starting at or before `moment`, provided
+    it had not ended by then. Located by bisection like `find_row`.
+    """
+    prepare_database()
+    with DATABASE_FILE.open("rb") as file:
+        start, headers = seek_to_date(file, datetime_sort_key(moment))
+        file.seek(start)
+        for line, end in _iter_raw_rows(file, None):
+            fields = next(csv.reader([line.decode("utf-8")]), None)
+            if not fields:
+                start = end
+                continue
+            entry = rows_to_entries(headers, [fields])[0]
+            timed = add_epoch_fields(entry)
+            span = epoch_span(timed)
+            if span is None:
+                return None
+            # Compare in local wall-clock time, like the date and time columns
+            ended = local_seconds(timed) + span[1] - span[0]
+            if not entry["endTime"]:
+                ended = wall_seconds(datetime.now()) + 60  # Until this minute ends
+            if wall_seconds(moment) < ended:
+                return entry, start, end
+            return None
+    return None
 
-    with DATABASE_FILE.open("w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=CSV_HEADERS)
-        writer.writeheader()
-        writer.writerows(entries)
+
+@database_lock()
+def delete_row(start: int, end: int, entry: dict[str, str]) -> None:
+    """Delete the row `entry` between byte offsets `start` and `end`.
+
+    Raises ValueError if the row there is no longer `entry`.
+    """
+    if start == _header_length():
+        splice_head(end, [], [entry])
+    else:
+        splice_rows(start, end, [], [entry])
+
+
+@database_lock()
+def replace_row(
+    start: int, end: int, entry: dict[str, str], updated: dict[str, str]
+) -> None:
+    """Replace the row `entry` between byte offsets `start` and `end`.
+
+    Raises ValueError if the row there is no longer `entry`.
+    """
+    if start == _header_length():
+        splice_head(end, [updated], [entry])
+    else:
+        splice_rows(start, end, [updated], [entry])
+
+
+def _header_length() -> int:
+    """Get the length in bytes of the database's header line"""
+    with DATABASE_FILE.open("rb") as file:
+        return len(file.readline())
 
 
 def get_active_session() -> dict[str, str] | None:
     """Get the currently active session (entry with no endTime)"""
-    entries = read_entries()
-
-    for entry in entries:
+    # An empty endTime always leaves ",," in the row
+    for entry, _ in iter_head(needle=b",,"):
         if not entry["endTime"]:  # Empty endTime means active session
             return entry
 
@@ -213,9 +608,7 @@ def get_active_session() -> dict[str, str] | None:
 
 def get_previous_session() -> dict[str, str] | None:
     """Get the last completed session (entry with endTime)"""
-    entries = read_entries()
-
-    for entry in entries:
+    for entry, _ in iter_head():
         if entry["endTime"]:  # Has endTime means completed session
             return entry
 
@@ -224,46 +617,46 @@ def get_previous_session() -> dict[str, str] | None:
 
 def get_last_session() -> dict[str, str] | None:
     """Get the most recent session (active or completed)"""
-    entries = read_entries()
-
-    if entries:
-        return entries[0]  # First entry is most recent
+    for entry, _ in iter_head():
+        return entry  # First entry is most recent
 
     return None
 
 
+@database_lock()
 def remove_last_session_end_time() -> bool:
     """Remove the end time from the last completed session.
 
     Returns True if a session was modified.
     """
-    entries = read_entries()
+    head = []
 
     # Find the first entry with an endTime (most recent completed session)
-    for entry in entries:
+    for entry, end in iter_head():
+        head.append(entry)
         if entry["endTime"]:  # Found completed session
-            entry["endTime"] = ""  # Remove end time
-            write_entries(entries)
+            removed = [dict(row) for row in head]
+            entry["endTime"] = entry["endEpoch"] = ""  # Remove end time
+            splice_head(end, head, removed)
             return True
 
     return False  # No completed session found
 
 
+@database_lock()
 def delete_first_entry() -> dict[str, str] | None:
     """Delete the first entry (most recent) from the CSV.
 
     Returns the deleted entry if successful, None if no entries found.
     """
-    entries = read_entries()
-
-    if entries:
-        deleted_entry = entries.pop(0)  # Remove first entry (most recent)
-        write_entries(entries)
+    for deleted_entry, end in iter_head():
+        splice_head(end, [], [deleted_entry])
         return deleted_entry
 
     return None  # No entries found
 
 
+@database_lock()
 def edit_first_entry(
     project: str | None = None, description: str | None = None
 ) -> bool:
@@ -271,10 +664,8 @@ def edit_first_entry(
 
     Returns True if an entry was edited.
     """
-    entries = read_entries()
-
-    if entries:
-        first_entry = entries[0]
+    for first_entry, end in iter_head():
+        removed = [dict(first_entry)]
 
         # Update project if provided
         if project is not None:
@@ -284,47 +675,54 @@ def edit_first_entry(
         if description is not None:
             first_entry["description"] = description
 
-        write_entries(entries)
+        splice_head(end, [first_entry], removed)
         return True
 
     return False  # No entries found
 
 
+@database_lock()
 def start_new_session(project: str = "", description: str = "") -> None:
     """Start a new time tracking session"""
-    entries = read_entries()
-
     # Stop any active session first
-    active_session = get_active_session()
-    if active_session:
-        stop_active_session()
-        entries = read_entries()  # Refresh after stopping
+    stop_active_session()
 
     # Create new entry with current time and date
     new_entry = {
-        "startTime": get_current_time(),
         "endTime": "",  # Empty until stopped
-        "date": get_current_date(),
+        "endEpoch": "",
         "project": project,
         "description": description,
+        **session_fields(current_session_time()),
     }
 
     # Insert at the beginning (most recent first)
-    entries.insert(0, new_entry)
-    write_entries(entries)
+    splice_head(None, [new_entry], [])
 
 
+@database_lock()
 def stop_active_session() -> bool:
     """Stop the currently active session. Returns True if a session was stopped."""
-    entries = read_entries()
-
-    for entry in entries:
+    # Locate the active session cheaply first, as usually there is none
+    active_end = None
+    for entry, end in iter_head(needle=b",,"):
         if not entry["endTime"]:  # Found active session
-            entry["endTime"] = get_current_time()
-            write_entries(entries)
+            active_end = end
+            break
+
+    if active_end is None:
+        return False  # No active session found
+
+    head = []
+    for entry, end in iter_head():
+        head.append(entry)
+        if end == active_end:
+            removed = [dict(row) for row in head]
+            entry.update(session_fields(current_session_time(), end=True))
+            splice_head(end, head, removed)
             return True
 
-    return False  # No active session found
+    return False
 
 
 def parse_date_input(date_str: str | None, format_type: str) -> datetime:
@@ -422,25 +820,163 @@ def filter_entries_by_date_range(
     return filtered_entries
 
 
+def datetime_sort_key(dt: datetime) -> str:
+    """Get the entry_sort_key equivalent of a datetime"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+
+def _next_row_start(file: BinaryIO, pos: int, header_end: int, width: int = 0) -> int:
+    """Get the offset of the first row starting at or after `pos`.
+
+    With `width`, lines that don't begin a record of that many fields are
+    taken to continue a quoted multi-line field and are skipped.
+    """
+    if pos <= header_end:
+        return header_end
+    file.seek(pos - 1)
+    file.readline()
+    while width:
+        row_start = file.tell()
+        line = file.readline()
+        if not line or _field_count(line, file) == width:
+            file.seek(row_start)
+            break
+        file.seek(row_start + len(line))
+    return file.tell()
+
+
+def _field_count(line: bytes, file: BinaryIO) -> int:
+    """Get the number of fields of the record starting with a raw CSV line.
+
+    A quoted field left open on the line is continued from `file`, reading
+    at most MAX_RECORD_LINES further lines.
+    """
+    lines = [line]
+    if line.count(b'"') % 2:
+        lines = chain(lines, islice(iter(file.readline, b""), MAX_RECORD_LINES))
+    try:
+        text = (part.decode("utf-8") for part in lines)
+        return len(next(csv.reader(text), []))
+    except (UnicodeDecodeError, csv.Error):
+        return 0
+
+
+def _line_sort_key(line: bytes, headers: list[str]) -> str:
+    """Get the entry_sort_key of a single raw CSV line"""
+    try:
+        values = next(csv.reader([line.decode("utf-8")]))
+    except (StopIteration, UnicodeDecodeError, csv.Error):
+        return ""
+    return entry_sort_key(dict(zip(headers, values, strict=False)))
+
+
+def seek_to_date(
+    file: BinaryIO, key: str, inclusive: bool = True
+) -> tuple[int, list[str]]:
+    """Find the offset of the first row whose start is not after `key`.
+
+    With `inclusive=False` the row must start strictly before `key`. Relies on
+    the file being ordered most recent first and bisects over byte offsets,
+    re-synchronising on line boundaries, so only O(log n) rows are parsed.
+    Returns the offset together with the header's column names.
+    """
+    file.seek(0)
+    header_line = file.readline()
+    headers = next(csv.reader([header_line.decode("utf-8-sig")]), [])
+    header_end = file.tell()
+    size = file.seek(0, os.SEEK_END)
+
+    lo, hi = header_end, size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        row_start = _next_row_start(file, mid, header_end, len(headers))
+        if row_start >= size:
+            hi = mid
+            continue
+        file.seek(row_start)
+        line = file.readline()
+        line_key = _line_sort_key(line, headers)
+        if line_key > key or (not inclusive and line_key == key):
+            lo = file.tell()
+        else:
+            hi = mid
+
+    return _next_row_start(file, lo, header_end, len(headers)), headers
+
+
+def find_range_offsets(
+    start_date: datetime, end_date: datetime, path: Path | None = None
+) -> tuple[int, int, list[str]]:
+    """Get the byte span of the rows starting within the given range.
+
+    Returns the offsets of the first row in range and of the first row
+    older than the range, together with the header's column names.
+    """
+    if path is None:
+        prepare_database()
+        path = DATABASE_FILE
+
+    with path.open("rb") as file:
+        begin, headers = seek_to_date(file, datetime_sort_key(end_date))
+        stop, _ = seek_to_date(file, datetime_sort_key(start_date), inclusive=False)
+
+    return begin, max(begin, stop), headers
+
+
+def iter_entries_in_range(
+    start_date: datetime, end_date: datetime, path: Path | None = None
+) -> Iterator[dict[str, str]]:
+    """Lazily yield entries starting within the given range, most recent first.
+
+    Seeks straight to the newest row in range and stops reading at the first
+    row older than the range instead of scanning the whole file. Rows are
+    compared by their local wall-clock start in whole minutes, computed from
+    the epoch columns when present.
+    """
+    if path is None:
+        prepare_database()
+        path = DATABASE_FILE
+
+    start_key = datetime_sort_key(start_date)
+    end_key = datetime_sort_key(end_date)
+    start_wall = wall_seconds(start_date) // 60 * 60
+    end_wall = wall_seconds(end_date) // 60 * 60
+
+    with path.open("rb") as raw:
+        offset, headers = seek_to_date(raw, end_key)
+        raw.seek(offset)
+        text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        for entry in csv.DictReader(text, fieldnames=headers):
+            wall = local_seconds(entry)
+            if wall is not None:
+                before, after = wall < start_wall, wall > end_wall
+            else:
+                key = entry_sort_key(entry)
+                if not key or not entry["startTime"]:
+                    continue  # Skip malformed rows
+                before, after = key < start_key, key > end_key
+            if before:
+                break
+            if not after:
+                yield entry
+
+
 def get_entries_for_day(date_str: str | None = None) -> list[dict[str, str]]:
     """Get entries for a specific day"""
     target_date = parse_date_input(date_str, "day")
     start_date, end_date = get_day_range(target_date)
-    entries = read_entries()
-    return filter_entries_by_date_range(entries, start_date, end_date)
+    return list(iter_entries_in_range(start_date, end_date))
 
 
 def get_entries_for_week(date_str: str | None = None) -> list[dict[str, str]]:
     """Get entries for a specific week"""
     target_date = parse_date_input(date_str, "week")
     start_date, end_date = get_week_range(target_date)
-    entries = read_entries()
-    return filter_entries_by_date_range(entries, start_date, end_date)
+    return list(iter_entries_in_range(start_date, end_date))
 
 
 def get_entries_for_month(date_str: str | None = None) -> list[dict[str, str]]:
     """Get entries for a specific month"""
     target_date = parse_date_input(date_str, "month")
     start_date, end_date = get_month_range(target_date)
-    entries = read_entries()
-    return filter_entries_by_date_range(entries, start_date, end_date)
+    return list(iter_entries_in_range(start_date, end_date))
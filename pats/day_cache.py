@@ -0,0 +1,66 @@
+"""On-disk cache of per-day summaries for closed days in grouped views
+
+A day's summary (its formatted rows, daily total and per-project totals) is
+keyed by the day and a digest of that day's rows and the project rules,
+so any edit to a day simply misses the cache and recomputes it.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from pats.database import CSV_HEADERS
+
+CACHE_FILE = Path.home() / ".pats" / "cache" / "days.pickle"
+
+CACHE_VERSION = 3
+
+# Least recently stored days are dropped beyond this many
+MAX_CACHED_DAYS = 1000
+
+
+def day_digest(day_entries: list[dict[str, str]], rules_signature: str) -> str:
+    """Get a content hash of a day's rows and the settings its summary uses.
+
+    Short rows (missing fields read as None) and long rows (extra fields
+    under a None key) hash by the known columns only.
+    """
+    digest = hashlib.sha1()
+    digest.update(rules_signature.encode())
+    for entry in day_entries:
+        digest.update(b"\x1d")
+        row = (entry.get(header) or "" for header in CSV_HEADERS)
+        digest.update("\x1f".join(row).encode())
+    return digest.hexdigest()
+
+
+# A day's digest, summary, render settings and rendered segments
+CachedDay = tuple[str, dict[str, Any], tuple, list[Any]]
+
+
+def load_day_cache() -> dict[str, CachedDay]:
+    """Load cached day summaries, keyed by YYYY-MM-DD"""
+    try:
+        with CACHE_FILE.open("rb") as file:
+            version, days = pickle.load(file)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return {}
+    return days if version == CACHE_VERSION else {}
+
+
+def save_day_cache(days: dict[str, CachedDay]) -> None:
+    """Atomically write cached day summaries, keeping the newest entries"""
+    for stale in list(days)[: max(0, len(days) - MAX_CACHED_DAYS)]:
+        del days[stale]
+
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=CACHE_FILE.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump((CACHE_VERSION, days), file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_name, CACHE_FILE)
+    except OSError:
+        pass  # The cache is only an optimisation
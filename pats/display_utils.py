@@ -1,17 +1,21 @@
 """Display utilities for paTS commands"""
 
 from datetime import datetime
+from typing import Any
 
-from rich import print
-from rich.console import Console
+from rich import get_console, print
+from rich.console import Console, Group
+from rich.segment import Segment, Segments
 from rich.table import Table
 
-from pats.config import (
-    get_daily_goal_hours,
-    get_excluded_projects,
-    get_weekly_goal_hours,
+from pats.config import get_daily_goal_hours, get_weekly_goal_hours
+from pats.database import (
+    combine_time_date_to_datetime,
+    epoch_span,
+    get_active_session,
 )
-from pats.database import combine_time_date_to_datetime, get_active_session
+from pats.day_cache import day_digest, load_day_cache, save_day_cache
+from pats.rules import ProjectRules, get_project_rules
 
 
 def create_ditto_mark(original_text: str | None) -> str:
@@ -53,7 +57,15 @@ def format_time_display(
 
 
 def calculate_duration_seconds(entry: dict[str, str]) -> int:
-    """Calculate duration for an entry in seconds"""
+    """Calculate duration for an entry in seconds.
+
+    Uses the epoch columns when present, so sessions crossing midnight or a
+    DST change are measured correctly.
+    """
+    span = epoch_span(entry)
+    if span is not None:
+        return span[1] - span[0]
+
     start_time = entry.get("startTime", "")
     end_time = entry.get("endTime", "")
     date_str = entry.get("date", "")
@@ -113,6 +125,25 @@ def format_total_duration(total_seconds: int) -> str:
         return f"{minutes}m"
 
 
+def format_signed_duration(seconds: int) -> str:
+    """Format a change in duration with an explicit sign"""
+    if seconds == 0:
+        return "±0m"
+    sign = "+" if seconds > 0 else "-"
+    return f"{sign}{format_total_duration(abs(seconds))}"
+
+
+def format_sparkline(values: list[int]) -> str:
+    """Render values as a sparkline of block characters scaled to the maximum"""
+    blocks = "▁▂▃▄▅▆▇█"
+    peak = max(values, default=0)
+    if peak <= 0:
+        return blocks[0] * len(values)
+    return "".join(
+        blocks[round(max(value, 0) / peak * (len(blocks) - 1))] for value in values
+    )
+
+
 def format_remaining_time(total_seconds: int, goal_hours: float) -> str:
     """Format remaining time vs goal or overtime if goal exceeded"""
     goal_seconds = int(goal_hours * 3600)
@@ -132,16 +163,38 @@ def format_remaining_time(total_seconds: int, goal_hours: float) -> str:
         return "[green]Goal reached![/green]"
 
 
+def display_tag_totals(tag_totals: dict[str, int]) -> None:
+    """Display time spent per #tag, largest first"""
+    if not tag_totals:
+        return
+
+    print("\n[bold]Time by Tag:[/bold]")
+    for tag, seconds in sorted(tag_totals.items(), key=lambda x: x[1], reverse=True):
+        formatted_time = format_total_duration(seconds)
+        print(f"  [magenta]{tag}:[/magenta] [green]{formatted_time}[/green]")
+
+
 def display_entries_table(
-    entries: list[dict[str, str]], title: str = "📊 Timesheet Entries"
+    entries: list[dict[str, str]],
+    title: str = "📊 Timesheet Entries",
+    tag_totals: dict[str, int] | None = None,
+    show_ids: bool = False,
 ) -> None:
-    """Display entries in a formatted table"""
-    console = Console()
+    """Display entries in a formatted table, optionally with their ids"""
+    render_table(summarise_table(entries, show_ids), title, tag_totals)
 
-    if not entries:
-        print("[yellow]📋 No timesheet entries found for the specified period[/yellow]")
-        print("[dim]Use 'paTS start [project]' to begin tracking time[/dim]")
-        return
+
+def summarise_table(
+    entries: list[dict[str, str]], show_ids: bool = False
+) -> dict[str, Any]:
+    """Compute the flat table's rows, total (excluding configured projects)
+    and per-project totals (under their aliases).
+
+    The active session and project rules are looked up once here, so a
+    watched view can keep the summary and only call `refresh_active`.
+    """
+    active_session = get_active_session()
+    rules = get_project_rules()
 
     # Check if all entries are from today
     today = datetime.now().strftime("%d-%m-%Y")
@@ -151,18 +204,10 @@ def display_entries_table(
             is_today_only = False
             break
 
-    # Create the table
-    table = Table(title=title, show_header=True, header_style="bold magenta")
-    start_column_width = 12 if is_today_only else 20
-    end_column_width = 12 if is_today_only else 20
-    table.add_column("Start Time", style="cyan", width=start_column_width)
-    table.add_column("End Time", style="cyan", width=end_column_width)
-    table.add_column("Duration", style="green", width=10)
-    table.add_column("Project", style="blue", width=20)
-    table.add_column("Description", style="white", width=30)
-
-    # Get active session for highlighting
-    active_session = get_active_session()
+    rows = []
+    total_time_seconds = 0
+    project_totals = {}
+    active = None
 
     # Add rows to the table with compacting logic
     prev_project = None
@@ -176,6 +221,7 @@ def display_entries_table(
         end_formatted = format_time_display(
             entry["endTime"], entry["date"], show_date=show_date
         )
+        entry_duration = calculate_duration_seconds(entry)
         duration = calculate_duration(entry)
 
         # Get current project and description
@@ -194,56 +240,137 @@ def display_entries_table(
             else create_ditto_mark(prev_description)
         )
 
+        # Total time excludes configured projects; projects use their aliases
+        project, excluded = rules.resolve(entry["project"] or "")
+        if not excluded:
+            total_time_seconds += entry_duration
+        project_name = project or "No project"
+        project_totals[project_name] = (
+            project_totals.get(project_name, 0) + entry_duration
+        )
+
+        id_cells = [entry.get("id") or ""] if show_ids else []
+
         # Highlight active session
         if active_session and entry == active_session:
-            table.add_row(
-                f"[bold]{start_formatted}[/bold]",
-                f"[bold yellow]{end_formatted}[/bold yellow]",
-                f"[bold green]{duration}[/bold green]",
-                f"[bold]{display_project}[/bold]",
-                f"[bold]{display_description}[/bold]",
+            active = active_row(
+                entry, len(rows), len(id_cells) + 2, project_name, excluded
+            )
+            rows.append(
+                (
+                    *id_cells,
+                    f"[bold]{start_formatted}[/bold]",
+                    f"[bold yellow]{end_formatted}[/bold yellow]",
+                    f"[bold green]{duration}[/bold green]",
+                    f"[bold]{display_project}[/bold]",
+                    f"[bold]{display_description}[/bold]",
+                )
             )
         else:
-            table.add_row(
-                start_formatted,
-                end_formatted,
-                duration,
-                display_project,
-                display_description,
+            rows.append(
+                (
+                    *id_cells,
+                    start_formatted,
+                    end_formatted,
+                    duration,
+                    display_project,
+                    display_description,
+                )
             )
 
         # Update previous values for next iteration
         prev_project = current_project
         prev_description = current_description
 
-    console.print(table)
+    return {
+        "rows": rows,
+        "seconds": total_time_seconds,
+        "projects": project_totals,
+        "active": active,
+        "entries": len(entries),
+        "is_today_only": is_today_only,
+        "show_ids": show_ids,
+        "goal_hours": get_daily_goal_hours(),
+    }
+
+
+def active_row(
+    entry: dict[str, str], index: int, cell: int, project: str, excluded: bool
+) -> dict[str, Any]:
+    """Record where the active session's row and duration are in a summary"""
+    return {
+        "entry": entry,
+        "index": index,
+        "cell": cell,
+        "project": project,
+        "excluded": excluded,
+        "seconds": calculate_duration_seconds(entry),
+    }
+
+
+def refresh_active(summary: dict[str, Any]) -> dict[str, Any]:
+    """Get a copy of a summary with the active session's duration brought up
+    to now. Only that row and the totals it counts towards are recomputed."""
+    active = summary.get("active")
+    if active is None:
+        return summary
+
+    entry = active["entry"]
+    seconds = calculate_duration_seconds(entry)
+    change = seconds - active["seconds"]
+
+    rows = list(summary["rows"])
+    row = list(rows[active["index"]])
+    row[active["cell"]] = f"[bold green]{calculate_duration(entry)}[/bold green]"
+    rows[active["index"]] = tuple(row)
+
+    projects = dict(summary["projects"])
+    projects[active["project"]] += change
+    return {
+        **summary,
+        "rows": rows,
+        "seconds": summary["seconds"] + (0 if active["excluded"] else change),
+        "projects": projects,
+        "active": {**active, "seconds": seconds},
+    }
+
+
+def render_table(
+    summary: dict[str, Any],
+    title: str = "📊 Timesheet Entries",
+    tag_totals: dict[str, int] | None = None,
+) -> None:
+    """Display a summary from `summarise_table` as a table with totals"""
+    console = get_console()
 
-    # Calculate total time (excluding configured projects)
-    excluded_projects = get_excluded_projects()
-    total_time_seconds = 0
-    for entry in entries:
-        project = entry["project"] or ""
-        if project not in excluded_projects:
-            entry_duration = calculate_duration_seconds(entry)
-            total_time_seconds += entry_duration
+    if not summary["entries"]:
+        print("[yellow]📋 No timesheet entries found for the specified period[/yellow]")
+        print("[dim]Use 'paTS start [project]' to begin tracking time[/dim]")
+        return
+
+    # Create the table
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    start_column_width = 12 if summary["is_today_only"] else 20
+    end_column_width = 12 if summary["is_today_only"] else 20
+    if summary["show_ids"]:
+        table.add_column("ID", style="dim", justify="right", min_width=6)
+    table.add_column("Start Time", style="cyan", width=start_column_width)
+    table.add_column("End Time", style="cyan", width=end_column_width)
+    table.add_column("Duration", style="green", width=10)
+    table.add_column("Project", style="blue", width=20)
+    table.add_column("Description", style="white", width=30)
+    for row in summary["rows"]:
+        table.add_row(*row)
+
+    console.print(table)
 
     # Show summary
-    total_entries = len(entries)
-    active_count = 1 if active_session and active_session in entries else 0
-    total_entries - active_count
+    total_entries = summary["entries"]
+    total_time_seconds = summary["seconds"]
     total_time_formatted = format_total_duration(total_time_seconds)
 
-    # Calculate project totals
-    project_totals = {}
-    for entry in entries:
-        project = entry["project"] or "No project"
-        entry_duration = calculate_duration_seconds(entry)
-        if project in project_totals:
-            project_totals[project] += entry_duration
-        else:
-            project_totals[project] = entry_duration
-
     # Display project totals
+    project_totals = summary["projects"]
     if project_totals:
         print("\n[bold]Time by Project:[/bold]")
         for project, seconds in sorted(
@@ -252,8 +379,11 @@ def display_entries_table(
             formatted_time = format_total_duration(seconds)
             print(f"  [blue]{project}:[/blue] [green]{formatted_time}[/green]")
 
+    if tag_totals is not None:
+        display_tag_totals(tag_totals)
+
     # Calculate remaining time vs daily goal
-    daily_goal = get_daily_goal_hours()
+    daily_goal = summary["goal_hours"]
     remaining_display = format_remaining_time(total_time_seconds, daily_goal)
 
     print(
@@ -263,16 +393,164 @@ def display_entries_table(
     )
 
 
+def summarise_day(
+    day_entries: list[dict[str, str]],
+    rules: ProjectRules,
+    active_session: dict[str, str] | None,
+) -> dict[str, Any]:
+    """Compute a day's table rows, total (excluding configured projects) and
+    per-project totals (under their aliases) for the grouped view"""
+    rows = []
+    daily_total_seconds = 0
+    daily_project_totals = {}
+    active = None
+
+    # Add rows for this day with compacting logic
+    day_prev_project = None
+    day_prev_description = None
+
+    for entry in day_entries:
+        start_formatted = format_time_display(entry["startTime"], show_date=False)
+        end_formatted = format_time_display(entry["endTime"], show_date=False)
+        entry_duration = calculate_duration_seconds(entry)
+        duration = calculate_duration(entry)
+
+        # Get current project and description
+        current_project = entry["project"] or "[dim]No project[/dim]"
+        current_description = entry["description"] or "[dim]No description[/dim]"
+
+        # Compact display: use ditto marks if same as previous row within this day
+        display_project = (
+            current_project
+            if current_project != day_prev_project
+            else create_ditto_mark(day_prev_project)
+        )
+        display_description = (
+            current_description
+            if current_description != day_prev_description
+            else create_ditto_mark(day_prev_description)
+        )
+
+        # Calculate duration for daily total (excluding configured projects)
+        project, excluded = rules.resolve(entry["project"] or "")
+        if not excluded:
+            daily_total_seconds += entry_duration
+
+        project_name = project or "No project"
+        daily_project_totals[project_name] = (
+            daily_project_totals.get(project_name, 0) + entry_duration
+        )
+
+        # Highlight active session
+        if active_session and entry == active_session:
+            active = active_row(entry, len(rows), 2, project_name, excluded)
+            rows.append(
+                (
+                    f"[bold]{start_formatted}[/bold]",
+                    f"[bold yellow]{end_formatted}[/bold yellow]",
+                    f"[bold green]{duration}[/bold green]",
+                    f"[bold]{display_project}[/bold]",
+                    f"[bold]{display_description}[/bold]",
+                )
+            )
+        else:
+            rows.append(
+                (
+                    start_formatted,
+                    end_formatted,
+                    duration,
+                    display_project,
+                    display_description,
+                )
+            )
+
+        # Update previous values for next iteration within this day
+        day_prev_project = current_project
+        day_prev_description = current_description
+
+    return {
+        "rows": rows,
+        "seconds": daily_total_seconds,
+        "projects": daily_project_totals,
+        "active": active,
+    }
+
+
+def render_day(
+    console: Console, day_header: str, summary: dict[str, Any], entry_count: int
+) -> list[Segment]:
+    """Render a day's header, table, project breakdown and total to segments"""
+    table = Table(show_header=True, header_style="bold cyan", width=100)
+    table.add_column("Start", style="cyan", width=12)
+    table.add_column("End", style="cyan", width=12)
+    table.add_column("Duration", style="green", width=10)
+    table.add_column("Project", style="blue", width=20)
+    table.add_column("Description", style="white", width=30)
+    for row in summary["rows"]:
+        table.add_row(*row)
+
+    # Left-aligned day header above the table
+    renderables = [console.render_str(f"[bold blue]{day_header}[/bold blue]"), table]
+
+    # Daily project breakdown
+    daily_project_totals = summary["projects"]
+    if daily_project_totals:
+        project_breakdown = []
+        for project, seconds in sorted(
+            daily_project_totals.items(), key=lambda x: x[1], reverse=True
+        ):
+            formatted_time = format_total_duration(seconds)
+            project_breakdown.append(f"{project}: {formatted_time}")
+        renderables.append(
+            console.render_str(
+                f"[dim]  Projects: {' | '.join(project_breakdown)}[/dim]"
+            )
+        )
+
+    # Daily summary
+    daily_total_formatted = format_total_duration(summary["seconds"])
+    renderables.append(
+        console.render_str(
+            f"[dim]Daily total: [/dim][green]{daily_total_formatted}[/green] "
+            f"[dim]({entry_count} entries)[/dim]\n"
+        )
+    )
+
+    return list(console.render(Group(*renderables)))
+
+
 def display_entries_grouped_by_day(
-    entries: list[dict[str, str]], title: str = "📊 Weekly Timesheet"
+    entries: list[dict[str, str]],
+    title: str = "📊 Weekly Timesheet",
+    tag_totals: dict[str, int] | None = None,
+    summary_label: str = "Week",
+    goal_label: str = "Weekly goal",
+    goal_hours: float | None = None,
 ) -> None:
-    """Display entries grouped by day"""
-    console = Console()
+    """Display entries grouped by day
+
+    The closing summary defaults to the weekly goal; longer periods pass their
+    own labels and goal.
+    """
+    render_days(
+        summarise_days(entries, goal_hours),
+        title,
+        tag_totals,
+        summary_label,
+        goal_label,
+    )
 
-    if not entries:
-        print("[yellow]📋 No timesheet entries found for the specified period[/yellow]")
-        print("[dim]Use 'paTS start [project]' to begin tracking time[/dim]")
-        return
+
+def summarise_days(
+    entries: list[dict[str, str]], goal_hours: float | None = None
+) -> dict[str, Any]:
+    """Summarise and render each day of the grouped view, newest first.
+
+    Closed days come from the day cache. The day holding the active session
+    keeps its summary unrendered, so a watched view can keep the result and
+    only redraw that day with `refresh_active`.
+    """
+    console = get_console()
 
     # Group entries by date
     entries_by_date = {}
@@ -289,20 +567,18 @@ def display_entries_grouped_by_day(
             except (ValueError, IndexError):
                 continue
 
-    # Sort dates
-    sorted_dates = sorted(entries_by_date.keys(), reverse=True)
-
     # Get active session for highlighting
     active_session = get_active_session()
+    rules = get_project_rules()
 
-    # Calculate total time across all days
-    total_time_seconds = 0
-    total_entries_count = 0
-
-    console.print(f"[bold magenta]{title}[/bold magenta]", justify="center")
-    print()
+    # Closed days never change, so their summaries come from the day cache
+    today = datetime.now().strftime("%Y-%m-%d")
+    day_cache = load_day_cache()
+    render_key = (console.width, console.color_system, console.encoding)
+    cache_changed = False
 
-    for date_str in sorted_dates:
+    days = []
+    for date_str in sorted(entries_by_date, reverse=True):
         day_entries = entries_by_date[date_str]
 
         # Format day header
@@ -314,133 +590,300 @@ def display_entries_grouped_by_day(
         except ValueError:
             day_header = f"📅 {date_str}"
 
-        # Create table for this day
-        table = Table(show_header=True, header_style="bold cyan", width=100)
-        table.add_column("Start", style="cyan", width=12)
-        table.add_column("End", style="cyan", width=12)
-        table.add_column("Duration", style="green", width=10)
-        table.add_column("Project", style="blue", width=20)
-        table.add_column("Description", style="white", width=30)
-
-        # Calculate daily total (excluding configured projects)
-        excluded_projects = get_excluded_projects()
-        daily_total_seconds = 0
-
-        # Add rows for this day with compacting logic
-        day_prev_project = None
-        day_prev_description = None
-
-        for entry in day_entries:
-            start_formatted = format_time_display(entry["startTime"], show_date=False)
-            end_formatted = format_time_display(entry["endTime"], show_date=False)
-            duration = calculate_duration(entry)
-
-            # Get current project and description
-            current_project = entry["project"] or "[dim]No project[/dim]"
-            current_description = entry["description"] or "[dim]No description[/dim]"
-
-            # Compact display: use ditto marks if same as previous row within this day
-            display_project = (
-                current_project
-                if current_project != day_prev_project
-                else create_ditto_mark(day_prev_project)
-            )
-            display_description = (
-                current_description
-                if current_description != day_prev_description
-                else create_ditto_mark(day_prev_description)
-            )
+        closed = date_str < today and all(entry["endTime"] for entry in day_entries)
+        summary = segments = None
+        if closed:
+            digest = day_digest(day_entries, rules.signature())
+            cached = day_cache.get(date_str)
+            if cached is not None and cached[0] == digest:
+                summary = cached[1]
+                if cached[2] == render_key:
+                    segments = cached[3]
+
+        if summary is None:
+            summary = summarise_day(day_entries, rules, active_session)
+        if segments is None and summary.get("active") is None:
+            segments = render_day(console, day_header, summary, len(day_entries))
+            if closed:
+                day_cache.pop(date_str, None)
+                day_cache[date_str] = (digest, summary, render_key, segments)
+                cache_changed = True
+
+        days.append(
+            {
+                "header": day_header,
+                "summary": summary,
+                "segments": segments,
+                "entries": len(day_entries),
+            }
+        )
 
-            # Calculate duration for daily total (excluding configured projects)
-            project = entry["project"] or ""
-            if project not in excluded_projects:
-                entry_duration = calculate_duration_seconds(entry)
-                daily_total_seconds += entry_duration
+    if cache_changed:
+        save_day_cache(day_cache)
 
-            # Highlight active session
-            if active_session and entry == active_session:
-                table.add_row(
-                    f"[bold]{start_formatted}[/bold]",
-                    f"[bold yellow]{end_formatted}[/bold yellow]",
-                    f"[bold green]{duration}[/bold green]",
-                    f"[bold]{display_project}[/bold]",
-                    f"[bold]{display_description}[/bold]",
-                )
-            else:
-                table.add_row(
-                    start_formatted,
-                    end_formatted,
-                    duration,
-                    display_project,
-                    display_description,
-                )
+    return {
+        "days": days,
+        "goal_hours": get_weekly_goal_hours() if goal_hours is None else goal_hours,
+    }
 
-            # Update previous values for next iteration within this day
-            day_prev_project = current_project
-            day_prev_description = current_description
-
-        # Print left-aligned day header and table
-        print(f"[bold blue]{day_header}[/bold blue]")
-        console.print(table)
-
-        # Calculate daily project totals
-        daily_project_totals = {}
-        for entry in day_entries:
-            project = entry["project"] or "No project"
-            entry_duration = calculate_duration_seconds(entry)
-            if project in daily_project_totals:
-                daily_project_totals[project] += entry_duration
-            else:
-                daily_project_totals[project] = entry_duration
 
-        # Print daily project breakdown
-        if daily_project_totals:
-            project_breakdown = []
-            for project, seconds in sorted(
-                daily_project_totals.items(), key=lambda x: x[1], reverse=True
-            ):
-                formatted_time = format_total_duration(seconds)
-                project_breakdown.append(f"{project}: {formatted_time}")
-            print(f"[dim]  Projects: {' | '.join(project_breakdown)}[/dim]")
+def render_days(
+    grouped: dict[str, Any],
+    title: str = "📊 Weekly Timesheet",
+    tag_totals: dict[str, int] | None = None,
+    summary_label: str = "Week",
+    goal_label: str = "Weekly goal",
+) -> None:
+    """Display days from `summarise_days` with the period's totals"""
+    console = get_console()
 
-        # Print daily summary
-        daily_total_formatted = format_total_duration(daily_total_seconds)
+    if not grouped["days"]:
+        print("[yellow]📋 No timesheet entries found for the specified period[/yellow]")
+        print("[dim]Use 'paTS start [project]' to begin tracking time[/dim]")
+        return
 
-        print(
-            f"[dim]Daily total: [/dim][green]{daily_total_formatted}[/green] "
-            f"[dim]({len(day_entries)} entries)[/dim]\n"
-        )
+    # Calculate total time across all days
+    total_time_seconds = 0
+    total_entries_count = 0
+    overall_project_totals = {}
 
-        # Add to overall totals
-        total_time_seconds += daily_total_seconds
-        total_entries_count += len(day_entries)
+    console.print(f"[bold magenta]{title}[/bold magenta]", justify="center")
+    print()
 
-    # Calculate overall project totals
-    overall_project_totals = {}
-    for entry in entries:
-        project = entry["project"] or "No project"
-        entry_duration = calculate_duration_seconds(entry)
-        if project in overall_project_totals:
-            overall_project_totals[project] += entry_duration
-        else:
-            overall_project_totals[project] = entry_duration
+    for day in grouped["days"]:
+        summary = day["summary"]
+        segments = day["segments"]
+        if segments is None:
+            # Only the day with the active session is rendered each time
+            summary = refresh_active(summary)
+            segments = render_day(console, day["header"], summary, day["entries"])
+
+        console.print(Segments(segments), end="")
+
+        # Add to overall totals
+        total_time_seconds += summary["seconds"]
+        total_entries_count += day["entries"]
+        for project, seconds in summary["projects"].items():
+            overall_project_totals[project] = (
+                overall_project_totals.get(project, 0) + seconds
+            )
 
     # Show overall project breakdown
     if overall_project_totals:
-        print("[bold]Week Summary by Project:[/bold]")
+        print(f"[bold]{summary_label} Summary by Project:[/bold]")
         for project, seconds in sorted(
             overall_project_totals.items(), key=lambda x: x[1], reverse=True
         ):
             formatted_time = format_total_duration(seconds)
             print(f"  [blue]{project}:[/blue] [green]{formatted_time}[/green]")
 
+    if tag_totals is not None:
+        display_tag_totals(tag_totals)
+
     # Show overall summary with weekly goal
     total_time_formatted = format_total_duration(total_time_seconds)
-    weekly_goal = get_weekly_goal_hours()
+    weekly_goal = grouped["goal_hours"]
     weekly_remaining_display = format_remaining_time(total_time_seconds, weekly_goal)
 
     print(
         f"\n[bold]Total:[/bold] [green]{total_time_formatted}[/green] "
         f"[dim]({total_entries_count} total entries) | "
-        f"Weekly goal: {weekly_goal}h | [/dim]{weekly_remaining_display}"
+        f"{goal_label}: {weekly_goal}h | [/dim]{weekly_remaining_display}"
+    )
+
+
+def display_period_summary(
+    periods: list[tuple[str, dict[str, Any]]],
+    title: str = "📊 Period Summary",
+    goal_hours: float | None = None,
+    label_header: str = "Period",
+) -> None:
+    """Display one row of totals per period
+
+    `periods` pairs each period's label with its totals bucket, as computed
+    by pats.aggregate. When a per-period goal is given each row shows the time
+    remaining or the overtime against it. Rows can be labelled by something
+    else, such as team members, with a different `label_header`.
+    """
+    console = get_console()
+
+    if not any(bucket["entries"] for _, bucket in periods):
+        print("[yellow]📋 No timesheet entries found for the specified period[/yellow]")
+        print("[dim]Use 'paTS start [project]' to begin tracking time[/dim]")
+        return
+
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column(label_header, style="cyan", min_width=18, no_wrap=True)
+    table.add_column("Entries", justify="right", min_width=7)
+    table.add_column("Time", style="green", min_width=9, no_wrap=True)
+    if goal_hours is not None:
+        table.add_column("Goal", min_width=22, no_wrap=True)
+    table.add_column("Top Projects", style="blue")
+
+    total_time_seconds = 0
+    total_entries_count = 0
+    project_totals = {}
+    for label, bucket in periods:
+        top_projects = sorted(
+            bucket["projects"].items(), key=lambda x: x[1], reverse=True
+        )[:3]
+        row = [label, str(bucket["entries"]), format_total_duration(bucket["seconds"])]
+        if goal_hours is not None:
+            row.append(format_remaining_time(bucket["seconds"], goal_hours))
+        row.append(
+            ", ".join(
+                f"{project} {format_total_duration(seconds)}"
+                for project, seconds in top_projects
+            )
+            or "[dim]-[/dim]"
+        )
+        table.add_row(*row)
+
+        total_time_seconds += bucket["seconds"]
+        total_entries_count += bucket["entries"]
+        for project, seconds in bucket["projects"].items():
+            if project in project_totals:
+                project_totals[project] += seconds
+            else:
+                project_totals[project] = seconds
+
+    console.print(table)
+
+    # Show overall project breakdown
+    print("\n[bold]Summary by Project:[/bold]")
+    for project, seconds in sorted(
+        project_totals.items(), key=lambda x: x[1], reverse=True
+    ):
+        formatted_time = format_total_duration(seconds)
+        print(f"  [blue]{project}:[/blue] [green]{formatted_time}[/green]")
+
+    total_time_formatted = format_total_duration(total_time_seconds)
+    print(
+        f"\n[bold]Total:[/bold] [green]{total_time_formatted}[/green] "
+        f"[dim]({total_entries_count} total entries)[/dim]"
+    )
+
+
+def display_trend(
+    periods: list[tuple[str, dict[str, Any]]],
+    title: str = "📈 Trend",
+    goal_hours: float | None = None,
+) -> None:
+    """Display totals per period with changes between consecutive periods
+
+    `periods` pairs each period's label with its totals bucket, oldest first.
+    Each row shows the change in total time and the projects that changed the
+    most since the previous period; a sparkline per project closes the report.
+    """
+    console = get_console()
+
+    if not any(bucket["entries"] for _, bucket in periods):
+        print("[yellow]📋 No timesheet entries found for the specified period[/yellow]")
+        print("[dim]Use 'paTS start [project]' to begin tracking time[/dim]")
+        return
+
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Period", style="cyan", min_width=18, no_wrap=True)
+    table.add_column("Time", style="green", min_width=9, no_wrap=True)
+    if goal_hours is not None:
+        table.add_column("Goal", min_width=22, no_wrap=True)
+    table.add_column("Change", min_width=9, no_wrap=True)
+    table.add_column("Biggest Project Changes", style="blue")
+
+    previous = None
+    for label, bucket in periods:
+        row = [label, format_total_duration(bucket["seconds"])]
+        if goal_hours is not None:
+            row.append(format_remaining_time(bucket["seconds"], goal_hours))
+
+        if previous is None:
+            row += ["[dim]-[/dim]", "[dim]-[/dim]"]
+        else:
+            change = bucket["seconds"] - previous["seconds"]
+            color = "green" if change >= 0 else "red"
+            row.append(f"[{color}]{format_signed_duration(change)}[/{color}]")
+
+            projects = set(bucket["projects"]) | set(previous["projects"])
+            deltas = {
+                project: bucket["projects"].get(project, 0)
+                - previous["projects"].get(project, 0)
+                for project in projects
+            }
+            biggest = sorted(
+                (item for item in deltas.items() if item[1]),
+                key=lambda x: abs(x[1]),
+                reverse=True,
+            )[:3]
+            row.append(
+                ", ".join(
+                    f"{project} {format_signed_duration(delta)}"
+                    for project, delta in biggest
+                )
+                or "[dim]-[/dim]"
+            )
+
+        table.add_row(*row)
+        previous = bucket
+
+    console.print(table)
+
+    totals = [bucket["seconds"] for _, bucket in periods]
+    print(f"\n[bold]Total:[/bold] [green]{format_sparkline(totals)}[/green]")
+
+    # Show a sparkline per project, largest overall first
+    project_totals = {}
+    for _, bucket in periods:
+        for project, seconds in bucket["projects"].items():
+            if project in project_totals:
+                project_totals[project] += seconds
+            else:
+                project_totals[project] = seconds
+
+    print("\n[bold]Trend by Project:[/bold]")
+    for project, seconds in sorted(
+        project_totals.items(), key=lambda x: x[1], reverse=True
+    ):
+        sparkline = format_sparkline(
+            [bucket["projects"].get(project, 0) for _, bucket in periods]
+        )
+        formatted_time = format_total_duration(seconds)
+        print(
+            f"  [green]{sparkline}[/green] [blue]{project}:[/blue] "
+            f"[green]{formatted_time}[/green]"
+        )
+
+
+def display_heatmap(grid: list[list[int]], title: str, weekdays: list[str]) -> None:
+    """Display seconds per weekday and hour of day as a shaded grid"""
+    total_seconds = sum(sum(row) for row in grid)
+    if not total_seconds:
+        print("[yellow]📋 No timesheet entries found for the specified period[/yellow]")
+        print("[dim]Use 'paTS start [project]' to begin tracking time[/dim]")
+        return
+
+    # Two characters per hour keeps the grid within 80 columns
+    shades = ["[dim]··[/dim]", "░░", "▒▒", "▓▓", "██"]
+    peak = max(max(row) for row in grid)
+
+    print(f"[bold]{title}[/bold]\n")
+    hours = "".join(f"{hour:02d}    " for hour in range(0, 24, 3))
+    print(f"[magenta]     {hours}[/magenta]")
+    for weekday, row in zip(weekdays, grid, strict=True):
+        cells = "".join(
+            shades[0] if not seconds else shades[max(1, round(seconds / peak * 4))]
+            for seconds in row
+        )
+        print(
+            f"[cyan]{weekday:<4}[/cyan] [green]{cells}[/green] "
+            f"{format_total_duration(sum(row)):>9}"
+        )
+
+    busiest_day, busiest_hour = max(
+        ((day, hour) for day in range(len(grid)) for hour in range(24)),
+        key=lambda slot: grid[slot[0]][slot[1]],
+    )
+    print(
+        f"\n[bold]Total:[/bold] [green]{format_total_duration(total_seconds)}"
+        f"[/green] [dim]| Busiest hour: {weekdays[busiest_day]} "
+        f"{busiest_hour:02d}:00 ({format_total_duration(peak)})[/dim]"
     )
@@ -0,0 +1,160 @@
+"""Streaming export of timesheet data to CSV, JSON Lines and iCalendar"""
+
+import csv
+import hashlib
+import json
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import TextIO
+
+from pats.database import CSV_HEADERS, add_epoch_fields, entry_sort_key
+
+
+def filter_by_project(
+    entries: Iterable[dict[str, str]], project: str | None
+) -> Iterator[dict[str, str]]:
+    """Yield only the entries of the given project (all entries if None)"""
+    if project is None:
+        yield from entries
+        return
+
+    for entry in entries:
+        if entry["project"] == project:
+            yield entry
+
+
+def entry_iso_range(entry: dict[str, str]) -> tuple[str, str]:
+    """Get ISO 8601 local start and end strings for an entry.
+
+    The end is empty for an active session and is moved to the next day for
+    sessions crossing midnight.
+    """
+    start = entry_sort_key(entry).replace(" ", "T")
+    if not entry["endTime"]:
+        return start, ""
+
+    end = f"{start[:10]}T{entry['endTime']}"
+    if end < start:
+        next_day = datetime.fromisoformat(start[:10]) + timedelta(days=1)
+        end = f"{next_day.date().isoformat()}T{entry['endTime']}"
+    return start, end
+
+
+def write_csv(entries: Iterable[dict[str, str]], out: TextIO) -> int:
+    """Write entries in the paTS CSV layout"""
+    writer = csv.DictWriter(out, fieldnames=CSV_HEADERS)
+    writer.writeheader()
+    count = 0
+    for entry in entries:
+        writer.writerow(add_epoch_fields(entry))
+        count += 1
+    return count
+
+
+def write_jsonl(entries: Iterable[dict[str, str]], out: TextIO) -> int:
+    """Write one JSON object per entry, with ISO start and end timestamps"""
+    count = 0
+    for entry in entries:
+        start, end = entry_iso_range(entry)
+        record = {
+            "start": start,
+            "end": end or None,
+            "project": entry["project"],
+            "description": entry["description"],
+        }
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def escape_ical_text(text: str) -> str:
+    """Escape a value for an iCalendar TEXT property"""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_ical_line(line: str) -> str:
+    """Fold a content line to at most 75 octets per physical line"""
+    if len(line.encode("utf-8")) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    current = ""
+    for char in line:
+        limit = 75 if not parts else 74  # Continuations start with a space
+        if len((current + char).encode("utf-8")) > limit:
+            parts.append(current)
+            current = ""
+        current += char
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def write_ical(entries: Iterable[dict[str, str]], out: TextIO) -> int:
+    """Write completed entries as VEVENTs in floating local time.
+
+    DTSTAMP is in UTC, as RFC 5545 requires.
+    """
+    stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+    out.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//paTS//Timesheet//EN\r\n")
+
+    count = 0
+    for entry in entries:
+        start, end = entry_iso_range(entry)
+        if not end:
+            continue  # Active sessions have no end to export yet
+
+        dtstart = start.replace("-", "").replace(":", "") + "00"
+        dtend = end.replace("-", "").replace(":", "") + "00"
+        project = entry["project"] or "No project"
+        summary = project
+        if entry["description"]:
+            summary = f"{project}: {entry['description']}"
+        digest = hashlib.sha1(f"{dtstart}|{summary}".encode()).hexdigest()[:16]
+
+        for line in (
+            "BEGIN:VEVENT",
+            f"UID:{dtstart}-{digest}@pats",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{dtstart}",
+            f"DTEND:{dtend}",
+            f"SUMMARY:{escape_ical_text(summary)}",
+            f"CATEGORIES:{escape_ical_text(project)}",
+            "END:VEVENT",
+        ):
+            out.write(fold_ical_line(line))
+        count += 1
+
+    out.write("END:VCALENDAR\r\n")
+    return count
+
+
+EXPORT_FORMATS: dict[str, Callable[[Iterable[dict[str, str]], TextIO], int]] = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+    "ical": write_ical,
+}
+
+
+def export_entries(
+    entries: Iterable[dict[str, str]],
+    fmt: str,
+    out: TextIO,
+    project: str | None = None,
+) -> int:
+    """Stream entries through the project filter into the chosen writer.
+
+    Returns the number of entries written.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unknown export format '{fmt}'. Expected one of: "
+            + ", ".join(EXPORT_FORMATS)
+        )
+
+    return EXPORT_FORMATS[fmt](filter_by_project(entries, project), out)
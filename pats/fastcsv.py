@@ -0,0 +1,225 @@
+"""Schema-specialised reader for the timesheet CSV
+
+paTS writes one row per line and only quotes fields containing commas,
+quotes or newlines, so most lines can be split on commas directly. Only
+lines containing a quote go through the stdlib csv module, which pulls in
+any following lines that a quoted field spans. Results match csv.DictReader
+on every file `write_entries` produces.
+
+Bulk splitting allocates millions of small objects at once, so the cyclic
+garbage collector is paused while it runs; none of them can form cycles.
+"""
+
+import csv
+import gc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import chain
+from pathlib import Path
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Disable the cyclic garbage collector for the duration of a block"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def detect_newline(text: str) -> str:
+    """Get the line ending used by most lines of CSV text"""
+    if text.count("\r\n") * 2 > text.count("\n"):
+        return "\r\n"
+    return "\n"
+
+
+def split_rows(text: str) -> list[list[str]]:
+    """Split CSV text into the fields of each non-blank row.
+
+    Lines are split in bulk and only those holding a quote are parsed by csv.
+    Files with mixed line endings fall back to a line-by-line scan.
+    """
+    with paused_gc():
+        return _split_rows(text)
+
+
+def _split_rows(text: str) -> list[list[str]]:
+    newline = detect_newline(text)
+    lines = text.split(newline)
+
+    # Lines holding a quote, or a line break that is not the file's newline
+    special = [
+        index
+        for index, line in enumerate(lines)
+        if '"' in line or "\r" in line or "\n" in line
+    ]
+    if not special:
+        return [line.split(",") for line in lines if line]
+
+    rows: list[list[str]] = []
+    position = 0
+    for index in special:
+        if index < position:
+            continue  # Already read as part of a multi-line record
+        if '"' not in lines[index]:
+            # A stray line break outside quotes: mixed line endings
+            return list(iter_split_rows(text))
+
+        rows.extend(line.split(",") for line in lines[position:index] if line)
+        cursor = [index + 1]
+        try:
+            fields = next(csv.reader(record_lines(lines, index, newline, cursor)), None)
+        except csv.Error:
+            return list(iter_split_rows(text))
+        if fields:
+            rows.append(fields)
+        position = cursor[0]
+
+    rows.extend(line.split(",") for line in lines[position:] if line)
+    return rows
+
+
+def record_lines(
+    lines: list[str], index: int, newline: str, cursor: list[int]
+) -> Iterator[str]:
+    """Yield lines from `index` on with their newlines restored, advancing
+    `cursor` past every line handed out"""
+    yield lines[index] + newline
+    for following in range(index + 1, len(lines)):
+        cursor[0] = following + 1
+        yield lines[following] + newline
+
+
+def iter_split_rows(text: str) -> Iterator[list[str]]:
+    """Yield the fields of each non-blank row, line by line"""
+    lines = iter(text.split("\n"))
+    for line in lines:
+        if '"' not in line:
+            line = line.removesuffix("\r")
+            if line:
+                yield line.split(",")
+            continue
+
+        # Quoted fields may contain newlines, so let csv read the whole record
+        fields = next(csv.reader(continued_lines(line, lines)), None)
+        if fields:
+            yield fields
+
+
+def continued_lines(first: str, lines: Iterator[str]) -> Iterator[str]:
+    """Yield `first` and then the remaining lines, restoring their newlines"""
+    yield first + "\n"
+    for line in lines:
+        yield line + "\n"
+
+
+def read_rows(data: bytes) -> tuple[list[str], list[list[str]]]:
+    """Decode a whole timesheet and split it into its header and rows"""
+    rows = split_rows(data.decode("utf-8-sig"))
+    if not rows:
+        return [], []
+    return rows[0], rows[1:]
+
+
+def read_file_rows(path: Path) -> tuple[list[str], list[list[str]]]:
+    """Read a timesheet file with a single read and split it into rows"""
+    with path.open("rb") as file:
+        return read_rows(file.read())
+
+
+def rows_to_entries(
+    headers: list[str], rows: list[list[str]]
+) -> list[dict[str, str | None]]:
+    """Build entry dicts the way csv.DictReader does, including short rows"""
+    width = len(headers)
+    if all(len(row) == width for row in rows):
+        with paused_gc():
+            return [dict(zip(headers, row, strict=True)) for row in rows]
+
+    entries = []
+    for row in rows:
+        entry = dict(zip(headers, row, strict=False))
+        if len(row) < width:
+            for header in headers[len(row) :]:
+                entry[header] = None
+        elif len(row) > width:
+            entry[None] = row[width:]
+        entries.append(entry)
+    return entries
+
+
+def split_columns(text: str, headers: list[str]) -> dict[str, list[str]]:
+    """Split header-less CSV text straight into one list of values per column.
+
+    Runs of lines that need no quoting are joined and split on commas at
+    once, then sliced into columns, without building a list per row. Short
+    rows are padded with empty strings and extra fields are dropped.
+    """
+    width = len(headers)
+    with paused_gc():
+        flat = _split_flat(text, width)
+        if flat is None:
+            rows = [(row + [""] * width)[:width] for row in _split_rows(text)]
+            flat = list(chain.from_iterable(rows))
+        return {header: flat[i::width] for i, header in enumerate(headers)}
+
+
+def _split_flat(text: str, width: int) -> list[str] | None:
+    """Get every field in order, or None if any row is not `width` wide"""
+    newline = detect_newline(text)
+    lines = text.split(newline)
+    special = [
+        index
+        for index, line in enumerate(lines)
+        if '"' in line or "\r" in line or "\n" in line
+    ]
+
+    flat: list[str] = []
+    commas = width - 1
+    position = 0
+    for index in [*special, len(lines)]:
+        if index < position:
+            continue  # Already read as part of a multi-line record
+
+        run = [line for line in lines[position:index] if line]
+        if not all(line.count(",") == commas for line in run):
+            return None
+        if run:
+            flat.extend(",".join(run).split(","))
+        if index == len(lines):
+            break
+        if '"' not in lines[index]:
+            return None  # A stray line break outside quotes
+
+        cursor = [index + 1]
+        try:
+            fields = next(csv.reader(record_lines(lines, index, newline, cursor)), None)
+        except csv.Error:
+            return None
+        if fields:
+            if len(fields) != width:
+                return None
+            flat.extend(fields)
+        position = cursor[0]
+
+    return flat
+
+
+def read_columns(data: bytes) -> tuple[list[str], dict[str, list[str]]]:
+    """Decode a whole timesheet into its header and one list per column"""
+    text = data.decode("utf-8-sig")
+    header_end = text.find("\n") + 1 or len(text)
+    headers = next(csv.reader([text[:header_end]]), [])
+    return headers, split_columns(text[header_end:], headers)
+
+
+def sort_key(date_str: str, start_time: str) -> str:
+    """Get the entry_sort_key of a row's date and start without a dict"""
+    date_parts = date_str.split("-")
+    if len(date_parts) != 3:
+        return ""
+    return f"{date_parts[2]}-{date_parts[1]}-{date_parts[0]} {start_time}"
@@ -0,0 +1,358 @@
+"""Integrity check and repair of the timesheet
+
+The check streams the timesheet once, validating every field and the
+newest-first order as it goes. Each row's local start and end are kept as a
+pair of integers, and one sort and sweep over those intervals then finds
+every overlap in O(n log n). Repairs are applied in memory and written back
+with a single atomic rewrite.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+from itertools import pairwise
+from typing import Any
+
+from pats.database import (
+    CSV_HEADERS,
+    DATABASE_FILE,
+    ENTRY_HEADERS,
+    EPOCH_HEADERS,
+    UNIX_EPOCH_ORDINAL,
+    database_lock,
+    entry_sort_key,
+    iter_entries,
+    prepare_database,
+    wall_seconds,
+    write_entries,
+)
+from pats.importers import add_example
+from pats.sidecar import csv_signature
+from pats.vectorized import DAY_SECONDS, parse_clock, parse_day
+
+FINDINGS = {
+    "malformed": "Malformed rows",
+    "missing_epochs": "Rows without epoch columns",
+    "stale_epochs": "Epochs disagreeing with the local times",
+    "missing_ids": "Rows without an id",
+    "duplicate_ids": "Ids used by more than one row",
+    "midnight": "Sessions ending before they start",
+    "active": "Extra active sessions",
+    "out_of_order": "Rows out of newest-first order",
+    "duplicates": "Duplicate rows",
+    "overlaps": "Overlapping sessions",
+}
+
+# Largest difference between a session's epochs and its local times that a
+# DST change can explain
+MAX_OFFSET_CHANGE = 3600
+
+
+def new_report() -> dict[str, Any]:
+    """Create an empty integrity report"""
+    return {
+        "rows": 0,
+        **dict.fromkeys(FINDINGS, 0),
+        "examples": {finding: [] for finding in FINDINGS},
+    }
+
+
+def valid_clock(value: str) -> bool:
+    """Check for an HH:MM time as paTS stores them"""
+    return len(value) == 5 and parse_clock(value) is not None
+
+
+def local_interval(entry: dict[str, str], now: int) -> tuple[int, int] | None:
+    """Get an entry's local start and end as `wall_seconds` from its date and
+    times alone.
+
+    Sessions ending before they start are taken to end the next day and
+    active sessions end at `now`. Returns None unless the date, start and any
+    end are valid.
+    """
+    date_str = entry.get("date") or ""
+    start_time = entry.get("startTime") or ""
+    end_time = entry.get("endTime") or ""
+    parsed = parse_day(date_str)
+    if parsed is None or len(date_str) != 10 or not valid_clock(start_time):
+        return None
+
+    start = (parsed[0] - UNIX_EPOCH_ORDINAL) * DAY_SECONDS + parse_clock(start_time)
+    if not end_time:
+        return start, max(start, now)
+    if not valid_clock(end_time):
+        return None
+    end = start - parse_clock(start_time) + parse_clock(end_time)
+    if end < start:
+        end += DAY_SECONDS
+    return start, end
+
+
+def field_problem(entry: dict[str, str]) -> str | None:
+    """Describe what makes a row unreadable, if anything"""
+    if None in entry or any(entry.get(header) is None for header in CSV_HEADERS):
+        return "wrong number of columns"
+    if parse_day(entry["date"]) is None or len(entry["date"]) != 10:
+        return f"invalid date {entry['date']!r}"
+    if not valid_clock(entry["startTime"]):
+        return f"invalid start time {entry['startTime']!r}"
+    if entry["endTime"] and not valid_clock(entry["endTime"]):
+        return f"invalid end time {entry['endTime']!r}"
+    return None
+
+
+def epoch_problem(
+    entry: dict[str, str], interval: tuple[int, int]
+) -> tuple[str, str] | None:
+    """Get the finding and description of epochs that don't match a row's
+    local times.
+
+    The offset may be any timezone's, as sessions can be recorded while
+    travelling, so only consistency with the local columns is checked.
+    """
+    cells = [entry.get(header) or "" for header in EPOCH_HEADERS]
+    if not any(cells):
+        return "missing_epochs", "no epoch columns"
+    try:
+        start_epoch, offset = int(cells[0]), int(cells[2])
+        end_epoch = int(cells[1]) if cells[1] else None
+    except ValueError:
+        return "stale_epochs", "epoch columns are not whole numbers"
+
+    start, end = interval
+    if start_epoch + offset != start:
+        return "stale_epochs", "startEpoch does not match the date and start time"
+    if (end_epoch is None) != (not entry["endTime"]):
+        return "stale_epochs", "endEpoch and endTime disagree on whether it ended"
+    drift = end_epoch - start_epoch - (end - start) if end_epoch is not None else 0
+    if abs(drift) > MAX_OFFSET_CHANGE:
+        return "stale_epochs", "endEpoch does not match the end time"
+    return None
+
+
+def id_problem(entry: dict[str, str], seen: set[str]) -> tuple[str, str] | None:
+    """Get the finding and description of a missing or reused id, adding
+    the entry's id to `seen`"""
+    entry_id = entry.get("id") or ""
+    if not entry_id.isdigit():
+        return "missing_ids", f"invalid id {entry_id!r}" if entry_id else "no id"
+    if entry_id in seen:
+        return "duplicate_ids", f"id {entry_id} is used by an earlier row"
+    seen.add(entry_id)
+    return None
+
+
+def check_entries(
+    entries: Iterable[dict[str, str]],
+    now: datetime | None = None,
+    collected: list[dict[str, str]] | None = None,
+) -> dict[str, Any]:
+    """Check entries (given most recent first) in a single pass.
+
+    Examples of each finding are (row number, entry, detail) tuples, rows
+    counting from 1 below the header. Entries are also appended to
+    `collected`, if given, so they can be repaired without reading them again.
+    """
+    report = new_report()
+    now_wall = wall_seconds(now or datetime.now())
+    intervals: list[tuple[int, int, int, tuple[str, ...]]] = []
+    active: list[tuple[str, int, dict[str, str]]] = []
+    ids: set[str] = set()
+    previous_key = None
+
+    for row, entry in enumerate(entries, start=1):
+        report["rows"] += 1
+        if collected is not None:
+            collected.append(entry)
+
+        problem = field_problem(entry)
+        if problem is not None:
+            add_example(report, "malformed", (row, entry, problem))
+            continue
+
+        problem = id_problem(entry, ids)
+        if problem is not None:
+            add_example(report, problem[0], (row, entry, problem[1]))
+
+        key = entry_sort_key(entry)
+        if previous_key is not None and key > previous_key:
+            add_example(
+                report, "out_of_order", (row, entry, "newer than the row before")
+            )
+        previous_key = key
+
+        interval = local_interval(entry, now_wall)
+        epochs = epoch_problem(entry, interval)
+        if epochs is not None:
+            add_example(report, epochs[0], (row, entry, epochs[1]))
+        if not entry["endTime"]:
+            active.append((key, row, entry))
+        elif entry["endTime"] < entry["startTime"]:
+            add_example(report, "midnight", (row, entry, "continues the next day"))
+
+        intervals.append((*interval, row, tuple(visible(entry))))
+
+    # Only the newest active session is tracked; any others were never stopped
+    newest = max(active, default=None, key=lambda item: item[0])
+    for key, row, entry in active:
+        if (key, row) != newest[:2]:
+            add_example(report, "active", (row, entry, "never stopped"))
+
+    # Sweep intervals by start, remembering the one reaching furthest so far
+    intervals.sort()
+    reach = None
+    for start, end, row, fields in intervals:
+        if reach is not None and start < reach[1]:
+            finding = "duplicates" if fields == reach[3] else "overlaps"
+            entry = dict(zip(ENTRY_HEADERS, fields, strict=True))
+            add_example(report, finding, (row, entry, f"overlaps row {reach[2]}"))
+        if reach is None or end > reach[1]:
+            reach = (start, end, row, fields)
+
+    return report
+
+
+def total_findings(report: dict[str, Any]) -> int:
+    """Count all findings in a report"""
+    return sum(report[finding] for finding in FINDINGS)
+
+
+def visible(entry: dict[str, str]) -> list[str]:
+    """Get the human-readable fields of an entry"""
+    return [entry[header] for header in ENTRY_HEADERS]
+
+
+def clear_epochs(entry: dict[str, str]) -> dict[str, str]:
+    """Blank an entry's epoch columns so they are recomputed when written"""
+    entry.update(dict.fromkeys(EPOCH_HEADERS, ""))
+    return entry
+
+
+def split_at_midnight(entry: dict[str, str]) -> list[dict[str, str]]:
+    """Split a session ending before its start into one row per day, the
+    earlier ending at 23:59, most recent first.
+
+    The earlier row keeps the id and the later one gets a new id when written.
+    """
+    day = datetime.strptime(entry["date"], "%d-%m-%Y")
+    next_day = datetime.fromordinal(day.toordinal() + 1)
+    first = clear_epochs({**entry, "endTime": "23:59"})
+    if entry["endTime"] == "00:00":
+        return [first]
+    second = clear_epochs(
+        {
+            **entry,
+            "startTime": "00:00",
+            "date": next_day.strftime("%d-%m-%Y"),
+            "id": "",
+        }
+    )
+    return [second, first]
+
+
+def repair_entries(
+    entries: Iterable[dict[str, str]], now: datetime | None = None
+) -> tuple[list[dict[str, str]], dict[str, int]]:
+    """Repair entries (given most recent first) as far as possible.
+
+    Epochs that are missing or stale are recomputed from the local times,
+    missing or reused ids are replaced with new ones when written, sessions
+    crossing midnight are split, and rows are sorted most recent
+    first. Going forward in time, exact duplicates are dropped and a session
+    still running or overlapping when the next one starts is ended at that
+    start, as `start` does, or at 23:59 if the next one is on a later day.
+    Malformed rows are kept as they are and sort as oldest.
+
+    Returns the repaired entries and the number of rows changed per repair.
+    """
+    changes = dict.fromkeys(
+        ["epochs", "ids", "split", "moved", "duplicates", "ended"], 0
+    )
+    now_wall = wall_seconds(now or datetime.now())
+
+    rows: list[dict[str, str]] = []
+    malformed: set[int] = set()
+    ids: set[str] = set()
+    for entry in entries:
+        row = {header: entry.get(header) or "" for header in CSV_HEADERS}
+        if id_problem(row, ids) is not None:
+            row["id"] = ""
+            changes["ids"] += 1
+        if field_problem(entry) is not None:
+            rows.append(row)
+            malformed.add(id(row))
+            continue
+        interval = local_interval(row, now_wall)
+        if epoch_problem(row, interval) is not None:
+            clear_epochs(row)
+            changes["epochs"] += 1
+        if row["endTime"] and row["endTime"] < row["startTime"]:
+            rows.extend(split_at_midnight(row))
+            changes["split"] += 1
+        else:
+            rows.append(row)
+
+    keys = [entry_sort_key(row) for row in rows]
+    changes["moved"] = sum(older < newer for older, newer in pairwise(keys))
+    ordered = sorted(rows, key=entry_sort_key, reverse=True)
+
+    kept: list[dict[str, str]] = []
+    same_start: list[dict[str, str]] = []
+    previous = None
+    for row in reversed(ordered):
+        kept.append(row)
+        if id(row) in malformed:
+            continue
+        key = entry_sort_key(row)
+        if same_start and entry_sort_key(same_start[0]) != key:
+            same_start = []
+        if any(visible(row) == visible(other) for other in same_start):
+            kept.pop()
+            changes["duplicates"] += 1
+            continue
+
+        if previous is not None and entry_sort_key(previous) != key:
+            same_day = previous["date"] == row["date"]
+            if not previous["endTime"]:
+                previous["endTime"] = row["startTime"] if same_day else "23:59"
+            elif same_day and previous["endTime"] > row["startTime"]:
+                previous["endTime"] = row["startTime"]
+            else:
+                previous = None
+            if previous is not None:
+                clear_epochs(previous)
+                changes["ended"] += 1
+
+        same_start.append(row)
+        previous = row
+
+    kept.reverse()
+    return kept, changes
+
+
+def check_database(
+    now: datetime | None = None, collected: list[dict[str, str]] | None = None
+) -> tuple[dict[str, Any], tuple]:
+    """Check the timesheet, returning the report and the signature of the
+    file that was read"""
+    prepare_database()
+    signature = csv_signature(DATABASE_FILE)
+    return check_entries(iter_entries(), now, collected), signature
+
+
+def repair_database(
+    entries: list[dict[str, str]], signature: tuple, now: datetime | None = None
+) -> dict[str, int] | None:
+    """Repair entries read by `check_database` and replace the timesheet with
+    them in one atomic rewrite.
+
+    Returns the changes made, or None if the timesheet has changed since it
+    was read, in which case nothing is written.
+    """
+    repaired, changes = repair_entries(entries, now)
+    # Writers that land between the check and the rewrite would be lost
+    with database_lock():
+        if csv_signature(DATABASE_FILE) != signature:
+            return None
+        if any(changes.values()):
+            write_entries(repaired)
+    return changes
@@ -0,0 +1,186 @@
+"""Lookup of entries by their stable id
+
+The timesheet is ordered by start time, which bisection already finds in
+O(log n), so the index only maps each id to its row's start. It is a file
+of fixed-width (id, start) records sorted by id, searched by bisection over
+an mmap without loading it. The mapping survives edits anywhere else in
+the timesheet, which move byte offsets but not starts. Starts are used as
+hints and checked against the row found: sessions added since the index
+was written are appended from the top of the timesheet, and anything else
+that doesn't match triggers one rebuild.
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+from bisect import bisect_left
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+
+from pats.database import (
+    DATABASE_FILE,
+    entry_sort_key,
+    find_entry_at,
+    find_row,
+    iter_head,
+    prepare_database,
+)
+from pats.fastcsv import read_columns, sort_key
+
+IDS_FILE = DATABASE_FILE.parent / "index" / "ids.bin"
+
+MAGIC = b"PATSIDS\x01"
+HEADER_SIZE = len(MAGIC)
+
+# Entry id and start as YYYYMMDDHHMM, or 0 once deleted
+RECORD = struct.Struct("<qq")
+
+
+def key_to_number(key: str) -> int:
+    """Pack a "YYYY-MM-DD HH:MM" sort key into an integer"""
+    digits = key.replace("-", "").replace(" ", "").replace(":", "")
+    return int(digits) if len(digits) == 12 and digits.isdigit() else 0
+
+
+def number_to_key(number: int) -> str:
+    """Unpack an integer from key_to_number into a sort key"""
+    d = f"{number:012d}"
+    return f"{d[:4]}-{d[4:6]}-{d[6:8]} {d[8:10]}:{d[10:]}"
+
+
+def build_id_index() -> None:
+    """Write the id index with a full scan of the timesheet"""
+    prepare_database()
+    _, columns = read_columns(DATABASE_FILE.read_bytes())
+    pairs = sorted(
+        (int(entry_id), key_to_number(sort_key(date_str, start_time)))
+        for entry_id, date_str, start_time in zip(
+            columns.get("id", []),
+            columns.get("date", []),
+            columns.get("startTime", []),
+            strict=True,
+        )
+        if entry_id.isdigit()
+    )
+
+    IDS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{IDS_FILE.name}.", dir=IDS_FILE.parent)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(MAGIC)
+            file.write(b"".join(RECORD.pack(*pair) for pair in pairs))
+        os.replace(tmp_name, IDS_FILE)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def search(records: mmap.mmap, entry_id: int) -> int | None:
+    """Get the position of an id's record by bisection, or None"""
+    count = (len(records) - HEADER_SIZE) // RECORD.size
+
+    def record_id(index: int) -> int:
+        return RECORD.unpack_from(records, HEADER_SIZE + index * RECORD.size)[0]
+
+    index = bisect_left(range(count), entry_id, key=record_id)
+    if index < count and record_id(index) == entry_id:
+        return index
+    return None
+
+
+def lookup_key(entry_id: int) -> tuple[str | None, int]:
+    """Get the start sort key of an id, if indexed, and the highest id in
+    the index (-1 if there is no usable index)"""
+    try:
+        with IDS_FILE.open("rb") as file:
+            if file.read(HEADER_SIZE) != MAGIC:
+                return None, -1
+            if os.fstat(file.fileno()).st_size == HEADER_SIZE:
+                return None, 0
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as records:
+                highest = RECORD.unpack_from(records, len(records) - RECORD.size)[0]
+                index = search(records, entry_id)
+                if index is None:
+                    return None, highest
+                offset = HEADER_SIZE + index * RECORD.size
+                number = RECORD.unpack_from(records, offset)[1]
+    except OSError:
+        return None, -1
+    return (number_to_key(number) if number else None), highest
+
+
+def append_ids(pairs: Iterable[tuple[int, str]]) -> None:
+    """Append (id, sort key) pairs higher than every indexed id, in order"""
+    with IDS_FILE.open("ab") as file:
+        for entry_id, key in pairs:
+            file.write(RECORD.pack(entry_id, key_to_number(key)))
+
+
+def new_rows(highest: int) -> list[tuple[int, str]]:
+    """Get the (id, sort key) of rows at the top of the timesheet with ids
+    above `highest`, oldest first"""
+    found = []
+    for entry, _ in iter_head():
+        entry_id = entry.get("id") or ""
+        if entry_id.isdigit():
+            if int(entry_id) <= highest:
+                break
+            found.append((int(entry_id), entry_sort_key(entry)))
+    return sorted(found)
+
+
+def find_entry_by_id(entry_id: int) -> tuple[dict[str, str], int, int] | None:
+    """Find an entry by id, with the byte offsets where its row starts and
+    ends, or None if there is no such entry"""
+
+    def locate(key: str | None) -> tuple[dict[str, str], int, int] | None:
+        if key is None:
+            return None
+        return find_row(key, lambda entry: entry.get("id") == str(entry_id))
+
+    key, highest = lookup_key(entry_id)
+    found = locate(key)
+    if found is not None:
+        return found
+
+    if highest >= 0 and entry_id > highest:
+        added = new_rows(highest)
+        if added:
+            append_ids(added)
+            found = locate(dict(added).get(entry_id))
+            if found is not None:
+                return found
+
+    # Missing, or out of date after a rewrite of the timesheet
+    build_id_index()
+    return locate(lookup_key(entry_id)[0])
+
+
+def forget_id(entry_id: int) -> None:
+    """Mark a deleted entry's id in the index, if there is one"""
+    try:
+        with IDS_FILE.open("r+b") as file:
+            if os.fstat(file.fileno()).st_size == HEADER_SIZE:
+                return
+            with mmap.mmap(file.fileno(), 0) as records:
+                index = search(records, entry_id)
+                if index is not None:
+                    offset = HEADER_SIZE + index * RECORD.size
+                    RECORD.pack_into(records, offset, entry_id, 0)
+    except OSError:
+        return
+
+
+def locate_entry(
+    entry_id: int | None = None, at: str | None = None
+) -> tuple[dict[str, str], int, int] | None:
+    """Find an entry by id or by a local "YYYY-MM-DD HH:MM" time it was
+    running at, with its row's byte offsets.
+
+    Raises ValueError if `at` is not a valid date and time.
+    """
+    if entry_id is not None:
+        return find_entry_by_id(entry_id)
+    return find_entry_at(datetime.fromisoformat(at))
@@ -0,0 +1,413 @@
+"""Streaming import of timesheet data from CSV, JSON Lines and other trackers"""
+
+import contextlib
+import csv
+import heapq
+import json
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, TextIO
+
+from pats.database import (
+    ENTRY_HEADERS,
+    entry_sort_key,
+    iter_entries,
+    write_entries,
+)
+
+# Rows held in memory before a sorted run is spilled to a temporary file
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Number of example rows kept per finding for the import report
+MAX_EXAMPLES = 10
+
+# Datetime layouts tried after ISO 8601 (tracker exports vary by locale)
+DATETIME_FORMATS = [
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%d-%m-%Y %H:%M:%S",
+    "%d-%m-%Y %H:%M",
+]
+
+# A raw record as produced by a format adapter: (start, end, project, description)
+Record = tuple[datetime, datetime | None, str, str]
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse a datetime string from an export into a naive local datetime"""
+    value = value.strip()
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        for fmt in DATETIME_FORMATS:
+            try:
+                dt = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"Unrecognised datetime: '{value}'") from None
+
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def parse_time(value: str) -> time:
+    """Parse an HH:MM or HH:MM:SS time string"""
+    parts = value.strip().split(":")
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Unrecognised time: '{value}'")
+    return time(*(int(part) for part in parts))
+
+
+def tags_to_description(description: str, tags: str | list[str]) -> str:
+    """Append tracker tags to a description as #tag tokens"""
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    tokens = [f"#{tag.strip().replace(' ', '-')}" for tag in tags if tag.strip()]
+    return " ".join([description, *tokens]).strip()
+
+
+def convert_mapped_fields(
+    row: dict[str, Any], mapping: dict[str, str], date_format: str
+) -> Record:
+    """Convert a row with (possibly remapped) paTS or start/end columns"""
+
+    def field(name: str) -> str:
+        value = row.get(mapping.get(name, name))
+        return "" if value is None else str(value).strip()
+
+    if field("start"):
+        start = parse_datetime(field("start"))
+        end = parse_datetime(field("end")) if field("end") else None
+    else:
+        day = datetime.strptime(field("date"), date_format).date()
+        start = datetime.combine(day, parse_time(field("startTime")))
+        end = None
+        if field("endTime"):
+            end = datetime.combine(day, parse_time(field("endTime")))
+            # paTS rows store sessions crossing midnight on their start date
+            if end < start:
+                end += timedelta(days=1)
+
+    return start, end, field("project"), field("description")
+
+
+def read_csv_rows(file: TextIO) -> Iterator[dict[str, str]]:
+    """Yield rows of a CSV file with a header line"""
+    yield from csv.DictReader(file)
+
+
+def read_json_lines(file: TextIO) -> Iterator[str]:
+    """Yield the non-empty lines of a JSON Lines file"""
+    for line in file:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def read_timewarrior_lines(file: TextIO) -> Iterator[str]:
+    """Yield one JSON object per line from a `timew export` array"""
+    for line in file:
+        line = line.strip().rstrip(",")
+        if line and line not in ("[", "]"):
+            yield line
+
+
+def convert_csv_row(row: dict[str, str], options: dict[str, Any]) -> Record:
+    """Convert a generic CSV row using the configured column mapping"""
+    return convert_mapped_fields(row, options["mapping"], options["date_format"])
+
+
+def convert_json_line(line: str, options: dict[str, Any]) -> Record:
+    """Convert a JSON Lines object using the configured field mapping"""
+    obj = json.loads(line)
+    if not isinstance(obj, dict):
+        raise ValueError("Expected a JSON object")
+    return convert_mapped_fields(obj, options["mapping"], options["date_format"])
+
+
+def convert_toggl_row(row: dict[str, str], options: dict[str, Any]) -> Record:
+    """Convert a row of a Toggl Track detailed CSV export"""
+    start = parse_datetime(f"{row['Start date']} {row['Start time']}")
+    end = parse_datetime(f"{row['End date']} {row['End time']}")
+    description = tags_to_description(row.get("Description", ""), row.get("Tags", ""))
+    return start, end, row.get("Project", ""), description
+
+
+def convert_clockify_row(row: dict[str, str], options: dict[str, Any]) -> Record:
+    """Convert a row of a Clockify detailed CSV export"""
+    start = parse_datetime(f"{row['Start Date']} {row['Start Time']}")
+    end = parse_datetime(f"{row['End Date']} {row['End Time']}")
+    description = tags_to_description(row.get("Description", ""), row.get("Tags", ""))
+    return start, end, row.get("Project", ""), description
+
+
+def convert_timewarrior_line(line: str, options: dict[str, Any]) -> Record:
+    """Convert a Timewarrior interval (first tag is used as the project)"""
+    obj = json.loads(line)
+
+    def parse_utc(value: str) -> datetime:
+        dt = datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=UTC)
+        return dt.astimezone().replace(tzinfo=None)
+
+    tags = obj.get("tags", [])
+    project = tags[0] if tags else ""
+    description = obj.get("annotation") or " ".join(tags[1:])
+    end = parse_utc(obj["end"]) if obj.get("end") else None
+    return parse_utc(obj["start"]), end, project, description
+
+
+# Format name -> (row reader, row converter)
+IMPORT_FORMATS: dict[str, tuple[Callable[[TextIO], Iterator[Any]], Callable]] = {
+    "csv": (read_csv_rows, convert_csv_row),
+    "jsonl": (read_json_lines, convert_json_line),
+    "toggl": (read_csv_rows, convert_toggl_row),
+    "clockify": (read_csv_rows, convert_clockify_row),
+    "timewarrior": (read_timewarrior_lines, convert_timewarrior_line),
+}
+
+
+def make_row(
+    start: datetime, end: datetime, project: str, description: str
+) -> dict[str, str]:
+    """Build a database row for a session shorter than a day, on its start date"""
+    return {
+        "startTime": start.strftime("%H:%M"),
+        "endTime": end.strftime("%H:%M"),
+        "date": start.strftime("%d-%m-%Y"),
+        "project": project,
+        "description": description,
+    }
+
+
+def normalise_record(record: Record) -> list[dict[str, str]]:
+    """Validate a record and convert it into one or more database rows.
+
+    Times are truncated to minutes. A session crossing midnight stays one
+    row ending before it starts, as paTS stores them. A row can't span a
+    whole day, so longer sessions are cut at midnight, and whole days at
+    noon, with no time lost at the cuts.
+    """
+    start, end, project, description = record
+
+    if end is None:
+        raise ValueError("Open-ended sessions cannot be imported")
+
+    start = start.replace(second=0, microsecond=0)
+    end = end.replace(second=0, microsecond=0)
+    if end < start:
+        raise ValueError("Session ends before it starts")
+
+    # Keep every row on a single physical line
+    project = " ".join(project.split())
+    description = " ".join(description.split())
+
+    rows = []
+    while end - start >= timedelta(days=1):
+        cut = datetime.combine(start.date() + timedelta(days=1), time())
+        if start.time() == time():
+            cut = start.replace(hour=12)
+        rows.append(make_row(start, cut, project, description))
+        start = cut
+
+    if start < end or not rows:
+        rows.append(make_row(start, end, project, description))
+
+    return rows
+
+
+def new_report() -> dict[str, Any]:
+    """Create an empty import report"""
+    return {
+        "records": 0,
+        "rows": 0,
+        "imported": 0,
+        "invalid": 0,
+        "duplicates": 0,
+        "conflicts": 0,
+        "overlaps": 0,
+        "examples": {"invalid": [], "conflicts": [], "overlaps": []},
+    }
+
+
+def add_example(report: dict[str, Any], finding: str, example: Any) -> None:
+    """Count a finding and keep the first few examples of it"""
+    report[finding] += 1
+    examples = report["examples"][finding]
+    if len(examples) < MAX_EXAMPLES:
+        examples.append(example)
+
+
+def iter_import_rows(
+    file: TextIO, fmt: str, options: dict[str, Any], report: dict[str, Any]
+) -> Iterator[dict[str, str]]:
+    """Stream normalised rows from an input file, recording invalid records"""
+    reader, converter = IMPORT_FORMATS[fmt]
+
+    for record_number, raw in enumerate(reader(file), start=1):
+        report["records"] += 1
+        try:
+            rows = normalise_record(converter(raw, options))
+        except (ValueError, KeyError, TypeError) as e:
+            add_example(report, "invalid", (record_number, str(e)))
+            continue
+
+        report["rows"] += len(rows)
+        yield from rows
+
+
+def write_sorted_runs(
+    rows: Iterable[dict[str, str]], directory: Path, chunk_size: int
+) -> list[Path]:
+    """Spill rows into temporary files, each sorted most recent first"""
+    runs = []
+    chunk: list[dict[str, str]] = []
+
+    def flush() -> None:
+        chunk.sort(key=entry_sort_key, reverse=True)
+        run = directory / f"run-{len(runs):05d}.csv"
+        write_entries(chunk, run)
+        runs.append(run)
+        chunk.clear()
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            flush()
+
+    if chunk:
+        flush()
+
+    return runs
+
+
+def tag_rows(
+    rows: Iterable[dict[str, str]], existing: bool
+) -> Iterator[tuple[dict[str, str], bool]]:
+    """Pair each row with whether it is already in the database"""
+    for row in rows:
+        yield row, existing
+
+
+def same_entry(a: dict[str, str], b: dict[str, str]) -> bool:
+    """Check whether two rows record the same session, ignoring their ids"""
+    return all(a[header] == b[header] for header in ENTRY_HEADERS)
+
+
+def reconcile(
+    merged: Iterable[tuple[dict[str, str], bool]], report: dict[str, Any]
+) -> Iterator[dict[str, str]]:
+    """Drop duplicate and conflicting imported rows and detect overlaps.
+
+    `merged` must be ordered most recent first, so rows sharing a start are
+    adjacent and an overlap only has to be checked against the earliest
+    start seen so far among existing and among imported rows.
+    """
+    earliest_start = {True: "~", False: "~"}  # "~" sorts after any date key
+
+    def flush(group: list[tuple[dict[str, str], bool]]) -> Iterator[dict[str, str]]:
+        kept: list[tuple[dict[str, str], bool]] = []
+        # Existing rows come first so they win over imported ones
+        for row, existing in sorted(group, key=lambda item: not item[1]):
+            if not existing:
+                if any(same_entry(row, other) for other, _ in kept):
+                    report["duplicates"] += 1
+                    continue
+                clash = next((other for other, old in kept if old), None)
+                if clash is not None:
+                    add_example(report, "conflicts", (clash, row))
+                    continue
+                report["imported"] += 1
+
+            start_key = entry_sort_key(row)
+            if row["endTime"]:
+                end_day = start_key[:10]
+                if row["endTime"] < row["startTime"]:
+                    # Overnight sessions end the following day
+                    with contextlib.suppress(ValueError):
+                        end_day = str(date.fromisoformat(end_day) + timedelta(days=1))
+                end_key = f"{end_day} {row['endTime']}"
+                # Existing rows only need checking against imported ones
+                limits = [earliest_start[False]]
+                if not existing:
+                    limits.append(earliest_start[True])
+                if end_key > min(limits):
+                    add_example(report, "overlaps", row)
+
+            kept.append((row, existing))
+            earliest_start[existing] = min(earliest_start[existing], start_key)
+            yield row
+
+    group: list[tuple[dict[str, str], bool]] = []
+    group_key = None
+    for row, existing in merged:
+        key = entry_sort_key(row)
+        if key != group_key and group:
+            yield from flush(group)
+            group = []
+        group_key = key
+        group.append((row, existing))
+
+    if group:
+        yield from flush(group)
+
+
+def import_entries(
+    file: TextIO,
+    fmt: str,
+    options: dict[str, Any],
+    dry_run: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict[str, Any]:
+    """Import a file into the database in one sorted, batched write.
+
+    The input is externally sorted in bounded chunks, then merged with the
+    existing timesheet and written atomically. With `dry_run` the merge runs
+    but nothing is written. Returns a report of what was (or would be) done.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(
+            f"Unknown import format '{fmt}'. Expected one of: "
+            + ", ".join(IMPORT_FORMATS)
+        )
+
+    report = new_report()
+
+    with tempfile.TemporaryDirectory(prefix="pats-import-") as tmp:
+        rows = iter_import_rows(file, fmt, options, report)
+        runs = write_sorted_runs(rows, Path(tmp), chunk_size)
+
+        sources = [tag_rows(iter_entries(), True)]
+        sources += [tag_rows(iter_entries(run), False) for run in runs]
+        merged = heapq.merge(
+            *sources, key=lambda item: entry_sort_key(item[0]), reverse=True
+        )
+        output = reconcile(merged, report)
+
+        if dry_run:
+            for _ in output:
+                pass
+        elif runs:
+            write_entries(output)
+
+    return report
+
+
+def parse_column_mapping(pairs: list[str] | None) -> dict[str, str]:
+    """Parse `field=column` pairs into a column mapping"""
+    mapping = {}
+    for pair in pairs or []:
+        if "=" not in pair:
+            raise ValueError(f"Invalid mapping '{pair}', expected field=column")
+        target, source = pair.split("=", 1)
+        target = target.strip()
+        if target not in [*ENTRY_HEADERS, "start", "end"]:
+            raise ValueError(f"Unknown field '{target}' in mapping '{pair}'")
+        mapping[target] = source.strip()
+    return mapping
@@ -0,0 +1,576 @@
+"""Persisted inverted index over projects, descriptions and #tags.
+
+Entries are identified by ordinal, counted from the oldest row at the bottom
+of the newest-first CSV, so ordinals of existing rows never change when new
+sessions are added at the top. For each ordinal the index keeps its start
+key and the offset of its row start from the end of the file, which is also
+stable under changes to the rows above it. A full build happens once; after
+that start/stop/edit/delete append small deltas to a journal which is
+replayed on load and compacted into the base file from time to time.
+
+Tags parsed from descriptions additionally get a bitmap over ordinals (a
+Python int used as a bitset) so that boolean tag filters and per-tag totals
+are bitwise operations rather than string scans.
+"""
+
+import csv
+import os
+import pickle
+import re
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from pats.database import (
+    DATABASE_FILE,
+    _iter_raw_rows,
+    datetime_sort_key,
+    entry_sort_key,
+    epoch_span,
+    prepare_database,
+)
+
+INDEX_DIR = DATABASE_FILE.parent / "index"
+BASE_FILE = INDEX_DIR / "base.pickle"
+JOURNAL_FILE = INDEX_DIR / "journal.pickle"
+
+INDEX_VERSION = 3
+
+# Duration stored for active sessions, which keep growing until stopped
+ACTIVE = -(2**62)
+
+# Journal records replayed before the base index is rewritten
+COMPACT_THRESHOLD = 200
+
+TOKEN_PATTERN = re.compile(r"#?\w+(?:[-/.]\w+)*")
+
+
+def tokenize(text: str) -> set[str]:
+    """Split free text into lowercase word and #tag tokens"""
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+def entry_tokens(entry: dict[str, str]) -> set[str]:
+    """Get the index tokens of an entry (its project is prefixed with '@')"""
+    tokens = tokenize(entry.get("description") or "")
+    tokens.add("@" + (entry.get("project") or "").lower())
+    return tokens
+
+
+def key_to_int(key: str) -> int:
+    """Convert a "YYYY-MM-DD HH:MM" sort key into a sortable integer"""
+    digits = key.replace("-", "").replace(" ", "").replace(":", "")
+    return int(digits) if digits.isdigit() else 0
+
+
+def entry_duration(entry: dict[str, str]) -> int:
+    """Get the duration of a completed entry in seconds (ACTIVE if running)"""
+    if not entry.get("endTime"):
+        return ACTIVE
+
+    span = epoch_span(entry)
+    if span is not None:
+        return span[1] - span[0]
+
+    try:
+        start = [int(part) for part in entry["startTime"].split(":")]
+        end = [int(part) for part in entry["endTime"].split(":")]
+    except (KeyError, ValueError):
+        return 0
+    if key_to_int(entry_sort_key(entry)) == 0:
+        return 0
+
+    start_seconds = start[0] * 3600 + start[1] * 60 + sum(start[2:])
+    end_seconds = end[0] * 3600 + end[1] * 60 + sum(end[2:])
+    return end_seconds - start_seconds
+
+
+def database_stat(path: Path | None = None) -> tuple[int, int]:
+    """Get the (size, mtime) pair used to detect changes to the database"""
+    stat = (path or DATABASE_FILE).stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def read_record(file: BinaryIO) -> bytes:
+    """Read the raw CSV record at the file's position, including the further
+    lines of a quoted field that spans several"""
+    return next(_iter_raw_rows(file, None), (b"", 0))[0]
+
+
+def parse_line(line: bytes, headers: list[str]) -> dict[str, str]:
+    """Parse a single raw CSV record into an entry"""
+    values = next(csv.reader([line.decode("utf-8")]), [])
+    return dict(zip(headers, values, strict=False))
+
+
+def read_head(count: int) -> tuple[list[dict[str, str]], list[int], int]:
+    """Read the first `count` rows of the database.
+
+    Returns the entries, the offsets of their starts from the end of the file
+    and the offset from the end where the following row starts.
+    """
+    size = DATABASE_FILE.stat().st_size
+    entries, heads = [], []
+
+    with DATABASE_FILE.open("rb") as file:
+        headers = next(csv.reader([file.readline().decode("utf-8-sig")]), [])
+        for _ in range(count):
+            heads.append(size - file.tell())
+            entries.append(parse_line(read_record(file), headers))
+        boundary = size - file.tell()
+
+    return entries, heads, boundary
+
+
+def new_index() -> dict[str, Any]:
+    """Create an empty index"""
+    return {
+        "version": INDEX_VERSION,
+        "stat": None,
+        "keys": array("q"),
+        "heads": array("q"),
+        "durations": array("q"),
+        "postings": {},
+        "tags": {},
+    }
+
+
+def append_entry(
+    index: dict[str, Any], entry: dict[str, str], head: int, bitmaps: bool = True
+) -> None:
+    """Add an entry as the newest ordinal of the index.
+
+    Pass `bitmaps=False` when adding many entries and call rebuild_bitmaps
+    afterwards, as growing a bitmap one bit at a time copies it every time.
+    """
+    ordinal = len(index["keys"])
+    index["keys"].append(key_to_int(entry_sort_key(entry)))
+    index["heads"].append(head)
+    index["durations"].append(entry_duration(entry))
+    for token in entry_tokens(entry):
+        index["postings"].setdefault(token, array("I")).append(ordinal)
+        if bitmaps and token.startswith("#"):
+            index["tags"][token] = index["tags"].get(token, 0) | (1 << ordinal)
+
+
+def remove_newest_entry(index: dict[str, Any], tokens: Iterable[str]) -> None:
+    """Remove the newest ordinal of the index, given its tokens"""
+    ordinal = len(index["keys"]) - 1
+    for token in tokens:
+        posting = index["postings"].get(token)
+        if not posting or posting[-1] != ordinal:
+            raise ValueError(f"Index out of sync for token '{token}'")
+        posting.pop()
+        if not posting:
+            del index["postings"][token]
+        if token.startswith("#"):
+            bitmap = index["tags"].pop(token) & ~(1 << ordinal)
+            if bitmap:
+                index["tags"][token] = bitmap
+    index["keys"].pop()
+    index["heads"].pop()
+    index["durations"].pop()
+
+
+def bitmap_from_ordinals(ordinals: Iterable[int], size: int) -> int:
+    """Build a bitmap with the bits of the given ordinals set"""
+    bits = bytearray((size + 7) // 8)
+    for ordinal in ordinals:
+        bits[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(bits, "little")
+
+
+def iter_bits(bitmap: int) -> Iterator[int]:
+    """Yield the set bits of a bitmap, highest (newest ordinal) first"""
+    digits = bin(bitmap)[2:]
+    top = len(digits) - 1
+    for i, digit in enumerate(digits):
+        if digit == "1":
+            yield top - i
+
+
+def rebuild_bitmaps(index: dict[str, Any]) -> None:
+    """Recompute every tag bitmap from the tag posting lists"""
+    size = len(index["keys"])
+    index["tags"] = {
+        token: bitmap_from_ordinals(posting, size)
+        for token, posting in index["postings"].items()
+        if token.startswith("#")
+    }
+
+
+def build_index() -> dict[str, Any]:
+    """Build the index with a full scan of the database"""
+    prepare_database()
+    index = new_index()
+    index["stat"] = database_stat()
+    size = index["stat"][0]
+
+    rows = []
+    with DATABASE_FILE.open("rb") as file:
+        headers = next(csv.reader([file.readline().decode("utf-8-sig")]), [])
+        offset = file.tell()
+        # Whole records, as quoted descriptions may span several lines
+        for record, end in _iter_raw_rows(file, None):
+            if record.strip():
+                rows.append((parse_line(record, headers), size - offset))
+            offset = end
+
+    # Ordinals count from the oldest row at the bottom of the file
+    for entry, head in reversed(rows):
+        append_entry(index, entry, head, bitmaps=False)
+    rebuild_bitmaps(index)
+
+    return index
+
+
+def save_index(index: dict[str, Any]) -> None:
+    """Atomically write the base index and reset the journal"""
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    # Readers may rebuild at the same time, so each writes its own temp file
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{BASE_FILE.name}.", dir=INDEX_DIR)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(index, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, BASE_FILE)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    JOURNAL_FILE.unlink(missing_ok=True)
+
+
+def invalidate_index() -> None:
+    """Drop the index so it is rebuilt on next use"""
+    BASE_FILE.unlink(missing_ok=True)
+    JOURNAL_FILE.unlink(missing_ok=True)
+
+
+def record_head_change(
+    before: tuple[int, int], removed: list[dict[str, str]], added: int
+) -> None:
+    """Journal a write that replaced the first rows of the database.
+
+    `removed` are the old first rows (newest first) and `added` the number of
+    rows that now take their place. Does nothing until an index exists.
+    """
+    if not BASE_FILE.exists():
+        return
+
+    entries, heads, boundary = read_head(added)
+    record = {
+        "before": before,
+        "after": database_stat(),
+        "removed": [sorted(entry_tokens(entry)) for entry in removed],
+        "added": list(zip(entries, heads, strict=True)),
+        "boundary": boundary,
+    }
+    with JOURNAL_FILE.open("ab") as file:
+        pickle.dump(record, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def replay_journal(index: dict[str, Any]) -> int:
+    """Apply journalled changes to the index, returning how many were applied.
+
+    Raises ValueError if the journal does not continue from the index state.
+    """
+    if not JOURNAL_FILE.exists():
+        return 0
+
+    applied = 0
+    with JOURNAL_FILE.open("rb") as file:
+        while True:
+            try:
+                record = pickle.load(file)
+            except EOFError:
+                break
+            if record["before"] != index["stat"]:
+                raise ValueError("Journal does not match index state")
+
+            for tokens in record["removed"]:
+                remove_newest_entry(index, tokens)
+
+            # The first untouched row must start where the new rows end
+            heads = index["heads"]
+            if (heads[-1] if heads else 0) != record["boundary"]:
+                raise ValueError("Journal does not match row layout")
+
+            for entry, head in reversed(record["added"]):
+                append_entry(index, entry, head)
+
+            index["stat"] = record["after"]
+            applied += 1
+
+    return applied
+
+
+def load_index() -> dict[str, Any]:
+    """Load the index, rebuilding it if it is missing or out of date"""
+    prepare_database()
+
+    index = None
+    applied = 0
+    if BASE_FILE.exists():
+        try:
+            with BASE_FILE.open("rb") as file:
+                index = pickle.load(file)
+            if index.get("version") != INDEX_VERSION:
+                raise ValueError("Unsupported index version")
+            applied = replay_journal(index)
+        except (OSError, ValueError, KeyError, EOFError, pickle.UnpicklingError):
+            index = None
+
+    if index is None or index["stat"] != database_stat():
+        # Missing, corrupt or the CSV was changed behind our back
+        index = build_index()
+        save_index(index)
+    elif applied >= COMPACT_THRESHOLD:
+        save_index(index)
+
+    return index
+
+
+def ordinal_range(
+    index: dict[str, Any], start_key: str | None, end_key: str | None
+) -> range:
+    """Get the ordinals whose start keys fall within the given bounds"""
+    keys = index["keys"]
+    lo = bisect_left(keys, key_to_int(start_key)) if start_key else 0
+    hi = bisect_right(keys, key_to_int(end_key)) if end_key else len(keys)
+    return range(lo, hi)
+
+
+def token_postings(index: dict[str, Any], fragment: str) -> set[int]:
+    """Get the ordinals with any token containing the given fragment"""
+    ordinals: set[int] = set()
+    for token, posting in index["postings"].items():
+        if fragment in token:
+            ordinals.update(posting)
+    return ordinals
+
+
+def candidate_ordinals(
+    index: dict[str, Any],
+    project: str | None = None,
+    text: str | None = None,
+    tags: list[str] | None = None,
+    start_key: str | None = None,
+    end_key: str | None = None,
+) -> list[int]:
+    """Find the ordinals that may match a query, newest first.
+
+    The result is a superset of the matches: rows still have to be checked
+    against the exact filters once read.
+    """
+    window = ordinal_range(index, start_key, end_key)
+    postings = index["postings"]
+    candidates: set[int] | None = None
+
+    def narrow(ordinals: Iterable[int]) -> None:
+        nonlocal candidates
+        ordinals = set(ordinals)
+        candidates = ordinals if candidates is None else candidates & ordinals
+
+    if project is not None:
+        narrow(postings.get("@" + project.lower(), ()))
+    for tag in tags or []:
+        narrow(postings.get("#" + tag.lower().lstrip("#"), ()))
+    if text:
+        # Every word of the text is contained in some token of a matching row
+        for fragment in tokenize(text):
+            narrow(token_postings(index, fragment))
+
+    if candidates is None:
+        return list(reversed(window))
+
+    return sorted(
+        (ordinal for ordinal in candidates if ordinal in window), reverse=True
+    )
+
+
+def read_ordinals(index: dict[str, Any], ordinals: list[int]) -> list[dict[str, str]]:
+    """Read the rows of the given ordinals from the database"""
+    heads = index["heads"]
+    size = index["stat"][0]
+    entries = []
+
+    with DATABASE_FILE.open("rb") as file:
+        headers = next(csv.reader([file.readline().decode("utf-8-sig")]), [])
+        for ordinal in ordinals:
+            file.seek(size - heads[ordinal])
+            entries.append(parse_line(read_record(file), headers))
+
+    return entries
+
+
+def matches(
+    entry: dict[str, str],
+    project: str | None = None,
+    text: str | None = None,
+    pattern: re.Pattern[str] | None = None,
+    tags: list[str] | None = None,
+) -> bool:
+    """Check an entry against the exact query filters"""
+    description = entry.get("description") or ""
+    if project is not None and (entry.get("project") or "").lower() != project.lower():
+        return False
+    if text and text.lower() not in description.lower():
+        return False
+    if pattern is not None and not pattern.search(description):
+        return False
+    if tags:
+        entry_tags = tokenize(description)
+        if any("#" + tag.lower().lstrip("#") not in entry_tags for tag in tags):
+            return False
+    return True
+
+
+def search(
+    project: str | None = None,
+    text: str | None = None,
+    regex: str | None = None,
+    tags: list[str] | None = None,
+    start_key: str | None = None,
+    end_key: str | None = None,
+) -> list[dict[str, str]]:
+    """Find the entries matching all given filters, most recent first"""
+    pattern = re.compile(regex, re.IGNORECASE) if regex else None
+    index = load_index()
+    ordinals = candidate_ordinals(index, project, text, tags, start_key, end_key)
+    return [
+        entry
+        for entry in read_ordinals(index, ordinals)
+        if matches(entry, project, text, pattern, tags)
+    ]
+
+
+def window_mask(
+    index: dict[str, Any], start_key: str | None, end_key: str | None
+) -> int:
+    """Get a bitmap of the ordinals within the given start key bounds"""
+    window = ordinal_range(index, start_key, end_key)
+    return ((1 << window.stop) - 1) ^ ((1 << window.start) - 1)
+
+
+def tag_token(tag: str) -> str:
+    """Normalise a tag name, with or without '#', to its index token"""
+    return "#" + tag.lower().lstrip("#")
+
+
+def evaluate_tag_expression(index: dict[str, Any], expression: str) -> int:
+    """Evaluate a boolean tag expression into a bitmap of matching ordinals.
+
+    Supports AND, OR, NOT and parentheses (case-insensitive), with AND
+    implied between adjacent terms, e.g. "#billable AND NOT (#meeting OR #oncall)".
+    """
+    tokens = re.findall(r"\(|\)|[^\s()]+", expression)
+    universe = (1 << len(index["keys"])) - 1
+    position = 0
+
+    def peek() -> str | None:
+        return tokens[position].upper() if position < len(tokens) else None
+
+    def take() -> str:
+        nonlocal position
+        if position >= len(tokens):
+            raise ValueError(f"Incomplete tag expression: '{expression}'")
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or() -> int:
+        result = parse_and()
+        while peek() == "OR":
+            take()
+            result |= parse_and()
+        return result
+
+    def parse_and() -> int:
+        result = parse_not()
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                take()
+            result &= parse_not()
+        return result
+
+    def parse_not() -> int:
+        if peek() == "NOT":
+            take()
+            return universe & ~parse_not()
+        return parse_atom()
+
+    def parse_atom() -> int:
+        token = take()
+        if token == "(":
+            result = parse_or()
+            if take() != ")":
+                raise ValueError(f"Missing ')' in tag expression: '{expression}'")
+            return result
+        if token.upper() in ("AND", "OR", ")"):
+            raise ValueError(f"Unexpected '{token}' in tag expression")
+        return index["tags"].get(tag_token(token), 0)
+
+    result = parse_or()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected '{tokens[position]}' in tag expression")
+    return result
+
+
+def ordinal_duration(index: dict[str, Any], ordinal: int) -> int:
+    """Get the duration of an indexed entry, measuring active ones until now"""
+    duration = index["durations"][ordinal]
+    if duration != ACTIVE:
+        return duration
+
+    start = datetime.strptime(str(index["keys"][ordinal]), "%Y%m%d%H%M")
+    return int((datetime.now() - start).total_seconds())
+
+
+def entries_matching_tags(
+    expression: str,
+    start_key: str | None = None,
+    end_key: str | None = None,
+    index: dict[str, Any] | None = None,
+) -> list[dict[str, str]]:
+    """Get the entries in a window matching a tag expression, most recent first"""
+    index = index or load_index()
+    bitmap = evaluate_tag_expression(index, expression)
+    bitmap &= window_mask(index, start_key, end_key)
+    return read_ordinals(index, list(iter_bits(bitmap)))
+
+
+def tag_totals(
+    start_key: str | None = None,
+    end_key: str | None = None,
+    expression: str | None = None,
+    index: dict[str, Any] | None = None,
+) -> dict[str, int]:
+    """Get the seconds spent per tag in a window, optionally tag-filtered"""
+    index = index or load_index()
+    mask = window_mask(index, start_key, end_key)
+    if expression:
+        mask &= evaluate_tag_expression(index, expression)
+
+    totals = {}
+    for token, bitmap in index["tags"].items():
+        selected = bitmap & mask
+        if selected:
+            totals[token] = sum(
+                ordinal_duration(index, ordinal) for ordinal in iter_bits(selected)
+            )
+    return totals
+
+
+def filter_period_by_tags(
+    expression: str, start_date: datetime, end_date: datetime
+) -> tuple[list[dict[str, str]], dict[str, int]]:
+    """Get the entries of a period matching a tag expression and their tag totals"""
+    start_key = datetime_sort_key(start_date)
+    end_key = datetime_sort_key(end_date)
+    index = load_index()
+    return (
+        entries_matching_tags(expression, start_key, end_key, index),
+        tag_totals(start_key, end_key, expression, index),
+    )
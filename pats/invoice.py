@@ -0,0 +1,144 @@
+"""Invoices: billable hours and amounts from per-day or per-description totals
+
+Line items are priced from totals that are aggregated in a single pass over
+the window, per day or per description. Exclusions are checked against each
+entry's own project before aliasing, so both kinds of line item bill the
+same time. Each item is rounded, then priced with exact decimal arithmetic.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+
+from pats.aggregate import entry_date
+from pats.database import iter_entries_in_range
+from pats.display_utils import calculate_duration_seconds
+from pats.rules import ProjectRules, get_project_rules
+
+LINE_ITEMS = ["day", "description"]
+
+CENTS = Decimal("0.01")
+
+
+def round_seconds(seconds: int, minutes: int, mode: str) -> int:
+    """Round a duration to a whole number of `minutes` (up, nearest or
+    down), or to the whole minute when `minutes` is 0"""
+    step = max(1, minutes) * 60
+    if mode == "down":
+        return seconds // step * step
+    if mode == "nearest":
+        return (seconds + step // 2) // step * step
+    return -(-seconds // step) * step
+
+
+def rate_for(project: str, rates: dict[str, float]) -> Decimal | None:
+    """Get a project's hourly rate, falling back to the "*" rate"""
+    rate = rates.get(project, rates.get("*"))
+    return None if rate is None else Decimal(str(rate))
+
+
+def day_totals(
+    entries: Iterable[dict[str, str]], rules: ProjectRules
+) -> dict[tuple[str, str], int]:
+    """Get seconds per (project, YYYY-MM-DD) in a single pass"""
+    totals: dict[tuple[str, str], int] = {}
+    for entry in entries:
+        day = entry_date(entry)
+        if day is None:
+            continue
+        project, excluded = rules.resolve(entry["project"] or "")
+        if excluded:
+            continue
+        key = (project or "No project", day.isoformat())
+        totals[key] = totals.get(key, 0) + calculate_duration_seconds(entry)
+    return totals
+
+
+def description_totals(
+    entries: Iterable[dict[str, str]], rules: ProjectRules
+) -> dict[tuple[str, str], int]:
+    """Get seconds per (project, description) in a single pass"""
+    totals: dict[tuple[str, str], int] = {}
+    for entry in entries:
+        project, excluded = rules.resolve(entry["project"] or "")
+        if excluded:
+            continue
+        key = (project or "No project", entry["description"] or "No description")
+        totals[key] = totals.get(key, 0) + calculate_duration_seconds(entry)
+    return totals
+
+
+def build_invoice(
+    totals: dict[tuple[str, str], int],
+    rates: dict[str, float],
+    rounding: tuple[int, str],
+    project: str | None = None,
+) -> dict[str, Any]:
+    """Price (project, item) totals into line items, sorted by project and
+    then by day or description.
+
+    Projects without a rate are not billed; their time is returned under
+    "unbilled". Amounts are Decimals rounded to cents.
+    """
+    minutes, mode = rounding
+    lines = []
+    unbilled: dict[str, int] = {}
+    for (name, item), seconds in totals.items():
+        if project is not None and name != project:
+            continue
+        rate = rate_for(name, rates)
+        if rate is None:
+            unbilled[name] = unbilled.get(name, 0) + seconds
+            continue
+        billed = round_seconds(seconds, minutes, mode)
+        hours = Decimal(billed) / 3600
+        lines.append(
+            {
+                "project": name,
+                "item": item,
+                "seconds": seconds,
+                "hours": hours.quantize(CENTS, ROUND_HALF_UP),
+                "rate": rate,
+                "amount": (hours * rate).quantize(CENTS, ROUND_HALF_UP),
+            }
+        )
+
+    lines.sort(key=lambda line: (line["project"], line["item"]))
+
+    projects: dict[str, dict[str, Decimal]] = {}
+    for line in lines:
+        subtotal = projects.setdefault(
+            line["project"], {"hours": Decimal(0), "amount": Decimal(0)}
+        )
+        subtotal["hours"] += line["hours"]
+        subtotal["amount"] += line["amount"]
+
+    return {
+        "lines": lines,
+        "projects": projects,
+        "hours": sum((p["hours"] for p in projects.values()), Decimal(0)),
+        "amount": sum((p["amount"] for p in projects.values()), Decimal(0)),
+        "unbilled": unbilled,
+    }
+
+
+def invoice_range(
+    start_date: datetime,
+    end_date: datetime,
+    by: str,
+    rates: dict[str, float],
+    rounding: tuple[int, str],
+    project: str | None = None,
+) -> dict[str, Any]:
+    """Build an invoice for a date range with one line item per day or per
+    description for each project"""
+    rules = get_project_rules()
+    entries = iter_entries_in_range(start_date, end_date)
+    if by == "day":
+        totals = day_totals(entries, rules)
+    else:
+        totals = description_totals(entries, rules)
+    if project is not None:
+        project = rules.canonical(project)
+    return build_invoice(totals, rates, rounding, project)
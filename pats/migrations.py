@@ -0,0 +1,335 @@
+"""Streaming, resumable migrations of the timesheet CSV
+
+A migration streams rows from the database into a work file next to it,
+converting one row at a time, so memory use stays flat however long the
+history is. Every MIGRATION_CHUNK_ROWS rows the work file is synced and a
+checkpoint records how far both files have got. An interrupted run resumes
+from the last checkpoint, and only a complete work file atomically replaces
+the database.
+"""
+
+import csv
+import io
+import json
+import mmap
+import os
+import re
+import sys
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from pats.database import (
+    CSV_HEADERS,
+    DATABASE_FILE,
+    ENTRY_HEADERS,
+    EPOCH_HEADERS,
+    _iter_raw_rows,
+    add_epoch_fields,
+    database_lock,
+    parse_datetime_to_time_date,
+)
+from pats.fastcsv import rows_to_entries
+from pats.index import invalidate_index
+
+# Rows converted between checkpoints
+MIGRATION_CHUNK_ROWS = 10_000
+
+# The raw bytes of an HH:MM:SS time and the comma ending its field
+SECONDS_PATTERN = re.compile(rb":\d\d:\d\d,")
+
+
+def split_datetime_columns(entry: dict[str, str]) -> dict[str, str]:
+    """Convert (startDateTime, endDateTime) into (startTime, endTime, date)"""
+    start_time, start_date = parse_datetime_to_time_date(
+        entry.get("startDateTime") or ""
+    )
+    end_time, end_date = parse_datetime_to_time_date(entry.get("endDateTime") or "")
+
+    # Entries spanning several days keep their start date
+    return {
+        "startTime": start_time,
+        "endTime": end_time,
+        "date": start_date or end_date,
+        "project": entry.get("project") or "",
+        "description": entry.get("description") or "",
+    }
+
+
+def strip_seconds(entry: dict[str, str]) -> dict[str, str]:
+    """Convert HH:MM:SS start and end times to HH:MM"""
+    for field in ("startTime", "endTime"):
+        value = entry.get(field) or ""
+        if value.count(":") == 2:
+            entry[field] = value.rsplit(":", 1)[0]
+    return entry
+
+
+def add_entry_id(entry: dict[str, str], number: int) -> dict[str, str]:
+    """Give an entry its position counted from the oldest as its id"""
+    return {**entry, "id": str(number)}
+
+
+def has_datetime_columns(
+    path: Path, headers: list[str], first: dict[str, str] | None
+) -> bool:
+    return "startDateTime" in headers
+
+
+def time_has_seconds(entry: dict[str, str]) -> bool:
+    """Check whether an entry's start or end time is HH:MM:SS"""
+    start_time = entry.get("startTime") or ""
+    end_time = entry.get("endTime") or ""
+    return start_time.count(":") == 2 or end_time.count(":") == 2
+
+
+def has_seconds(path: Path, headers: list[str], first: dict[str, str] | None) -> bool:
+    if first is None:
+        return False
+    if time_has_seconds(first):
+        return True
+    if "id" in headers:
+        # Schema v4 is reached after this migration, and paTS only writes
+        # HH:MM, so the file was already scanned and reads stay O(1)
+        return False
+
+    # Restored or hand-merged history can have HH:MM:SS rows below newer
+    # HH:MM ones, so every row is checked: a search of the raw bytes first,
+    # then parsing only the rows it matches, as descriptions may look alike
+    with path.open("rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if SECONDS_PATTERN.search(data) is None:
+                return False
+        file.readline()
+        for line, _ in _iter_raw_rows(file, None):
+            if SECONDS_PATTERN.search(line):
+                fields = next(csv.reader([line.decode("utf-8")]), None)
+                if fields and time_has_seconds(rows_to_entries(headers, [fields])[0]):
+                    return True
+    return False
+
+
+def lacks_epochs(path: Path, headers: list[str], first: dict[str, str] | None) -> bool:
+    return bool(headers) and "startEpoch" not in headers
+
+
+def lacks_ids(path: Path, headers: list[str], first: dict[str, str] | None) -> bool:
+    return bool(headers) and "id" not in headers
+
+
+# Applied in order; each is a single streaming pass over the database
+MIGRATIONS: list[dict[str, Any]] = [
+    {
+        "name": "datetime-columns",
+        "applies": has_datetime_columns,
+        "headers": lambda headers: ENTRY_HEADERS,
+        "convert": split_datetime_columns,
+        "start": "🔄 Migrating database format...",
+        "done": "✅ Migrated {count} entries to new format",
+    },
+    {
+        "name": "time-format",
+        "applies": has_seconds,
+        "headers": lambda headers: headers,
+        "convert": strip_seconds,
+        "start": "🔄 Migrating time format from hh:mm:ss to hh:mm...",
+        "done": "✅ Migrated time format for {count} entries",
+    },
+    {
+        "name": "epoch-schema",
+        "applies": lacks_epochs,
+        "headers": lambda headers: ENTRY_HEADERS + EPOCH_HEADERS,
+        "convert": add_epoch_fields,
+        "start": "🔄 Migrating database to epoch timestamps...",
+        "done": "✅ Migrated {count} entries to schema v3",
+    },
+    {
+        "name": "entry-ids",
+        "applies": lacks_ids,
+        "headers": lambda headers: CSV_HEADERS,
+        "convert": add_entry_id,
+        # Numbered from the oldest row, so ids follow the order of the history
+        "numbered": True,
+        "start": "🔄 Giving every entry a stable id...",
+        "done": "✅ Migrated {count} entries to schema v4",
+    },
+]
+
+
+def peek(path: Path) -> tuple[list[str], dict[str, str] | None]:
+    """Read a timesheet's header and newest row"""
+    with path.open("rb") as file:
+        headers = next(csv.reader([file.readline().decode("utf-8-sig")]), [])
+        for line, _ in _iter_raw_rows(file, None):
+            fields = next(csv.reader([line.decode("utf-8")]), None)
+            if fields:
+                return headers, rows_to_entries(headers, [fields])[0]
+    return headers, None
+
+
+def count_rows(path: Path) -> int:
+    """Count the non-blank rows of a timesheet without parsing them"""
+    with path.open("rb") as file:
+        file.readline()
+        return sum(1 for line, _ in _iter_raw_rows(file, None) if line.strip())
+
+
+def work_paths(path: Path, name: str) -> tuple[Path, Path]:
+    """Get the work file and checkpoint file of a migration"""
+    work = path.with_name(f".{path.name}.{name}")
+    return work, work.with_name(work.name + ".checkpoint")
+
+
+def load_checkpoint(checkpoint_file: Path, source: list[int]) -> dict[str, int] | None:
+    """Load a checkpoint, or None if missing or taken of a different source"""
+    try:
+        checkpoint = json.loads(checkpoint_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get("source") != source:
+        return None  # The database changed since, so start over
+    return checkpoint
+
+
+def work_reaches(work: Path, offset: int) -> bool:
+    """Check that a work file still holds everything up to a checkpoint"""
+    try:
+        return work.stat().st_size >= offset
+    except OSError:
+        return False
+
+
+def save_checkpoint(checkpoint_file: Path, checkpoint: dict[str, Any]) -> None:
+    """Atomically write a checkpoint"""
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f"{checkpoint_file.name}.", dir=checkpoint_file.parent
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(json.dumps(checkpoint))
+        os.replace(tmp_name, checkpoint_file)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def report_progress(done: int, total: int) -> None:
+    """Show how far a migration has got on a single updating line"""
+    if total and sys.stdout.isatty():
+        print(f"\r   {done * 100 // total}%", end="", flush=True)
+
+
+def run_migration(
+    path: Path,
+    migration: dict[str, Any],
+    progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """Stream a timesheet through a migration, resuming an interrupted run.
+
+    `progress` is called with the source bytes done and in total at every
+    checkpoint. Numbered migrations also pass each row's position counted
+    from the oldest (starting at 1) to their converter. Returns the number
+    of rows migrated.
+    """
+    work, checkpoint_file = work_paths(path, migration["name"])
+    stat = path.stat()
+    total = count_rows(path) if migration.get("numbered") else 0
+    source_id = [stat.st_size, stat.st_mtime_ns]
+    checkpoint = load_checkpoint(checkpoint_file, source_id)
+    if checkpoint and not work_reaches(work, checkpoint["target_offset"]):
+        checkpoint = None  # The work file is gone or cut short, so start over
+
+    with path.open("rb") as source, work.open("r+b" if checkpoint else "wb") as target:
+        headers = next(csv.reader([source.readline().decode("utf-8-sig")]), [])
+        buffer = io.StringIO(newline="")
+        writer = csv.DictWriter(
+            buffer, fieldnames=migration["headers"](headers), extrasaction="ignore"
+        )
+
+        if checkpoint:
+            source.seek(checkpoint["source_offset"])
+            target.truncate(checkpoint["target_offset"])
+            target.seek(checkpoint["target_offset"])
+            count = checkpoint["rows"]
+        else:
+            writer.writeheader()
+            count = 0
+
+        def flush(source_offset: int) -> None:
+            target.write(buffer.getvalue().encode("utf-8"))
+            buffer.seek(0)
+            buffer.truncate()
+            target.flush()
+            os.fsync(target.fileno())
+            save_checkpoint(
+                checkpoint_file,
+                {
+                    "source": source_id,
+                    "source_offset": source_offset,
+                    "target_offset": target.tell(),
+                    "rows": count,
+                },
+            )
+            if progress:
+                progress(source_offset, stat.st_size)
+
+        pending = 0
+        for line, end in _iter_raw_rows(source, None):
+            fields = next(csv.reader([line.decode("utf-8")]), None)
+            if not fields:
+                continue  # Blank lines are dropped, as csv.DictReader does
+            entry = rows_to_entries(headers, [fields])[0]
+            if migration.get("numbered"):
+                writer.writerow(migration["convert"](entry, total - count))
+            else:
+                writer.writerow(migration["convert"](entry))
+            count += 1
+            pending += 1
+            if pending >= MIGRATION_CHUNK_ROWS:
+                flush(end)
+                pending = 0
+
+        target.write(buffer.getvalue().encode("utf-8"))
+        target.flush()
+        os.fsync(target.fileno())
+
+    os.chmod(work, stat.st_mode)
+    os.replace(work, path)
+    checkpoint_file.unlink(missing_ok=True)
+    return count
+
+
+def pending_migration(path: Path) -> bool:
+    """Check whether a timesheet still needs any migration"""
+    if not path.exists():
+        return False
+    headers, first = peek(path)
+    return any(migration["applies"](path, headers, first) for migration in MIGRATIONS)
+
+
+def run_pending_migrations(path: Path | None = None) -> None:
+    """Bring a timesheet up to the current schema, one pass per migration.
+
+    Migrations run under the database's write lock, so a process that finds
+    one pending waits for any other process already running it, then checks
+    again before touching the work file.
+    """
+    path = path or DATABASE_FILE
+    if not pending_migration(path):
+        return
+
+    with database_lock():
+        for migration in MIGRATIONS:
+            if not path.exists():
+                return
+            if not migration["applies"](path, *peek(path)):
+                continue
+
+            print(migration["start"])
+            count = run_migration(path, migration, report_progress)
+            if path == DATABASE_FILE:
+                invalidate_index()
+            if sys.stdout.isatty():
+                print("\r", end="")  # Overwrite the progress line
+            print(migration["done"].format(count=count))
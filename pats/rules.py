@@ -0,0 +1,155 @@
+"""Project rules: exclusion from totals and aliases for inconsistent names
+
+Rules come from the config: exact `excluded_projects`, `excluded_patterns`
+(globs such as `lunch-*`, or regular expressions prefixed with `re:`) and
+`project_aliases`, which map a name or pattern to the project it should be
+counted as. They are compiled once per process, and again only when the
+config file changes, and each distinct project string is resolved once, so
+aggregation pays a dict lookup per row.
+"""
+
+import fnmatch
+import json
+import re
+from typing import Any
+
+from pats.config import (
+    get_config_path,
+    get_excluded_patterns,
+    get_excluded_projects,
+    get_project_aliases,
+)
+
+REGEX_PREFIX = "re:"
+
+
+def pattern_regex(pattern: str) -> str:
+    """Translate a glob, or a regex prefixed with `re:`, into a regex source"""
+    if pattern.startswith(REGEX_PREFIX):
+        return pattern[len(REGEX_PREFIX) :]
+    return fnmatch.translate(pattern)
+
+
+def compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Compile a project pattern.
+
+    Raises ValueError if it is not a valid regular expression.
+    """
+    try:
+        return re.compile(pattern_regex(pattern))
+    except re.error as e:
+        raise ValueError(f"Invalid pattern '{pattern}': {e}") from e
+
+
+class ProjectRules:
+    """Exclusions and aliases compiled into matchers, with every project
+    resolved once.
+
+    Exclusions are a single alternation where the patterns allow it. Aliases
+    are tried in config order and the first match wins; a project is
+    excluded if either its own name or its alias matches an exclusion.
+    """
+
+    def __init__(
+        self,
+        excluded_projects: list[str] | None = None,
+        excluded_patterns: list[str] | None = None,
+        aliases: dict[str, str] | None = None,
+    ) -> None:
+        self.excluded_projects = list(excluded_projects or [])
+        self.excluded_patterns = list(excluded_patterns or [])
+        self.aliases = dict(aliases or {})
+
+        excluded = [re.compile(re.escape(p)) for p in self.excluded_projects]
+        excluded += [compile_pattern(p) for p in self.excluded_patterns]
+        try:
+            combined = "|".join(f"(?:{pattern.pattern})" for pattern in excluded)
+            self._excluded = [re.compile(combined)] if excluded else []
+        except re.error:
+            # Global inline flags like (?i) are only allowed at the very start
+            self._excluded = excluded
+        self._aliases = [
+            (compile_pattern(pattern), project)
+            for pattern, project in self.aliases.items()
+        ]
+        self._resolved: dict[str, tuple[str, bool]] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Workers get the rules and start with an empty memo
+        return {**self.__dict__, "_resolved": {}}
+
+    def _matches_exclusion(self, project: str) -> bool:
+        return any(pattern.fullmatch(project) for pattern in self._excluded)
+
+    def resolve(self, project: str) -> tuple[str, bool]:
+        """Get the name a project is counted as and whether it is excluded
+        from totals"""
+        resolved = self._resolved.get(project)
+        if resolved is None:
+            name = project
+            for pattern, alias in self._aliases:
+                if pattern.fullmatch(project):
+                    name = alias
+                    break
+            excluded = self._matches_exclusion(project) or (
+                name != project and self._matches_exclusion(name)
+            )
+            resolved = self._resolved[project] = (name, excluded)
+        return resolved
+
+    def canonical(self, project: str) -> str:
+        """Get the name a project is counted as"""
+        return self.resolve(project)[0]
+
+    def is_excluded(self, project: str) -> bool:
+        """Check whether a project is left out of totals"""
+        return self.resolve(project)[1]
+
+    def signature(self) -> str:
+        """Get a stable description of the rules, for cache keys"""
+        return json.dumps(
+            [self.excluded_projects, self.excluded_patterns, self.aliases],
+            sort_keys=True,
+        )
+
+
+# The config file's stat when the rules were last compiled, and the rules
+_compiled: tuple[tuple, ProjectRules] | None = None
+
+
+def config_stat() -> tuple:
+    """Get the config file's path, size and mtime, to detect changes to it"""
+    path = get_config_path()
+    try:
+        stat = path.stat()
+    except OSError:
+        return (path,)
+    return path, stat.st_size, stat.st_mtime_ns
+
+
+def get_project_rules() -> ProjectRules:
+    """Get the configured project rules, compiled once per process and only
+    read and compiled again when the config file changes.
+
+    Invalid patterns are skipped so a bad hand edit of the config doesn't
+    break every report; `paTS config` validates patterns when they are set.
+    """
+    global _compiled
+    key = config_stat()
+    if _compiled is not None and _compiled[0] == key:
+        return _compiled[1]
+
+    excluded_patterns = [p for p in get_excluded_patterns() if valid_pattern(p)]
+    aliases = {p: name for p, name in get_project_aliases().items() if valid_pattern(p)}
+    rules = ProjectRules(get_excluded_projects(), excluded_patterns, aliases)
+    _compiled = (key, rules)
+    return rules
+
+
+def valid_pattern(pattern: str) -> bool:
+    """Check whether a project pattern compiles"""
+    try:
+        compile_pattern(pattern)
+    except ValueError:
+        return False
+    return True
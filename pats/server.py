@@ -0,0 +1,406 @@
+"""Local HTTP/JSON API over an in-memory copy of the timesheet
+
+Entries are held oldest first next to their sort keys, so any date window is
+two bisections and a slice. Changes are followed through the search index's
+journal: start, stop and other edits at the top of the timesheet record the
+rows they replaced and added, which are applied to the copy in memory. Any
+other change, such as a hand edit or a rewrite, reloads the whole file (from
+the parsed sidecar when it is current) in a worker thread.
+
+All clients share one asyncio event loop. Writes are serialised, so two
+clients starting sessions at once can't lose one of them.
+"""
+
+import asyncio
+import json
+import os
+import pickle
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from pats.aggregate import PERIODS, aggregate_entries
+from pats.database import (
+    DATABASE_FILE,
+    datetime_sort_key,
+    entry_sort_key,
+    get_day_range,
+    get_month_range,
+    get_week_range,
+    parse_date_input,
+    read_entries,
+    start_new_session,
+    stop_active_session,
+)
+from pats.display_utils import calculate_duration_seconds
+from pats.index import BASE_FILE, JOURNAL_FILE, database_stat, load_index
+from pats.rules import get_project_rules
+
+DEFAULT_PORT = 8765
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 64 * 1024
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+def journal_position() -> tuple[tuple[int, int] | None, int]:
+    """Get the identity (device and inode) and size of the index journal,
+    or (None, 0) if there is none"""
+    try:
+        info = JOURNAL_FILE.stat()
+    except OSError:
+        return None, 0
+    return (info.st_dev, info.st_ino), info.st_size
+
+
+def load_state() -> dict[str, Any]:
+    """Read the whole timesheet into a new in-memory state.
+
+    Writers only journal their changes once a search index exists, so one is
+    built first if needed. The read is retried if the file changes while it
+    is being read.
+    """
+    if not BASE_FILE.exists():
+        load_index()
+    while True:
+        stat = database_stat(DATABASE_FILE)
+        journal_id, journal = journal_position()
+        rows = read_entries()[::-1]
+        if database_stat(DATABASE_FILE) == stat:
+            break
+    return {
+        "rows": rows,
+        "keys": [entry_sort_key(entry) for entry in rows],
+        "stat": stat,
+        "journal": journal,
+        "journal_id": journal_id,
+        "totals": {},
+    }
+
+
+def follow_journal(state: dict[str, Any]) -> bool:
+    """Apply journalled head changes to the state in place.
+
+    Returns False, leaving the state untouched, if the journal doesn't take
+    it to the current file, in which case it has to be reloaded.
+    """
+    stat = database_stat(DATABASE_FILE)
+    records = []
+    try:
+        with JOURNAL_FILE.open("rb") as file:
+            info = os.fstat(file.fileno())
+            journal_id = (info.st_dev, info.st_ino)
+            # A journal compacted since is a new file (or a shorter one) whose
+            # records are read from the start and must continue from the state
+            offset = state["journal"]
+            if journal_id != state["journal_id"] or info.st_size < offset:
+                offset = 0
+            file.seek(offset)
+            while True:
+                try:
+                    records.append(pickle.load(file))
+                except EOFError:
+                    break
+            offset = file.tell()
+    except FileNotFoundError:
+        journal_id, offset = None, 0
+    except Exception:
+        # An offset into a rewritten journal can land inside a record, and
+        # unpickling garbage can raise almost anything, so reload instead
+        return False
+
+    current = state["stat"]
+    for record in records:
+        if not isinstance(record, dict) or record.get("before") != current:
+            return False
+        current = record["after"]
+    if current != stat:
+        return False
+
+    rows, keys = state["rows"], state["keys"]
+    for record in records:
+        for _ in record["removed"]:
+            rows.pop()
+            keys.pop()
+        for entry, _ in reversed(record["added"]):
+            rows.append(entry)
+            keys.append(entry_sort_key(entry))
+    state.update(stat=stat, journal=offset, journal_id=journal_id, totals={})
+    return True
+
+
+def window(
+    state: dict[str, Any], start_date: datetime, end_date: datetime
+) -> list[dict[str, str]]:
+    """Get the entries starting within a range, most recent first"""
+    keys = state["keys"]
+    begin = bisect_left(keys, datetime_sort_key(start_date))
+    end = bisect_right(keys, datetime_sort_key(end_date))
+    return state["rows"][begin:end][::-1]
+
+
+def entry_record(entry: dict[str, str]) -> dict[str, Any]:
+    """Get the JSON form of an entry, with its duration so far"""
+    return {**entry, "seconds": calculate_duration_seconds(entry)}
+
+
+def entries_payload(
+    entries: list[dict[str, str]], start_date: datetime, end_date: datetime
+) -> dict[str, Any]:
+    """Get a window's entries with its total (excluding configured projects)
+    and per-project totals"""
+    rules = get_project_rules()
+    seconds = 0
+    projects: dict[str, int] = {}
+    records = []
+    for entry in entries:
+        record = entry_record(entry)
+        records.append(record)
+        project, excluded = rules.resolve(entry["project"] or "")
+        if not excluded:
+            seconds += record["seconds"]
+        project = project or "No project"
+        projects[project] = projects.get(project, 0) + record["seconds"]
+    return {
+        "from": start_date.date().isoformat(),
+        "to": end_date.date().isoformat(),
+        "entries": records,
+        "seconds": seconds,
+        "projects": projects,
+    }
+
+
+def day_range(query: dict[str, str], name: str) -> tuple[datetime, datetime]:
+    """Get the whole-day range of a YYYY-MM-DD query parameter (today if
+    missing)"""
+    return get_day_range(parse_date_input(query.get(name), "day"))
+
+
+def query_range(query: dict[str, str]) -> tuple[datetime, datetime]:
+    """Get the range of required `from` and `to` query parameters"""
+    if "from" not in query or "to" not in query:
+        raise ValueError("Both 'from' and 'to' are required (YYYY-MM-DD)")
+    start_date, _ = day_range(query, "from")
+    _, end_date = day_range(query, "to")
+    if start_date > end_date:
+        raise ValueError("The range must start before it ends")
+    return start_date, end_date
+
+
+def window_route(
+    state: dict[str, Any], query: dict[str, str], period: str
+) -> dict[str, Any]:
+    """Handle the /day, /week, /month and /range endpoints"""
+    if period == "range":
+        start_date, end_date = query_range(query)
+    elif period == "month":
+        start_date, end_date = get_month_range(
+            parse_date_input(query.get("month"), "month")
+        )
+    elif period == "week":
+        start_date, end_date = get_week_range(
+            parse_date_input(query.get("date"), "week")
+        )
+    else:
+        start_date, end_date = day_range(query, "date")
+    return entries_payload(window(state, start_date, end_date), start_date, end_date)
+
+
+def totals_route(state: dict[str, Any], query: dict[str, str]) -> dict[str, Any]:
+    """Handle /totals: per-period buckets for a range.
+
+    Buckets are kept until the timesheet changes, unless the range holds an
+    active session whose duration keeps growing.
+    """
+    start_date, end_date = query_range(query)
+    period = query.get("by", "day")
+    if period not in PERIODS:
+        raise ValueError(f"'by' must be one of: {', '.join(PERIODS)}")
+
+    key = (datetime_sort_key(start_date), datetime_sort_key(end_date), period)
+    buckets = state["totals"].get(key)
+    if buckets is None:
+        entries = window(state, start_date, end_date)
+        buckets = aggregate_entries(entries, period, get_project_rules())
+        if all(entry["endTime"] for entry in entries):
+            state["totals"][key] = buckets
+
+    return {
+        "from": start_date.date().isoformat(),
+        "to": end_date.date().isoformat(),
+        "by": period,
+        "periods": [
+            {"start": start.isoformat(), **bucket} for start, bucket in buckets.items()
+        ],
+    }
+
+
+def active_entry(state: dict[str, Any]) -> dict[str, str] | None:
+    """Get the active session, which is always among the newest rows"""
+    for entry in reversed(state["rows"]):
+        if not entry["endTime"]:
+            return entry
+        break
+    return None
+
+
+class ApiServer:
+    """Request handling over the shared in-memory state"""
+
+    def __init__(self) -> None:
+        self.state = load_state()
+        self.reload_lock = asyncio.Lock()
+        self.write_lock = asyncio.Lock()
+
+    async def refresh(self, writing: bool = False) -> None:
+        """Bring the state up to date with the timesheet, if it changed.
+
+        While one of our own writes is in progress the state is left as it
+        was, as the file may be written before the change is journalled.
+        """
+        if database_stat(DATABASE_FILE) == self.state["stat"]:
+            return
+        if self.write_lock.locked() and not writing:
+            return
+        async with self.reload_lock:
+            if database_stat(DATABASE_FILE) == self.state["stat"]:
+                return  # Another request already caught up
+            if not follow_journal(self.state):
+                self.state = await asyncio.to_thread(load_state)
+
+    async def route(
+        self, method: str, target: str, body: bytes
+    ) -> tuple[int, dict[str, Any]]:
+        """Dispatch a request to its endpoint, returning status and payload"""
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        query = dict(parse_qsl(url.query))
+
+        writes = {"/start", "/stop"}
+        reads = {"/", "/active", "/day", "/week", "/month", "/range", "/totals"}
+        if path not in writes | reads:
+            return 404, {"error": f"No endpoint {path}"}
+        expected = "POST" if path in writes else "GET"
+        if method != expected:
+            return 405, {"error": f"Use {expected} for {path}"}
+
+        try:
+            if path in writes:
+                return 200, await self.write(path, body)
+            await self.refresh()
+            return 200, self.read(path, query)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+    def read(self, path: str, query: dict[str, str]) -> dict[str, Any]:
+        """Answer a GET request from the in-memory state"""
+        state = self.state
+        if path == "/":
+            return {
+                "endpoints": [
+                    "GET /active",
+                    "GET /day?date=YYYY-MM-DD",
+                    "GET /week?date=YYYY-MM-DD",
+                    "GET /month?month=YYYY-MM",
+                    "GET /range?from=YYYY-MM-DD&to=YYYY-MM-DD",
+                    "GET /totals?from=YYYY-MM-DD&to=YYYY-MM-DD&by=day|week|month",
+                    "POST /start {project, description}",
+                    "POST /stop",
+                ],
+                "entries": len(state["rows"]),
+            }
+        if path == "/active":
+            active = active_entry(state)
+            return {"active": entry_record(active) if active else None}
+        if path == "/totals":
+            return totals_route(state, query)
+        return window_route(state, query, path[1:])
+
+    async def write(self, path: str, body: bytes) -> dict[str, Any]:
+        """Start or stop a session, one write at a time"""
+        try:
+            fields = json.loads(body) if body.strip() else {}
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON body: {e}") from e
+        if not isinstance(fields, dict):
+            raise ValueError("The JSON body must be an object")
+
+        async with self.write_lock:
+            if path == "/start":
+                project = str(fields.get("project") or "")
+                description = str(fields.get("description") or "")
+                await asyncio.to_thread(start_new_session, project, description)
+                stopped = None
+            else:
+                stopped = await asyncio.to_thread(stop_active_session)
+            await self.refresh(writing=True)
+
+        active = active_entry(self.state)
+        payload = {"active": entry_record(active) if active else None}
+        if stopped is not None:
+            payload["stopped"] = stopped
+        return payload
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve HTTP/1.1 requests on one connection until it closes"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while (line := await reader.readline()).strip():
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "Request body too large"}
+                    headers["connection"] = "close"
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = await self.route(method, target, body)
+                    except Exception as e:  # Keep serving other requests
+                        status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    "\r\n".encode()
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # Malformed request or the client went away
+        finally:
+            writer.close()
+
+
+async def run_server(host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+    """Serve the API until cancelled"""
+    api = await asyncio.to_thread(ApiServer)
+    server = await asyncio.start_server(api.handle, host, port)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,76 @@
+"""Binary sidecar of the parsed rows of the timesheet CSV
+
+The parsed entries are marshalled next to the CSV together with its size,
+mtime and a hash of its header line. A load only succeeds when all three
+still match, so hand-edits to the CSV simply cause a rebuild.
+"""
+
+import hashlib
+import marshal
+import os
+import tempfile
+from pathlib import Path
+
+from pats.fastcsv import paused_gc
+
+SIDECAR_VERSION = 1
+
+
+def sidecar_path(path: Path) -> Path:
+    """Get the sidecar file kept next to a timesheet"""
+    return path.with_name(path.name + ".cache")
+
+
+def csv_signature(path: Path) -> tuple[int, int, str]:
+    """Get the (size, mtime, header hash) a sidecar must match"""
+    stat = path.stat()
+    with path.open("rb") as file:
+        header = file.readline()
+    return stat.st_size, stat.st_mtime_ns, hashlib.sha1(header).hexdigest()
+
+
+def load_sidecar(
+    path: Path, signature: tuple[int, int, str]
+) -> list[dict[str, str]] | None:
+    """Load cached entries with a single read, or None if missing or stale"""
+    try:
+        with paused_gc():
+            version, cached_signature, entries = marshal.loads(
+                sidecar_path(path).read_bytes()
+            )
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if version != SIDECAR_VERSION or tuple(cached_signature) != signature:
+        return None
+    return entries
+
+
+def save_sidecar(
+    path: Path, signature: tuple[int, int, str], entries: list[dict[str, str]]
+) -> None:
+    """Atomically write the sidecar for entries parsed from a timesheet.
+
+    Equal values share one string object, which marshal then writes once.
+    """
+    shared: dict[str, str] = {}
+    with paused_gc():
+        compact = [
+            {key: shared.setdefault(value, value) for key, value in entry.items()}
+            if None not in entry
+            else entry
+            for entry in entries
+        ]
+        data = marshal.dumps((SIDECAR_VERSION, signature, compact))
+
+    target = sidecar_path(path)
+    try:
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{target.name}.", dir=target.parent)
+    except OSError:
+        return  # The sidecar is only an optimisation
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_name, target)
+    except OSError:
+        Path(tmp_name).unlink(missing_ok=True)
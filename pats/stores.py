@@ -0,0 +1,263 @@
+"""Interchangeable storage engines behind a common timesheet interface
+
+Every engine exposes the session operations of `pats.database` with the same
+semantics: entries are dicts with at least the human-readable CSV columns
+(engines may add the epoch columns), "first" means most recent and
+ranges are inclusive on start time. The CSV database is the default;
+an in-memory list and the binary record store are alternatives, so engines
+can be benchmarked side by side (benchmarks/bench_stores.py) once they pass
+one behavioural contract (tests/test_stores.py).
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Protocol
+
+from pats import binstore, database
+from pats.database import (
+    current_session_time,
+    datetime_sort_key,
+    entry_sort_key,
+    session_fields,
+)
+
+
+class TimesheetStore(Protocol):
+    """Operations every storage engine provides"""
+
+    def iter_entries(self) -> Iterator[dict[str, str]]:
+        """Yield all entries, most recent first"""
+        ...
+
+    def iter_entries_in_range(
+        self, start_date: datetime, end_date: datetime
+    ) -> Iterator[dict[str, str]]:
+        """Yield entries starting within a range, most recent first"""
+        ...
+
+    def get_active_session(self) -> dict[str, str] | None:
+        """Get the session without an end time, if any"""
+        ...
+
+    def get_previous_session(self) -> dict[str, str] | None:
+        """Get the most recent completed session"""
+        ...
+
+    def get_last_session(self) -> dict[str, str] | None:
+        """Get the most recent session, active or completed"""
+        ...
+
+    def start_new_session(self, project: str = "", description: str = "") -> None:
+        """Stop any active session and start a new one now"""
+        ...
+
+    def stop_active_session(self) -> bool:
+        """End the active session now, returning whether there was one"""
+        ...
+
+    def remove_last_session_end_time(self) -> bool:
+        """Reopen the most recent completed session"""
+        ...
+
+    def edit_first_entry(
+        self, project: str | None = None, description: str | None = None
+    ) -> bool:
+        """Change the project or description of the most recent entry"""
+        ...
+
+    def delete_first_entry(self) -> dict[str, str] | None:
+        """Delete and return the most recent entry"""
+        ...
+
+    def write_entries(self, entries: Iterable[dict[str, str]]) -> int:
+        """Replace all entries (given most recent first), returning the count"""
+        ...
+
+
+class CsvStore:
+    """The timesheet CSV in ~/.pats, the default engine"""
+
+    def iter_entries(self) -> Iterator[dict[str, str]]:
+        return database.iter_entries()
+
+    def iter_entries_in_range(
+        self, start_date: datetime, end_date: datetime
+    ) -> Iterator[dict[str, str]]:
+        return database.iter_entries_in_range(start_date, end_date)
+
+    def get_active_session(self) -> dict[str, str] | None:
+        return database.get_active_session()
+
+    def get_previous_session(self) -> dict[str, str] | None:
+        return database.get_previous_session()
+
+    def get_last_session(self) -> dict[str, str] | None:
+        return database.get_last_session()
+
+    def start_new_session(self, project: str = "", description: str = "") -> None:
+        database.start_new_session(project, description)
+
+    def stop_active_session(self) -> bool:
+        return database.stop_active_session()
+
+    def remove_last_session_end_time(self) -> bool:
+        return database.remove_last_session_end_time()
+
+    def edit_first_entry(
+        self, project: str | None = None, description: str | None = None
+    ) -> bool:
+        return database.edit_first_entry(project, description)
+
+    def delete_first_entry(self) -> dict[str, str] | None:
+        return database.delete_first_entry()
+
+    def write_entries(self, entries: Iterable[dict[str, str]]) -> int:
+        return database.write_entries(entries)
+
+
+class MemoryStore:
+    """Entries held in a list, most recent first; nothing touches disk"""
+
+    def __init__(self, entries: Iterable[dict[str, str]] = ()) -> None:
+        self.entries = [dict(entry) for entry in entries]
+
+    def iter_entries(self) -> Iterator[dict[str, str]]:
+        return iter([dict(entry) for entry in self.entries])
+
+    def iter_entries_in_range(
+        self, start_date: datetime, end_date: datetime
+    ) -> Iterator[dict[str, str]]:
+        start_key = datetime_sort_key(start_date)
+        end_key = datetime_sort_key(end_date)
+        for entry in self.entries:
+            key = entry_sort_key(entry)
+            if key and entry["startTime"] and start_key <= key <= end_key:
+                yield dict(entry)
+
+    def find(self, active: bool) -> dict[str, str] | None:
+        """Get the newest entry that is active (or completed)"""
+        for entry in self.entries:
+            if (not entry["endTime"]) == active:
+                return entry
+        return None
+
+    def get_active_session(self) -> dict[str, str] | None:
+        entry = self.find(active=True)
+        return dict(entry) if entry else None
+
+    def get_previous_session(self) -> dict[str, str] | None:
+        entry = self.find(active=False)
+        return dict(entry) if entry else None
+
+    def get_last_session(self) -> dict[str, str] | None:
+        return dict(self.entries[0]) if self.entries else None
+
+    def start_new_session(self, project: str = "", description: str = "") -> None:
+        self.stop_active_session()
+        self.entries.insert(
+            0,
+            {
+                "endTime": "",
+                "endEpoch": "",
+                "project": project,
+                "description": description,
+                **session_fields(current_session_time()),
+            },
+        )
+
+    def stop_active_session(self) -> bool:
+        entry = self.find(active=True)
+        if entry is None:
+            return False
+        entry.update(session_fields(current_session_time(), end=True))
+        return True
+
+    def remove_last_session_end_time(self) -> bool:
+        entry = self.find(active=False)
+        if entry is None:
+            return False
+        entry["endTime"] = entry["endEpoch"] = ""
+        return True
+
+    def edit_first_entry(
+        self, project: str | None = None, description: str | None = None
+    ) -> bool:
+        if not self.entries:
+            return False
+        if project is not None:
+            self.entries[0]["project"] = project
+        if description is not None:
+            self.entries[0]["description"] = description
+        return True
+
+    def delete_first_entry(self) -> dict[str, str] | None:
+        return self.entries.pop(0) if self.entries else None
+
+    def write_entries(self, entries: Iterable[dict[str, str]]) -> int:
+        self.entries = [dict(entry) for entry in entries]
+        return len(self.entries)
+
+
+class BinaryStore:
+    """The fixed-width binary record store (see pats.binstore)"""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.directory = directory or binstore.BINARY_DIR
+        if not binstore.store_exists(self.directory):
+            binstore.write_store([], self.directory)
+
+    def iter_entries(self) -> Iterator[dict[str, str]]:
+        return binstore.iter_records(self.directory)
+
+    def iter_entries_in_range(
+        self, start_date: datetime, end_date: datetime
+    ) -> Iterator[dict[str, str]]:
+        return binstore.iter_entries_in_range(start_date, end_date, self.directory)
+
+    def get_active_session(self) -> dict[str, str] | None:
+        return binstore.get_active_session(self.directory)
+
+    def get_previous_session(self) -> dict[str, str] | None:
+        return binstore.get_previous_session(self.directory)
+
+    def get_last_session(self) -> dict[str, str] | None:
+        return binstore.get_last_session(self.directory)
+
+    def start_new_session(self, project: str = "", description: str = "") -> None:
+        binstore.start_new_session(project, description, self.directory)
+
+    def stop_active_session(self) -> bool:
+        return binstore.stop_active_session(self.directory)
+
+    def remove_last_session_end_time(self) -> bool:
+        return binstore.remove_last_session_end_time(self.directory)
+
+    def edit_first_entry(
+        self, project: str | None = None, description: str | None = None
+    ) -> bool:
+        return binstore.edit_first_entry(project, description, self.directory)
+
+    def delete_first_entry(self) -> dict[str, str] | None:
+        return binstore.delete_first_entry(self.directory)
+
+    def write_entries(self, entries: Iterable[dict[str, str]]) -> int:
+        rows = (
+            (
+                entry.get("date") or "",
+                entry.get("startTime") or "",
+                entry.get("endTime") or "",
+                entry.get("project") or "",
+                entry.get("description") or "",
+                entry.get("id") or "",
+            )
+            for entry in entries
+        )
+        return binstore.write_store(rows, self.directory)[0]
+
+
+STORES: dict[str, Callable[[], TimesheetStore]] = {
+    "csv": CsvStore,
+    "memory": MemoryStore,
+    "binary": BinaryStore,
+}
@@ -0,0 +1,151 @@
+"""Team reports over a directory of members' timesheets
+
+Every timesheet is ordered most recent first, so each member's rows in a
+window come from a seek and a scan that stops at the first older row, and
+`heapq.merge` interleaves them lazily into one newest-first stream. Totals
+per period, member and project are added up as rows go past, so memory
+grows with the number of members and periods rather than rows.
+
+A session still open in someone else's timesheet is only known to have run
+until that file was last written, so it is counted up to the file's
+modification time (or the end of the window, if earlier) rather than now.
+"""
+
+import heapq
+from collections.abc import Iterator
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from pats.aggregate import entry_date, new_bucket, period_start
+from pats.database import (
+    DATABASE_FILE,
+    combine_time_date_to_datetime,
+    entry_sort_key,
+    epoch_span,
+    iter_entries_in_range,
+)
+from pats.display_utils import calculate_duration_seconds
+from pats.rules import get_project_rules
+
+
+def find_timesheets(directory: Path) -> dict[str, Path]:
+    """Find members' timesheets in a directory, by member name.
+
+    Accepts `NAME.csv` files and `NAME/timesheet.csv` subdirectories.
+    """
+    found = {path.stem: path for path in directory.glob("*.csv") if path.is_file()}
+    for path in directory.glob("*/timesheet.csv"):
+        found.setdefault(path.parent.name, path)
+    return dict(sorted(found.items()))
+
+
+def merge_timesheets(
+    timesheets: dict[str, Path], start_date: datetime, end_date: datetime
+) -> Iterator[tuple[str, str, dict[str, str]]]:
+    """Lazily merge members' entries in a range into one stream of (sort
+    key, member, entry), most recent first"""
+
+    def member_entries(member: str, path: Path):
+        for entry in iter_entries_in_range(start_date, end_date, path):
+            yield entry_sort_key(entry), member, entry
+
+    return heapq.merge(
+        *(member_entries(member, path) for member, path in timesheets.items()),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+
+
+def open_session_cap(path: Path, end_date: datetime) -> float | None:
+    """Get the epoch that open sessions in a timesheet are counted up to.
+
+    None for the user's own timesheet, whose open session runs until now.
+    """
+    if path.resolve() == DATABASE_FILE.resolve():
+        return None
+    return min(path.stat().st_mtime, end_date.timestamp())
+
+
+def entry_seconds(entry: dict[str, str], cap: float | None) -> int:
+    """Get an entry's duration, ending open sessions at `cap` if given"""
+    if cap is None or entry.get("endTime"):
+        return calculate_duration_seconds(entry)
+
+    span = epoch_span(entry, now=int(cap))
+    if span is not None:
+        return max(0, span[1] - span[0])
+    start = combine_time_date_to_datetime(entry.get("startTime", ""), entry["date"])
+    if start is None:
+        return 0
+    return max(0, int(cap - start.timestamp()))
+
+
+def add_entry(
+    buckets: dict[date, dict[str, Any]],
+    start: date,
+    seconds: int,
+    project: str,
+    excluded: bool,
+) -> None:
+    """Add an entry's time to the bucket of the period starting at `start`"""
+    bucket = buckets.get(start)
+    if bucket is None:
+        bucket = buckets[start] = new_bucket()
+    if not excluded:
+        bucket["seconds"] += seconds
+    bucket["entries"] += 1
+    projects = bucket["projects"]
+    projects[project] = projects.get(project, 0) + seconds
+
+
+def combine_buckets(buckets: dict[date, dict[str, Any]]) -> dict[str, Any]:
+    """Add up a set of period buckets into a single bucket"""
+    total = new_bucket()
+    for bucket in buckets.values():
+        total["seconds"] += bucket["seconds"]
+        total["entries"] += bucket["entries"]
+        projects = total["projects"]
+        for project, seconds in bucket["projects"].items():
+            projects[project] = projects.get(project, 0) + seconds
+    return total
+
+
+def team_totals(
+    timesheets: dict[str, Path],
+    start_date: datetime,
+    end_date: datetime,
+    period: str,
+    open_sessions: list[str] | None = None,
+) -> tuple[dict[date, dict[str, Any]], dict[str, dict[date, dict[str, Any]]]]:
+    """Bucket every member's entries in a range by period in one merged pass.
+
+    Returns the team's buckets and each member's, shaped like those of
+    `pats.aggregate.aggregate_entries` so the same summaries display them.
+    When `open_sessions` is given, the members with a session open in another
+    person's timesheet are appended to it.
+    """
+    rules = get_project_rules()
+    caps = {
+        member: open_session_cap(path, end_date) for member, path in timesheets.items()
+    }
+    team: dict[date, dict[str, Any]] = {}
+    members: dict[str, dict[date, dict[str, Any]]] = {
+        member: {} for member in timesheets
+    }
+
+    for _, member, entry in merge_timesheets(timesheets, start_date, end_date):
+        day = entry_date(entry)
+        if day is None:
+            continue
+        start = period_start(day, period)
+        cap = caps[member]
+        seconds = entry_seconds(entry, cap)
+        if cap is not None and not entry.get("endTime") and open_sessions is not None:
+            open_sessions.append(member)
+        project, excluded = rules.resolve(entry["project"] or "")
+        project = project or "No project"
+        add_entry(team, start, seconds, project, excluded)
+        add_entry(members[member], start, seconds, project, excluded)
+
+    return team, members
@@ -0,0 +1,355 @@
+"""NumPy-backed bucketing of entries, used when the numpy backend is enabled
+
+String columns are parsed into column arrays (start and end epochs in local
+wall-clock seconds, day ordinals and project codes) with array operations,
+falling back to per-row parsing for unusual layouts; durations, excluded
+project masking and per-period and per-project sums are then array
+operations too. Results match `aggregate_entries` exactly.
+"""
+
+import time
+from collections.abc import Iterable
+from datetime import date, datetime
+from typing import Any
+
+from pats.fastcsv import sort_key
+from pats.rules import ProjectRules
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+DAY_SECONDS = 86400
+# Ordinal of 1970-01-01, where numpy datetime64 days count from
+UNIX_ORDINAL = 719163
+FIELDS = ["date", "startTime", "endTime", "project", "startEpoch", "endEpoch"]
+
+
+def numpy_available() -> bool:
+    """Check whether numpy can be imported"""
+    return np is not None
+
+
+def parse_day(date_str: str) -> tuple[int, int] | None:
+    """Get the day ordinal and month-start ordinal of a DD-MM-YYYY date"""
+    if not date_str:
+        return None
+    try:
+        day, month, year = date_str.split("-")
+        parsed = date(int(year), int(month), int(day))
+    except (AttributeError, ValueError):
+        return None
+    return parsed.toordinal(), parsed.replace(day=1).toordinal()
+
+
+def parse_clock(time_str: str) -> int | None:
+    """Get the seconds since midnight of an HH:MM or HH:MM:SS time"""
+    if not time_str:
+        return None
+    try:
+        parts = [int(part) for part in time_str.split(":")]
+        hour, minute = parts[0], parts[1]
+    except (AttributeError, IndexError, ValueError):
+        return None
+    second = parts[2] if len(parts) > 2 else 0
+    if not (0 <= hour < 24 and 0 <= minute < 60 and 0 <= second < 60):
+        return None
+    return hour * 3600 + minute * 60 + second
+
+
+def load_columns(
+    entries: Iterable[dict[str, str]],
+    collected: list[dict[str, str]] | None = None,
+) -> dict[str, Any]:
+    """Load entries into column arrays, skipping rows without a valid date"""
+    rows = list(entries)
+    if collected is not None:
+        collected.extend(rows)
+    return parse_columns(
+        {name: [entry.get(name) or "" for entry in rows] for name in FIELDS}
+    )
+
+
+def char_matrix(values: list[str], width: int) -> tuple[Any, Any]:
+    """Get each value's length and its first `width` characters as a
+    (rows, width) array of character codes.
+
+    Characters outside Latin-1 become "?", which no parsed layout accepts.
+    """
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    data = np.frombuffer("".join(values).encode("latin-1", "replace"), np.uint8)
+    if not len(data):
+        return lengths, np.zeros((len(values), width), dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    positions = np.minimum(starts[:, None] + np.arange(width), len(data) - 1)
+    return lengths, data[positions].astype(np.int64)
+
+
+def read_digits(chars: Any, positions: list[int]) -> tuple[Any, Any]:
+    """Get the number spelled by the characters at `positions` of each row,
+    and whether they all are digits"""
+    digits = chars[:, positions] - ord("0")
+    valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    powers = 10 ** np.arange(len(positions) - 1, -1, -1, dtype=np.int64)
+    return digits @ powers, valid
+
+
+def parse_dates(values: list[str]) -> tuple[Any, Any, Any]:
+    """Parse DD-MM-YYYY dates into day and month-start ordinals.
+
+    Also returns which rows had exactly that layout and a real date; the
+    others are left to `parse_day`.
+    """
+    lengths, chars = char_matrix(values, 10)
+    day, day_ok = read_digits(chars, [0, 1])
+    month, month_ok = read_digits(chars, [3, 4])
+    year, year_ok = read_digits(chars, [6, 7, 8, 9])
+    parsed = (lengths == 10) & day_ok & month_ok & year_ok
+    parsed &= (chars[:, 2] == ord("-")) & (chars[:, 5] == ord("-"))
+    parsed &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1)
+    month = np.where(parsed, month, 1)
+    year = np.where(parsed, year, 1970)
+
+    months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+    days = months.astype("datetime64[D]") + (day - 1)
+    # Days past the end of their month would roll over into the next one
+    parsed &= days.astype("datetime64[M]") == months
+    month_days = months.astype("datetime64[D]").astype(np.int64)
+    return days.astype(np.int64) + UNIX_ORDINAL, month_days + UNIX_ORDINAL, parsed
+
+
+def parse_clocks(values: list[str]) -> tuple[Any, Any, Any]:
+    """Parse HH:MM and HH:MM:SS times into seconds since midnight.
+
+    Also returns which rows had one of those layouts and which were empty;
+    the others are left to `parse_clock`.
+    """
+    lengths, chars = char_matrix(values, 8)
+    hour, hour_ok = read_digits(chars, [0, 1])
+    minute, minute_ok = read_digits(chars, [3, 4])
+    second, second_ok = read_digits(chars, [6, 7])
+    with_seconds = (lengths == 8) & second_ok & (chars[:, 5] == ord(":"))
+    second = np.where(with_seconds, second, 0)
+
+    parsed = ((lengths == 5) | with_seconds) & hour_ok & minute_ok
+    parsed &= (chars[:, 2] == ord(":")) & (hour < 24) & (minute < 60) & (second < 60)
+    return hour * 3600 + minute * 60 + second, parsed, lengths == 0
+
+
+def parse_epochs(values: list[str]) -> tuple[Any, Any, Any]:
+    """Parse epoch seconds written as digits with an optional minus sign.
+
+    Also returns which rows were in that layout or empty, and which were empty.
+    """
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    empty = lengths == 0
+    width = int(lengths.max(initial=0))
+    if not 0 < width <= 18:
+        return np.zeros(len(values), dtype=np.int64), empty, empty
+
+    _, chars = char_matrix(values, width)
+    # Places are counted from the right, as values differ in length
+    places = lengths[:, None] - 1 - np.arange(width)
+    digits = np.where(places >= 0, chars - ord("0"), 0)
+    negative = (lengths > 1) & (chars[:, 0] == ord("-"))
+    digits[:, 0] = np.where(negative, 0, digits[:, 0])
+    parsed = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    epochs = (digits * 10 ** np.maximum(places, 0)).sum(axis=1)
+    return np.where(negative, -epochs, epochs), parsed, empty
+
+
+def parse_row(
+    date_str: str,
+    start_time: str,
+    end_time: str,
+    start_utc: str,
+    end_utc: str,
+    now_epoch: int,
+    now_utc: int,
+) -> tuple[int, int, int, int] | None:
+    """Get a row's day and month-start ordinals and start and end epochs.
+
+    Returns None for rows without a valid date.
+    """
+    parsed = parse_day(date_str)
+    if parsed is None:
+        return None
+
+    day, month = parsed
+    start = end = day * DAY_SECONDS
+    start_clock = parse_clock(start_time)
+    if start_clock is not None:
+        start += start_clock
+        end = start
+
+    duration = None
+    if start_utc:
+        try:
+            duration = (int(end_utc) if end_time else now_utc) - int(start_utc)
+        except ValueError:
+            duration = None
+    if duration is not None:
+        end = start + duration
+    elif start_clock is not None:
+        if not end_time:
+            end = now_epoch
+        else:
+            end_clock = parse_clock(end_time)
+            if end_clock is not None:
+                end = day * DAY_SECONDS + end_clock
+
+    return day, month, start, end
+
+
+def parse_columns(
+    strings: dict[str, list[str]], window: tuple[str, str] | None = None
+) -> dict[str, Any]:
+    """Parse string columns (as from `split_columns`) into column arrays.
+
+    Dates, times and epochs in the layouts paTS writes are parsed with array
+    operations; other rows go through `parse_row` one at a time. Rows without
+    a valid date are skipped, as are rows whose sort key falls outside the
+    (start, end) keys of `window`. Durations come from the epoch columns when
+    present, as in the Python path. Rows whose duration cannot be computed
+    get equal start and end epochs, so they count as entries of zero seconds.
+    """
+    now = datetime.now()
+    now_epoch = now.toordinal() * DAY_SECONDS + now.hour * 3600
+    now_epoch += now.minute * 60 + now.second
+    now_utc = int(time.time())
+
+    dates = strings["date"]
+    start_times, end_times = strings["startTime"], strings["endTime"]
+    blank = [""] * len(dates)
+    start_utcs = strings.get("startEpoch") or blank
+    end_utcs = strings.get("endEpoch") or blank
+
+    day, month, parsed = parse_dates(dates)
+    start_clock, start_ok, _ = parse_clocks(start_times)
+    end_clock, end_ok, end_empty = parse_clocks(end_times)
+    start_utc, start_utc_ok, start_utc_empty = parse_epochs(start_utcs)
+    end_utc, end_utc_ok, end_utc_empty = parse_epochs(end_utcs)
+    parsed &= start_ok & (end_ok | end_empty) & start_utc_ok & end_utc_ok
+
+    start = day * DAY_SECONDS + start_clock
+    # Epochs decide the duration unless an ended row lacks its end epoch
+    from_utc = ~start_utc_empty & (end_empty | ~end_utc_empty)
+    clock_end = np.where(end_empty, now_epoch, day * DAY_SECONDS + end_clock)
+    end = np.where(
+        from_utc, start + np.where(end_empty, now_utc, end_utc) - start_utc, clock_end
+    )
+
+    keep = parsed.copy()
+    check = np.zeros(len(dates), dtype=bool)
+    if window is not None:
+        # Keys start with the ISO date, so only rows on the first and last
+        # day of the window need their full key compared
+        first, last = (date.fromisoformat(key[:10]).toordinal() for key in window)
+        keep &= (first <= day) & (day <= last)
+        check = keep & ((day == first) | (day == last))
+
+    for row in np.flatnonzero(~parsed | check).tolist():
+        if window is not None and not (
+            window[0] <= sort_key(dates[row], start_times[row]) <= window[1]
+        ):
+            keep[row] = False
+            continue
+        if parsed[row]:
+            continue
+        fields = parse_row(
+            dates[row],
+            start_times[row],
+            end_times[row],
+            start_utcs[row],
+            end_utcs[row],
+            now_epoch,
+            now_utc,
+        )
+        if fields is not None:
+            keep[row] = True
+            day[row], month[row], start[row], end[row] = fields
+
+    codes: dict[str, int] = {}
+    projects = [strings["project"][row] for row in np.flatnonzero(keep).tolist()]
+    project = np.fromiter(
+        (codes.setdefault(name, len(codes)) for name in projects),
+        dtype=np.int64,
+        count=len(projects),
+    )
+    return {
+        "day": day[keep],
+        "month": month[keep],
+        "start": start[keep],
+        "end": end[keep],
+        "project": project,
+        "projects": list(codes),
+    }
+
+
+def period_keys(columns: dict[str, Any], period: str) -> Any:
+    """Get the start-day ordinal of each row's day, week or month"""
+    if period == "week":
+        # date(1, 1, 1), ordinal 1, was a Monday
+        return columns["day"] - (columns["day"] - 1) % 7
+    if period == "month":
+        return columns["month"]
+    return columns["day"]
+
+
+def aggregate_columns(
+    columns: dict[str, Any], period: str, rules: ProjectRules
+) -> dict[date, dict[str, Any]]:
+    """Bucket column arrays by period, ordered like `aggregate_entries`"""
+    if not len(columns["day"]):
+        return {}
+
+    projects = columns["projects"]
+    codes = columns["project"]
+    durations = columns["end"] - columns["start"]
+    excluded = np.isin(
+        codes, [i for i, name in enumerate(projects) if rules.is_excluded(name)]
+    )
+    counted = np.where(excluded, 0, durations)
+
+    keys, first_rows, slots = np.unique(
+        period_keys(columns, period), return_index=True, return_inverse=True
+    )
+    seconds = np.zeros(len(keys), dtype=np.int64)
+    np.add.at(seconds, slots, counted)
+    counts = np.bincount(slots, minlength=len(keys))
+
+    # One cell per (bucket, project) pair that actually occurs
+    cells, cell_rows, cell_slots = np.unique(
+        slots * len(projects) + codes, return_index=True, return_inverse=True
+    )
+    cell_seconds = np.zeros(len(cells), dtype=np.int64)
+    np.add.at(cell_seconds, cell_slots, durations)
+
+    buckets: dict[date, dict[str, Any]] = {}
+    for slot in np.argsort(first_rows, kind="stable").tolist():
+        buckets[date.fromordinal(int(keys[slot]))] = {
+            "seconds": int(seconds[slot]),
+            "entries": int(counts[slot]),
+            "projects": {},
+        }
+
+    for cell in np.argsort(cell_rows, kind="stable").tolist():
+        slot, code = divmod(int(cells[cell]), len(projects))
+        bucket = buckets[date.fromordinal(int(keys[slot]))]
+        name = rules.canonical(projects[code]) or "No project"
+        bucket["projects"][name] = bucket["projects"].get(name, 0) + int(
+            cell_seconds[cell]
+        )
+
+    return buckets
+
+
+def aggregate_entries_numpy(
+    entries: Iterable[dict[str, str]],
+    period: str,
+    rules: ProjectRules,
+    collected: list[dict[str, str]] | None = None,
+) -> dict[date, dict[str, Any]]:
+    """Vectorised equivalent of `pats.aggregate.aggregate_entries`"""
+    return aggregate_columns(load_columns(entries, collected), period, rules)
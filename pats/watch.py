@@ -0,0 +1,63 @@
+"""Resident --watch mode that re-renders views in place with rich Live"""
+
+import time
+from collections.abc import Callable
+from datetime import date
+from typing import Any
+
+from rich import get_console
+from rich.console import Console
+from rich.live import Live
+from rich.text import Text
+
+from pats.database import DATABASE_FILE, prepare_database
+from pats.index import database_stat
+
+# Seconds between checks of the database's size and mtime
+POLL_INTERVAL = 1.0
+
+
+def render_captured(draw: Callable[[Any], None], data: Any) -> Text:
+    """Run a display function and return its output as a renderable"""
+    console = get_console()
+    with console.capture() as capture:
+        draw(data)
+    return Text.from_ansi(capture.get().rstrip("\n"))
+
+
+def watch_database(
+    load: Callable[[], Any],
+    draw: Callable[[Any], None],
+    interval: float = POLL_INTERVAL,
+) -> None:
+    """Keep re-rendering a view until interrupted.
+
+    `load` reads and summarises the rows a view needs, including the active
+    session, and only runs again when the database's size or mtime changes,
+    or the date rolls over. `draw` renders what was loaded without reading
+    the database or config, recomputing only the active session's duration;
+    it runs after each load and whenever the minute ticks over.
+    """
+    prepare_database()
+    signature = database_stat(DATABASE_FILE)
+    today = date.today()
+    data = load()
+    minute = int(time.time() // 60)
+
+    with Live(
+        render_captured(draw, data), console=Console(), auto_refresh=False
+    ) as live:
+        try:
+            while True:
+                time.sleep(interval)
+                current = database_stat(DATABASE_FILE)
+                if current != signature or date.today() != today:
+                    signature, today = current, date.today()
+                    data = load()
+                elif int(time.time() // 60) == minute:
+                    continue
+
+                minute = int(time.time() // 60)
+                live.update(render_captured(draw, data), refresh=True)
+        except KeyboardInterrupt:
+            pass
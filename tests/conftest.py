@@ -0,0 +1,16 @@
+"""Shared test setup"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# pats resolves ~/.pats when it is imported, so HOME must point at a scratch
+# directory before any test module imports it
+HOME = Path(tempfile.mkdtemp(prefix="pats-test-"))
+os.environ["HOME"] = str(HOME)
+(HOME / ".pats").mkdir()
+
+
+def pytest_sessionfinish(session, exitstatus) -> None:
+    shutil.rmtree(HOME, ignore_errors=True)
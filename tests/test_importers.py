@@ -0,0 +1,36 @@
+"""Tests for normalising imported sessions into timesheet rows"""
+
+from datetime import datetime
+
+import pytest
+
+from pats.database import add_epoch_fields
+from pats.display_utils import calculate_duration_seconds
+from pats.importers import normalise_record
+
+
+def total_seconds(rows: list[dict[str, str]]) -> int:
+    return sum(calculate_duration_seconds(add_epoch_fields(row)) for row in rows)
+
+
+@pytest.mark.parametrize(
+    ("start", "end"),
+    [
+        (datetime(2024, 7, 1, 9, 0), datetime(2024, 7, 1, 17, 30)),
+        (datetime(2024, 7, 1, 22, 0), datetime(2024, 7, 2, 6, 15)),
+        (datetime(2024, 7, 1, 23, 0), datetime(2024, 7, 2, 0, 0)),
+        (datetime(2024, 7, 1, 23, 0), datetime(2024, 7, 3, 1, 0)),
+        (datetime(2024, 7, 1, 0, 0), datetime(2024, 7, 4, 0, 0)),
+    ],
+)
+def test_sessions_keep_their_duration(start: datetime, end: datetime):
+    rows = normalise_record((start, end, "Acme", ""))
+    assert total_seconds(rows) == (end - start).total_seconds()
+
+
+def test_overnight_session_stays_one_row():
+    start, end = datetime(2024, 7, 1, 22, 0), datetime(2024, 7, 2, 6, 15)
+    rows = normalise_record((start, end, "Acme", "night shift"))
+    assert [(row["date"], row["startTime"], row["endTime"]) for row in rows] == [
+        ("01-07-2024", "22:00", "06:15")
+    ]
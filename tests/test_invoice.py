@@ -0,0 +1,37 @@
+"""Tests for invoice line item totals"""
+
+from pats.invoice import day_totals, description_totals
+from pats.rules import ProjectRules
+
+
+def entry(project: str, start: str, end: str, description: str = "") -> dict:
+    return {
+        "date": "01-07-2024",
+        "startTime": start,
+        "endTime": end,
+        "project": project,
+        "description": description,
+    }
+
+
+ENTRIES = [
+    entry("lunch-monday", "12:00", "12:45", "Lunch"),
+    entry("Acme", "09:00", "12:00", "Build"),
+    entry("acme-support", "13:00", "14:30", "Support"),
+]
+
+RULES = ProjectRules(
+    excluded_patterns=["lunch-*"],
+    aliases={"lunch-*": "Lunch", "acme-*": "Acme"},
+)
+
+
+def test_aliased_excluded_project_is_not_billed_by_day():
+    assert day_totals(ENTRIES, RULES) == {("Acme", "2024-07-01"): 4.5 * 3600}
+
+
+def test_day_and_description_totals_bill_the_same_time():
+    by_day = day_totals(ENTRIES, RULES)
+    by_description = description_totals(ENTRIES, RULES)
+    assert sum(by_day.values()) == sum(by_description.values())
+    assert {project for project, _ in by_description} == {"Acme"}
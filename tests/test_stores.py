@@ -0,0 +1,128 @@
+"""Behavioural contract every storage engine in pats.stores must meet"""
+
+from collections.abc import Iterable
+from datetime import datetime
+
+import pytest
+
+from pats.database import ENTRY_HEADERS, get_current_date, get_current_time
+from pats.stores import STORES, TimesheetStore
+
+SAMPLE = [
+    {
+        "startTime": "23:30",
+        "endTime": "00:45",
+        "date": "02-01-2024",
+        "project": "Acme",
+        "description": 'late "deploy", rollback\nand notes',
+    },
+    {
+        "startTime": "13:00",
+        "endTime": "17:30",
+        "date": "02-01-2024",
+        "project": "Globex",
+        "description": "review #billable",
+    },
+    {
+        "startTime": "09:00",
+        "endTime": "12:00",
+        "date": "01-01-2024",
+        "project": "",
+        "description": "",
+    },
+    {
+        "startTime": "08:15",
+        "endTime": "08:45",
+        "date": "31-12-2023",
+        "project": "Café",
+        "description": "naïve ünïcode",
+    },
+]
+
+
+def visible(entry: dict[str, str] | None) -> dict[str, str] | None:
+    """Keep only the human-readable columns every engine must preserve"""
+    return None if entry is None else {key: entry[key] for key in ENTRY_HEADERS}
+
+
+def rows(entries: Iterable[dict[str, str]]) -> list[dict[str, str]]:
+    return [visible(entry) for entry in entries]
+
+
+@pytest.fixture(params=list(STORES))
+def store(request) -> TimesheetStore:
+    return STORES[request.param]()
+
+
+def test_empty(store: TimesheetStore):
+    assert store.write_entries([]) == 0
+    assert list(store.iter_entries()) == []
+    assert store.get_active_session() is None
+    assert store.get_previous_session() is None
+    assert store.get_last_session() is None
+    assert store.stop_active_session() is False
+    assert store.remove_last_session_end_time() is False
+    assert store.edit_first_entry(project="X") is False
+    assert store.delete_first_entry() is None
+
+
+def test_round_trip(store: TimesheetStore):
+    assert store.write_entries(SAMPLE) == len(SAMPLE)
+    assert rows(store.iter_entries()) == SAMPLE
+    assert visible(store.get_last_session()) == SAMPLE[0]
+    assert visible(store.get_previous_session()) == SAMPLE[0]
+    assert store.get_active_session() is None
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "expected"),
+    [
+        (datetime(2024, 1, 2), datetime(2024, 1, 2, 23, 59, 59), SAMPLE[:2]),
+        (datetime(2024, 1, 1, 9), datetime(2024, 1, 2, 13), SAMPLE[1:3]),
+        (datetime(2023, 12, 31, 8, 16), datetime(2024, 1, 1, 8, 59), []),
+        (datetime(2000, 1, 1), datetime(2100, 1, 1), SAMPLE),
+    ],
+)
+def test_ranges(store: TimesheetStore, start, end, expected):
+    store.write_entries(SAMPLE)
+    assert rows(store.iter_entries_in_range(start, end)) == expected
+
+
+def test_sessions(store: TimesheetStore):
+    store.write_entries(SAMPLE)
+
+    store.start_new_session("Acme", "first")
+    active = store.get_active_session()
+    assert active is not None
+    assert (active["project"], active["description"]) == ("Acme", "first")
+    assert active["endTime"] == "" and active["date"] == get_current_date()
+    assert store.get_last_session() == active
+    assert visible(store.get_previous_session()) == SAMPLE[0]
+
+    before = get_current_time()
+    store.start_new_session("Globex", "second")
+    after = get_current_time()
+    previous = store.get_previous_session()
+    assert previous["project"] == "Acme"
+    assert before <= previous["endTime"] <= after
+    assert store.get_active_session()["project"] == "Globex"
+
+    assert store.stop_active_session() is True
+    assert store.get_active_session() is None
+    assert store.get_previous_session()["project"] == "Globex"
+    assert store.stop_active_session() is False
+
+    assert store.remove_last_session_end_time() is True
+    assert store.get_active_session()["project"] == "Globex"
+
+    assert store.edit_first_entry(project="Initech") is True
+    edited = store.get_last_session()
+    assert (edited["project"], edited["description"]) == ("Initech", "second")
+    assert store.edit_first_entry(description="renamed") is True
+    assert store.get_last_session()["description"] == "renamed"
+
+    deleted = store.delete_first_entry()
+    assert deleted["project"] == "Initech"
+    assert store.get_last_session()["project"] == "Acme"
+    assert store.get_active_session() is None
+    assert rows(store.iter_entries())[1:] == SAMPLE